@@ -0,0 +1,194 @@
+# blender_batch_export.py
+# Headless batch conversion: runs blender_to_maya.py on many .blend files,
+# one `blender --background` process per file, N at a time.
+#
+#   python blender_batch_export.py D:/assets --recursive --workers 8
+#   python blender_batch_export.py a.blend b.blend --timeout 900 --retries 1
+#
+# Runs with any Python 3, Blender is only started as a subprocess.
+import argparse
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PIPELINE_SCRIPT = os.path.join(SCRIPTS_DIR, "blender_to_maya.py")
+WINDOWS_BLENDER_DIR = r"C:\Program Files\Blender Foundation"
+
+
+def find_blender(blender_exe=None):
+    """Explicit path, then $BLENDER_EXE, then blender on PATH, then the newest Windows install."""
+    for candidate in (blender_exe, os.environ.get("BLENDER_EXE"), shutil.which("blender")):
+        if candidate and os.path.isfile(candidate):
+            return candidate
+    if os.path.isdir(WINDOWS_BLENDER_DIR):
+        versions = sorted(os.listdir(WINDOWS_BLENDER_DIR), reverse=True)
+        for name in versions:
+            exe_path = os.path.join(WINDOWS_BLENDER_DIR, name, "blender.exe")
+            if os.path.isfile(exe_path):
+                return exe_path
+    return None
+
+
+def collect_blend_files(paths, recursive=False):
+    """Expand files and directories into a sorted, de-duplicated list of .blend files."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            pattern = os.path.join(path, "**", "*.blend") if recursive else os.path.join(path, "*.blend")
+            files.extend(glob.glob(pattern, recursive=recursive))
+        elif path.lower().endswith(".blend") and os.path.isfile(path):
+            files.append(path)
+        else:
+            print(f"Skipping {path}: not a .blend file or directory")
+    return sorted({os.path.abspath(f) for f in files})
+
+
+class BatchExporter:
+    """
+    Run the Blender to Maya pipeline over many .blend files.
+
+    workers: concurrent Blender processes
+    timeout: seconds before a Blender process is killed (None = no limit)
+    retries: extra attempts for a file that failed or timed out
+    incremental: skip pipeline stages with nothing new to do (blender_to_maya.py --incremental)
+    pipeline_args: extra arguments for blender_to_maya.py (e.g. ["--fused-cleanup"])
+    """
+    def __init__(self, blender_exe, workers=None, timeout=None, retries=0, incremental=False, pipeline_args=()):
+        self.blender_exe = blender_exe
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.retries = retries
+        self.incremental = incremental
+        self.pipeline_args = list(pipeline_args)
+
+    def command(self, blend_file):
+        return [
+            self.blender_exe, "--background", blend_file,
+            "--python-exit-code", "1",
+            "--python", PIPELINE_SCRIPT,
+            "--", "--strict",
+        ] + (["--incremental"] if self.incremental else []) + self.pipeline_args
+
+    @staticmethod
+    def outputs(blend_file):
+        folder = os.path.join(os.path.dirname(blend_file), "to_maya")
+        base = os.path.splitext(os.path.basename(blend_file))[0]
+        return folder, base
+
+    def export_one(self, blend_file):
+        """Convert one file, retrying on failure. Returns its manifest entry."""
+        folder, base = self.outputs(blend_file)
+        os.makedirs(folder, exist_ok=True)
+        log_path = os.path.join(folder, f"{base}.batch.log")
+        entry = {"blend": blend_file, "log": log_path, "attempts": 0}
+        start = time.perf_counter()
+
+        with open(log_path, "w", encoding="utf-8", errors="replace") as log:
+            for attempt in range(1, self.retries + 2):
+                entry["attempts"] = attempt
+                log.write(f"=== Attempt {attempt}: {' '.join(self.command(blend_file))}\n")
+                log.flush()
+                try:
+                    result = subprocess.run(
+                        self.command(blend_file), stdout=log, stderr=subprocess.STDOUT, timeout=self.timeout
+                    )
+                    entry["returncode"] = result.returncode
+                    entry["status"] = "ok" if result.returncode == 0 else "failed"
+                except subprocess.TimeoutExpired:
+                    entry["returncode"] = None
+                    entry["status"] = "timeout"
+                    log.write(f"\n=== Killed after {self.timeout}s\n")
+                except OSError as e:
+                    entry["returncode"] = None
+                    entry["status"] = "failed"
+                    log.write(f"\n=== Could not start Blender: {e}\n")
+                if entry["status"] == "ok":
+                    break
+
+        entry["seconds"] = round(time.perf_counter() - start, 2)
+        entry["outputs"] = sorted(
+            os.path.join(folder, name) for name in os.listdir(folder)
+            if os.path.splitext(name)[0] == base
+        )
+        return entry
+
+    def run(self, blend_files, manifest_path=None):
+        """Convert every file. Returns the manifest (also written to manifest_path if given)."""
+        print(f"Converting {len(blend_files)} file(s) with {self.workers} worker(s)")
+        start = time.perf_counter()
+        entries = []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self.export_one, f): f for f in blend_files}
+            for done, future in enumerate(as_completed(futures), 1):
+                entry = future.result()
+                entries.append(entry)
+                print(f"[{done}/{len(blend_files)}] {entry['status']:7s} {entry['seconds']:8.1f}s  {entry['blend']}")
+
+        entries.sort(key=lambda e: e["blend"])
+        failed = [e["blend"] for e in entries if e["status"] != "ok"]
+        manifest = {
+            "blender": self.blender_exe,
+            "workers": self.workers,
+            "timeout": self.timeout,
+            "retries": self.retries,
+            "seconds": round(time.perf_counter() - start, 2),
+            "total": len(entries),
+            "succeeded": len(entries) - len(failed),
+            "failed": failed,
+            "files": entries,
+        }
+        if manifest_path:
+            with open(manifest_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=4)
+            print(f"Manifest saved to: {manifest_path}")
+        print(f"{manifest['succeeded']}/{manifest['total']} converted in {manifest['seconds']}s")
+        for blend in failed:
+            print(f"  FAILED: {blend}")
+        return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert many .blend files for Maya in parallel.")
+    parser.add_argument("paths", nargs="+", help=".blend files or folders containing them")
+    parser.add_argument("-r", "--recursive", action="store_true", help="search folders recursively")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="concurrent Blender processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds per attempt before Blender is killed")
+    parser.add_argument("--retries", type=int, default=0, help="extra attempts for a failed file")
+    parser.add_argument("--incremental", action="store_true", help="skip stages whose inputs are unchanged since the last run")
+    parser.add_argument("--fused-cleanup", action="store_true", help="clean materials in one pass (cleanup engine)")
+    parser.add_argument("--texture-proxies", action="store_true", help="write downsampled textures for Maya")
+    parser.add_argument("--texture-budget", type=float, default=None,
+                        help="scene texture memory in MB for proxy levels (implies --texture-proxies)")
+    parser.add_argument("--texture-store", default=None, help="shared texture store directory (default: $B2M_TEXTURE_STORE)")
+    parser.add_argument("--blender", default=None, help="path to the Blender executable")
+    parser.add_argument("--manifest", default="batch_manifest.json", help="where to write the JSON summary")
+    args = parser.parse_args(argv)
+
+    blender_exe = find_blender(args.blender)
+    if not blender_exe:
+        parser.error("No Blender executable found, pass --blender or set BLENDER_EXE")
+    blend_files = collect_blend_files(args.paths, args.recursive)
+    if not blend_files:
+        parser.error("No .blend files found")
+
+    pipeline_args = ["--fused-cleanup"] if args.fused_cleanup else []
+    if args.texture_proxies:
+        pipeline_args.append("--texture-proxies")
+    if args.texture_budget is not None:
+        pipeline_args += ["--texture-budget", str(args.texture_budget)]
+    if args.texture_store:
+        pipeline_args += ["--texture-store", os.path.abspath(args.texture_store)]
+    exporter = BatchExporter(blender_exe, workers=args.workers, timeout=args.timeout, retries=args.retries,
+                             incremental=args.incremental, pipeline_args=pipeline_args)
+    manifest = exporter.run(blend_files, args.manifest)
+    return 1 if manifest["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+import os
+import sys
+import time
+
+import bpy
+
+from blender_node_graph import NodeGraphIndex
+from blender_delete_unused_data import DeleteFloatingNodes
+from blender_legacy_material_cleaner import LegacyMaterialCleaner
+from blender_node_cleaner import MaterialNodeCleaner
+
+MISC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "misc")
+if MISC_DIR not in sys.path:
+    sys.path.append(MISC_DIR)
+
+from blender_textures_color_space_manager import ColorspaceResolver
+
+
+class MaterialContext:
+    """
+    One material as seen by the rules: its link index and its nodes bucketed by
+    type, both built in a single pass over the tree. Rules edit the tree through
+    add_node() / remove_node() so later rules see the current state without
+    scanning again.
+    """
+    def __init__(self, mat):
+        self.mat = mat
+        self.tree = mat.node_tree
+        self.graph = NodeGraphIndex(self.tree)
+        self.by_type = {}
+        self.position = {}
+        for node in self.tree.nodes:
+            self.add_node(node)
+
+    def nodes(self, *types):
+        """
+        Nodes of the given types (every node when none is given) in tree order.
+        Returns a copy, so rules can edit the tree while looping over it.
+        """
+        buckets = [self.by_type.get(t, ()) for t in types] if types else self.by_type.values()
+        return sorted((n for bucket in buckets for n in bucket), key=self.position.__getitem__)
+
+    def types(self):
+        return list(self.by_type)
+
+    def add_node(self, node):
+        self.by_type.setdefault(node.type, []).append(node)
+        self.position[node] = len(self.position)
+
+    def remove_node(self, node):
+        """Drop a node from the buckets and the graph, then from the tree."""
+        bucket = self.by_type.get(node.type, [])
+        if node in bucket:
+            bucket.remove(node)
+        self.graph.remove_node(node)
+        self.tree.nodes.remove(node)
+
+    def forget_node(self, node):
+        """Drop a node a rule already removed from the tree and the graph."""
+        bucket = self.by_type.get(node.type, [])
+        if node in bucket:
+            bucket.remove(node)
+
+
+# ------------------------------------------------------------
+# Rules: each wraps one of the existing cleaners
+# ------------------------------------------------------------
+class CleanupRule:
+    """
+    begin_scene() runs once before the materials are visited, visit() once per
+    material and end_scene() once after the last one. All return the number of
+    changes they made.
+    """
+    name = "rule"
+
+    def begin_scene(self):
+        return 0
+
+    def visit(self, ctx):
+        return 0
+
+    def end_scene(self):
+        return 0
+
+
+class LegacyShaderRule(CleanupRule):
+    """Replace Glass/Emission/Diffuse shaders with a Principled BSDF."""
+    name = "legacy_shaders"
+
+    def __init__(self):
+        self.cleaner = LegacyMaterialCleaner()
+
+    def visit(self, ctx):
+        changes = 0
+        for node in ctx.nodes(*self.cleaner.shader_map):
+            ctx.forget_node(node)
+            ctx.add_node(self.cleaner.replace_node(ctx.mat, node, ctx.graph))
+            changes += 1
+        return changes
+
+
+class DisallowedNodeRule(CleanupRule):
+    """Splice out nodes Maya has no translator for, keeping the chain connected."""
+    name = "disallowed_nodes"
+
+    def __init__(self):
+        self.cleaner = MaterialNodeCleaner()
+
+    def visit(self, ctx):
+        # Only the buckets of unwanted types are looked at
+        unwanted = [t for t in ctx.types() if t not in self.cleaner.allowed_nodes and t != "MIX"]
+        nodes = ctx.nodes(*unwanted) if unwanted else []
+        for node in nodes:
+            ctx.forget_node(node)
+        if nodes:
+            self.cleaner.splice_nodes(ctx.tree, nodes, ctx.graph)
+        return len(nodes)
+
+
+class DeadNodeRule(CleanupRule):
+    """Delete unused materials first, then every node that does not feed the output."""
+    name = "dead_nodes"
+
+    def begin_scene(self):
+        unused = [m for m in bpy.data.materials if m.users == 0]
+        for mat in unused:
+            bpy.data.materials.remove(mat)
+        return len(unused)
+
+    def visit(self, ctx):
+        names, links = DeleteFloatingNodes.remove_dead(ctx.mat, ctx.graph, before_remove=ctx.forget_node)
+        return len(names) + links
+
+
+class ColorspaceRule(CleanupRule):
+    """
+    sRGB for images feeding Base Color, Non-Color for every other input.
+    Images are collected per material and assigned once the whole scene is known.
+    """
+    name = "colorspaces"
+
+    def begin_scene(self):
+        self.resolver = ColorspaceResolver()
+        return 0
+
+    def visit(self, ctx):
+        added = self.resolver.add_material(ctx.mat, ctx.graph, ctx.nodes("BSDF_PRINCIPLED"))
+        for node in added:
+            ctx.add_node(node)
+        return len(added)
+
+    def end_scene(self):
+        return self.resolver.resolve()
+
+
+# Application order: later rules see the result of earlier ones
+DEFAULT_RULES = [LegacyShaderRule, DisallowedNodeRule, DeadNodeRule, ColorspaceRule]
+
+
+class CleanupEngine:
+    """
+    Walk every material once and apply the rules in order, instead of one full
+    pass over the scene per cleaner. Reports changes and time per rule.
+    """
+    def __init__(self, rules=None):
+        self.rules = [rule() for rule in (rules or DEFAULT_RULES)]
+        self.stats = {}
+
+    def _timed(self, rule, call, *args):
+        start = time.perf_counter()
+        changes = call(*args)
+        stats = self.stats[rule.name]
+        stats["changes"] += changes
+        stats["seconds"] += time.perf_counter() - start
+
+    def clean_all(self):
+        self.stats = {rule.name: {"changes": 0, "seconds": 0.0} for rule in self.rules}
+        for rule in self.rules:
+            self._timed(rule, rule.begin_scene)
+
+        visited = 0
+        for mat in bpy.data.materials:
+            if not mat.use_nodes or not mat.node_tree:
+                continue
+            ctx = MaterialContext(mat)
+            visited += 1
+            for rule in self.rules:
+                self._timed(rule, rule.visit, ctx)
+
+        for rule in self.rules:
+            self._timed(rule, rule.end_scene)
+
+        print(f"Cleanup engine: {visited} materials")
+        for name, stats in self.stats.items():
+            print(f"  {name:18s} {stats['changes']:6d} changes  {stats['seconds'] * 1000:9.2f} ms")
+        return self.stats
+
+
+# Usage
+if __name__ == "__main__":
+    CleanupEngine().clean_all()
@@ -1,50 +1,179 @@
 import bpy
 
+from blender_node_graph import NodeGraphIndex
+
+
 class DeleteFloatingNodes:
+    def __init__(self):
+        # {material name: (node count, link count, graph, find_dead result)} from has_work(),
+        # so a clean_all(probe=self) right after it does not walk every tree again
+        self.probed = {}
+
+    # ------------------------------------------------
+    # Liveness: a node is kept only if it feeds the active output
+    # ------------------------------------------------
     @staticmethod
-    def delete_unused_nodes():
-        """Delete unconnected nodes and useless normal/bump nodes."""
-        for mat in bpy.data.materials:
-            if not mat.use_nodes:
-                continue
-            nodes = mat.node_tree.nodes
-            links = mat.node_tree.links
+    def output_nodes(tree):
+        """Roots of the liveness walk: the active material output(s) and AOV outputs."""
+        return [
+            n for n in tree.nodes
+            if (n.type == 'OUTPUT_MATERIAL' and getattr(n, "is_active_output", False)) or n.type == 'OUTPUT_AOV'
+        ]
 
-            # Collect nodes to remove
-            to_remove = []
+    @staticmethod
+    def is_dead_normal(n, graph):
+        """Normal Map/Bump feeding a Principled Normal input with nothing plugged into it."""
+        if n.type not in {'NORMAL_MAP', 'BUMP'}:
+            return False
+        # Check if output is connected to a Principled BSDF Normal input
+        connected_to_normal = any(
+            link.to_socket.name == 'Normal' and link.to_node.type == 'BSDF_PRINCIPLED'
+            for link in graph.output_links(n)
+        )
+        if not connected_to_normal:
+            return False
+        # NORMAL_MAP nodes: check "Color" input, BUMP nodes: check "Height" input
+        source = n.inputs['Color'] if n.type == 'NORMAL_MAP' else n.inputs['Height']
+        return not graph.is_linked(source)
 
-            for n in nodes:
-                inputs = list(n.inputs)
-                outputs = list(n.outputs)
+    @staticmethod
+    def constant_mix_dead_input(n, graph):
+        """
+        The input a Mix node ignores because its factor is an unlinked 0 or 1,
+        or None. A factor of 1 only drops A for a plain linear mix. An unclamped
+        factor (Mix node with clamp_factor off) extrapolates past 0 and 1, so
+        only exactly 0 or 1 counts there.
+        """
+        if n.type == 'MIX_SHADER':
+            fac, a, b = n.inputs[0], n.inputs[1], n.inputs[2]
+            linear = clamped = True
+        elif n.type in {'MIX_RGB', 'MIX'}:
+            # The MIX node has one socket set per data type, only one of them enabled
+            enabled = [s for s in n.inputs if getattr(s, "enabled", True)]
+            by_name = {}
+            for sock in enabled:
+                by_name.setdefault(sock.name, sock)
+            fac = by_name.get("Fac") or by_name.get("Factor")
+            a = by_name.get("Color1") or by_name.get("A")
+            b = by_name.get("Color2") or by_name.get("B")
+            linear = getattr(n, "blend_type", 'MIX') == 'MIX' or getattr(n, "data_type", 'RGBA') != 'RGBA'
+            # The legacy MixRGB always clamps its factor; use_clamp is about the result
+            clamped = n.type == 'MIX_RGB' or getattr(n, "clamp_factor", True)
+        else:
+            return None
+        if fac is None or a is None or b is None or graph.is_linked(fac):
+            return None
+        value = getattr(fac, "default_value", None)
+        if not isinstance(value, (int, float)):
+            return None  # non-uniform vector factor
+        if not clamped and value not in (0.0, 1.0):
+            return None
+        if value <= 0.0:
+            return b
+        if value >= 1.0 and linear:
+            return a
+        return None
+
+    @staticmethod
+    def find_dead(mat, graph=None):
+        """
+        Walk back from the output in O(nodes + links).
+        Returns (nodes not on a live path, linked inputs ignored by constant Mix nodes).
+        Without an output node only unconnected nodes count as dead.
+        """
+        tree = mat.node_tree
+        if graph is None:
+            graph = NodeGraphIndex(tree)
 
-                # --- 1. Standard unused nodes ---
-                if not any(s.is_linked for s in inputs + outputs) and n.type != 'OUTPUT_MATERIAL':
-                    to_remove.append(n)
+        roots = DeleteFloatingNodes.output_nodes(tree)
+        if not roots:
+            unlinked = [n for n in tree.nodes if not graph.node_is_linked(n) and n.type != 'OUTPUT_MATERIAL']
+            return unlinked, []
+
+        live = set(roots)
+        stack = list(roots)
+        dead_inputs = []
+        while stack:
+            node = stack.pop()
+            ignored = DeleteFloatingNodes.constant_mix_dead_input(node, graph)
+            for sock in node.inputs:
+                # bpy makes a new socket wrapper per access; == compares the pointers
+                if sock == ignored:
+                    if graph.is_linked(sock):
+                        dead_inputs.append(sock)
                     continue
+                for link in graph.links(sock):
+                    upstream = link.from_node
+                    if upstream not in live and not DeleteFloatingNodes.is_dead_normal(upstream, graph):
+                        live.add(upstream)
+                        stack.append(upstream)
+        return [n for n in tree.nodes if n not in live], dead_inputs
+
+    @staticmethod
+    def nodes_to_remove(mat, graph=None):
+        """Nodes that do not reach the output, including useless normal/bump nodes."""
+        return DeleteFloatingNodes.find_dead(mat, graph)[0]
 
-                # --- 2. Normal/Bump nodes with no color input connected ---
-                if n.type in {'NORMAL_MAP', 'BUMP'}:
-                    # Check if output is connected to a Principled BSDF Normal input
-                    connected_to_normal = False
-                    for out_socket in outputs:
-                        for link in out_socket.links:
-                            if link.to_socket.name == 'Normal' and link.to_node.type == 'BSDF_PRINCIPLED':
-                                connected_to_normal = True
-                                break
-                    # If connected to Normal but input is empty, mark for removal
-                    if connected_to_normal:
-                        # NORMAL_MAP nodes: check "Color" input
-                        if n.type == 'NORMAL_MAP' and not n.inputs['Color'].is_linked:
-                            to_remove.append(n)
-                        # BUMP nodes: check "Height" input
-                        elif n.type == 'BUMP' and not n.inputs['Height'].is_linked:
-                            to_remove.append(n)
-
-            # Remove collected nodes
-            for node in to_remove:
-                nodes.remove(node)
+    @staticmethod
+    def remove_dead(mat, graph=None, before_remove=None, found=None):
+        """
+        Remove dead nodes and the links into ignored Mix inputs.
+        `before_remove(node)` is called for every node about to go.
+        `found` is a find_dead(mat, graph) result computed earlier, if any.
+        Returns (names of removed nodes, number of removed links).
+        """
+        tree = mat.node_tree
+        if graph is None:
+            graph = NodeGraphIndex(tree)
+        dead, dead_inputs = found if found is not None else DeleteFloatingNodes.find_dead(mat, graph)
+
+        removed_links = 0
+        if dead_inputs:
+            targets = set(dead_inputs)
+            for link in [l for l in tree.links if l.to_socket in targets]:
+                tree.links.remove(link)
+                removed_links += 1
+            for sock in targets:
+                graph.remove_links_to(sock)
+
+        names = []
+        gone = set()
+        for node in dead:
+            for sock in list(node.inputs) + list(node.outputs):
+                gone.update(graph.links(sock))
+            names.append(node.name)
+            if before_remove:
+                before_remove(node)
+            graph.remove_node(node)
+            tree.nodes.remove(node)
+        removed_links += len(gone)
+
+        if names or removed_links:
+            print(f"[{mat.name}] removed {len(names)} dead node(s), {removed_links} link(s)")
+        return names, removed_links
+
+    @staticmethod
+    def delete_unused_nodes(probed=None):
+        """
+        Delete every node that does not feed the material output.
+        `probed` is the has_work() cache of a probe of this same scene.
+        Returns {material name: {"nodes": [removed names], "links": count}}.
+        """
+        report = {}
+        probed = probed or {}
+        for mat in bpy.data.materials:
+            if not mat.use_nodes:
+                continue
+            cached = probed.get(mat.name)
+            if cached and cached[:2] == (len(mat.node_tree.nodes), len(mat.node_tree.links)):
+                names, links = DeleteFloatingNodes.remove_dead(mat, cached[2], found=cached[3])
+            else:
+                names, links = DeleteFloatingNodes.remove_dead(mat)
+            if names or links:
+                report[mat.name] = {"nodes": names, "links": links}
 
         print("Unused nodes and dead normal/bump nodes deleted.")
+        return report
 
     @staticmethod
     def delete_unused_materials():
@@ -54,11 +183,33 @@ class DeleteFloatingNodes:
             bpy.data.materials.remove(mat)
         print("Unused materials deleted.")
 
+    def has_work(self):
+        """
+        Check used by the pipeline to skip this stage. The liveness walks it does
+        are kept on this probe for clean_all(probe=self), which then only removes.
+        """
+        self.probed = {}
+        if any(m.users == 0 for m in bpy.data.materials):
+            return True
+        for mat in bpy.data.materials:
+            if not mat.use_nodes:
+                continue
+            tree = mat.node_tree
+            graph = NodeGraphIndex(tree)
+            found = self.find_dead(mat, graph)
+            self.probed[mat.name] = (len(tree.nodes), len(tree.links), graph, found)
+            if any(found):
+                return True
+        self.probed = {}
+        return False
+
     @classmethod
-    def clean_all(cls):
-        cls.delete_unused_nodes()
+    def clean_all(cls, probe=None):
+        """`probe`: the DeleteFloatingNodes whose has_work() just ran on this scene, if any."""
+        report = cls.delete_unused_nodes(probe.probed if probe else None)
         cls.delete_unused_materials()
         print("Material cleaning complete.")
+        return report
 
 
 # --- Usage ---
@@ -1,5 +1,8 @@
 import bpy
 
+from blender_node_graph import NodeGraphIndex
+
+
 class LegacyMaterialCleaner:
     def __init__(self):
         self.shader_map = {
@@ -13,15 +16,26 @@ class LegacyMaterialCleaner:
             if mat.node_tree:
                 self.clean_material(mat)
 
+    def has_work(self):
+        """True if any material still uses a legacy shader."""
+        return any(
+            node.type in self.shader_map
+            for mat in bpy.data.materials if mat.node_tree
+            for node in mat.node_tree.nodes
+        )
+
     def clean_material(self, mat):
         nodes = mat.node_tree.nodes
+        graph = NodeGraphIndex(mat.node_tree)
         for node in list(nodes):
             if node.type in self.shader_map:
-                self.replace_node(mat, node)
+                self.replace_node(mat, node, graph)
 
-    def replace_node(self, mat, node):
+    def replace_node(self, mat, node, graph=None):
         nodes = mat.node_tree.nodes
         links = mat.node_tree.links
+        if graph is None:
+            graph = NodeGraphIndex(mat.node_tree)
 
         principled = nodes.new(type='ShaderNodeBsdfPrincipled')
         principled.location = node.location
@@ -30,11 +44,12 @@ class LegacyMaterialCleaner:
         self.shader_map[node.type](node, principled)
 
         # Reconnect outgoing links
-        for output in node.outputs:
-            for link in output.links:
-                links.new(principled.outputs[0], link.to_socket)
+        for link in graph.output_links(node):
+            graph.add_link(links.new(principled.outputs[0], link.to_socket))
 
+        graph.remove_node(node)
         nodes.remove(node)
+        return principled
 
     # --- Copy functions ---
     def copy_glass_to_principled(self, old_node, new_node):
@@ -1,16 +1,192 @@
 import bpy
 import json
 import os
+import sys
 import math
+import copy
+import hashlib
+
+from blender_node_graph import NodeGraphIndex
+
+# scene_io is shared with the Maya side
+SHARED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared")
+if SHARED_DIR not in sys.path:
+    sys.path.append(SHARED_DIR)
+from scene_io import MaterialWriter, atomic_open, load_materials, write_index
+from scene_binary import BinaryMaterialWriter, EXTENSION as BINARY_EXTENSION
+from texture_proxies import read_manifest
+
+
+# ------------------------------------------------------------
+# Structural hashing
+# ------------------------------------------------------------
+def canonical_material(record):
+    """
+    Return the record with node ids relabelled in order of first use (n0, n1, ...),
+    so graphs that only differ in Blender node names compare equal.
+    """
+    table = record.get("nodes", {})
+    labels = {}
+    queue = []
+
+    def walk(value):
+        if isinstance(value, dict):
+            out = {}
+            for key, item in value.items():
+                if key == "node_id":
+                    if item not in labels:
+                        labels[item] = f"n{len(labels)}"
+                        queue.append(item)
+                    out[key] = labels[item]
+                else:
+                    out[key] = walk(item)
+            return out
+        if isinstance(value, list):
+            return [walk(item) for item in value]
+        return value
+
+    body = walk({k: v for k, v in record.items() if k not in ("nodes", "changed")})
+    nodes = []
+    while len(nodes) < len(queue):
+        nodes.append(walk(table.get(queue[len(nodes)])))
+    return {"material": body, "nodes": nodes}
+
+
+def material_hash(record):
+    """Content hash of a material graph, independent of node names."""
+    canonical = json.dumps(canonical_material(record), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def expand_materials(materials):
+    """
+    Undo aliasing and templating of a saved JSON: return a full, independent
+    record for every material name (without "changed"/"parameters" flags).
+    """
+    def strip(rec):
+        return {k: v for k, v in rec.items() if k not in ("changed", "parameters")}
+
+    full = {name: strip(rec) for name, rec in materials.items()
+            if "alias_of" not in rec and "template" not in rec}
+    for name, rec in materials.items():
+        if "alias_of" in rec and rec["alias_of"] in full:
+            full[name] = copy.deepcopy(full[rec["alias_of"]])
+        elif "template" in rec and rec["template"] in full:
+            expanded = copy.deepcopy(full[rec["template"]])
+            for channel, value in rec.get("overrides", {}).items():
+                expanded["channels"][channel] = {"source_type": "default", "value": value}
+            full[name] = expanded
+    return full
+
+
+def template_instances(materials):
+    """{template name: names of its instances} of packed materials."""
+    instances = {}
+    for name, rec in materials.items():
+        if "template" in rec:
+            instances.setdefault(rec["template"], set()).add(name)
+    return instances
+
+
+def _plain(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if hasattr(value, "__len__"):
+        return [_plain(v) for v in value]
+    return getattr(value, "name", repr(value))  # pointer sockets (Object, Image, ...)
+
+
+def material_fingerprint(mat):
+    """
+    Cheap hash of what the recorders read from a material: node types and
+    properties, socket defaults and links. Computed without recording.
+    """
+    digest = hashlib.sha1()
+
+    def feed(*parts):
+        digest.update(repr(parts).encode("utf-8"))
+
+    feed("use_nodes", mat.use_nodes)
+    if mat.use_nodes and mat.node_tree:
+        for node in mat.node_tree.nodes:
+            feed(node.name, node.type, getattr(node, "blend_type", None))
+            image = getattr(node, "image", None)
+            if image is not None:
+                feed(image.name, bpy.path.abspath(image.filepath))
+            ramp = getattr(node, "color_ramp", None)
+            if ramp is not None:
+                feed([(elem.position, _plain(elem.color)) for elem in ramp.elements])
+            for sock in node.inputs:
+                feed(sock.identifier, sock.type, _plain(getattr(sock, "default_value", None)))
+            for sock in node.outputs:
+                feed(sock.identifier, _plain(getattr(sock, "default_value", None)))
+        for link in mat.node_tree.links:
+            feed(link.from_node.name, link.from_socket.identifier,
+                 link.to_node.name, link.to_socket.identifier)
+    return digest.hexdigest()
+
+
+def topology_hash(record):
+    """
+    Hash of a Principled material with its constant channel values blanked out.
+    Materials sharing it differ only in those constants. None for other shaders.
+    """
+    if record.get("shader") != "Principled BSDF":
+        return None
+    stripped = dict(record)
+    stripped["channels"] = {
+        name: {"source_type": "default", "value": None} if info.get("source_type") == "default" else info
+        for name, info in record.get("channels", {}).items()
+    }
+    return material_hash(stripped)
+
 
 class MaterialCollector:
+    def __init__(self, deduplicate=True, templates=False, max_depth=None, incremental=False,
+                 layout="json", compact=False, echo=False, binary_options=None):
+        # Emit identical graphs once; other materials become {"alias_of": name}
+        self.deduplicate = deduplicate
+        # Collapse materials that only differ in channel constants into templates
+        self.templates = templates
+        # Re-record only materials whose fingerprint changed since the last run
+        self.incremental = incremental
+        # Output: "json", "jsonl" or "binary" layout, compact = no indentation, echo = print each record
+        self.layout = layout
+        self.compact = compact
+        self.echo = echo
+        # Binary layout: {"compression": "zlib"/"lzma"/"bz2", "float32": bool, "precision": decimals}
+        self.binary_options = binary_options or {}
+        # Upstream chains deeper than this are cut off with a warning (None = no limit)
+        self.max_depth = max_depth
+        # Proxy levels per texture path, from blender_texture_proxies' manifest
+        self.texture_proxies = {}
+        # Link index and recorded nodes of the material currently being walked
+        self.graph = None
+        self.node_records = {}
+        # Walk state: nodes still to record, nodes on the current path, current depth
+        self._missing = None
+        self._on_path = set()
+        self._depth = 0
+
     # ------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------
-    @staticmethod
-    def get_socket_default(socket):
+    def begin_tree(self, tree):
+        """Start walking a new node tree: fresh link index and node table."""
+        self.graph = NodeGraphIndex(tree)
+        self.node_records = {}
+        return self.graph
+
+    def graph_for(self, node):
+        """Return the link index for the node's tree, building it on first use."""
+        tree = node.id_data
+        if self.graph is None or self.graph.node_tree != tree:
+            self.begin_tree(tree)
+        return self.graph
+
+    def get_socket_default(self, socket):
         """Return default value (color: [R,G,B], scalar: float/vector)."""
-        if socket.is_linked:
+        if self.graph_for(socket.node).is_linked(socket):
             return None
         if hasattr(socket, "default_value"):
             val = socket.default_value
@@ -23,370 +199,97 @@ class MaterialCollector:
     @staticmethod
     def categorize_node(node):
         """Categorize nodes for later pipeline usage, MIX node is dynamic."""
-        # Dynamic categorization for MIX node
         if node.type == "MIX":
-            a_sock = node.inputs.get("A")
-            if a_sock:
-                if a_sock.type == 'RGBA':
-                    return "Color Node"
-                elif a_sock.type == 'VALUE':
-                    return "Float Node"
-                elif a_sock.type == 'VECTOR':
-                    return "Vector Node"
-                elif a_sock.type == 'SHADER':
-                    return "Shader Node"
-            return "Other"
-        if node.type in {"BSDF_PRINCIPLED", "MIX_SHADER"}:
-            return "Shader Node"
-        elif node.type in {"TEX_IMAGE", "MIX_RGB", "HUE_SAT", "INVERT", "RGB", "TEX_NOISE", "TEX_CHECKER", "VALTORGB"}:
-            return "Color Node"
-        elif node.type == "VALUE":
-            return "Float Node"
-        elif node.type in {"MAPPING", "NORMAL_MAP", "BUMP"}:
-            return "Vector Node"
-        return "Other"
+            return mix_category(node)
+        return NODE_CATEGORIES.get(node.type, "Other")
 
     # ------------------------------------------------------------
-    # Node Recorders
+    # Node Table
     # ------------------------------------------------------------
-    def record_node(self, node):
-        ncat = self.categorize_node(node)
-
-        # --- Image Texture ---
-        if node.type == "TEX_IMAGE":
-            if not node.image or not node.image.filepath:
+    def record_link(self, node):
+        """
+        Record an upstream node once per material and return a reference to it.
+        The full record lives in the material's "nodes" table under the node name.
+        """
+        self.graph_for(node)
+        if node.name not in self.node_records:
+            if self._missing is None:
+                self.walk(node)
+            elif node.name in self._on_path:
+                print(f"[MaterialCollector] Cycle through '{node.name}', link skipped")
+                return None
+            elif self.max_depth is not None and self._depth + 1 > self.max_depth:
+                print(f"[MaterialCollector] Depth limit {self.max_depth} reached at '{node.name}', link skipped")
                 return None
+            else:
+                # Inside a walk: ask for the node to be recorded first, then retry
+                self._missing.append(node)
+                return None
+        record = self.node_records[node.name]
+        if not record:
+            return None
+        return {"source_type": "node", "node_type": record["node_type"], "node_id": node.name}
 
-            # Absolute path
-            abs_path = bpy.path.abspath(node.image.filepath)
-
-            # Determine category based on the slot it drives
-            # Check if this image texture eventually drives Base Color, Emission, or Normal
-            # We'll use a default mapping for simplicity
-            category = "Other"
-            for out in node.outputs:
-                for link in out.links:
-                    to_node = link.to_node
-                    to_sock = link.to_socket
-                    if to_node.type == "BSDF_PRINCIPLED":
-                        if to_sock.name in {"Base Color", "Emission"}:
-                            category = "Color Node"
-                        elif to_sock.name == "Normal":
-                            category = "Color Node"  # keep Normal as Color for now
-                        else:
-                            category = "Float Node"
-                    elif to_node.type == "MIX_SHADER":
-                        # You can extend logic for mix shaders if needed
-                        pass
-
-            record = {
-                "source_type": "node",
-                "node_type": "Image Texture",
-                "category": category,  # Color Node or Float Node
-                "file_path": abs_path
-            }
-
-            # Record vector input if connected
-            if "Vector" in node.inputs and node.inputs["Vector"].is_linked:
-                sub_node = node.inputs["Vector"].links[0].from_node
-                if self.categorize_node(sub_node) == "Vector Node":
-                    sub = self.record_node(sub_node)
-                    if sub:
-                        record["vector"] = sub
-
-            return record
-
-
-
-        # --- RGB (Color Node) ---
-        if node.type == "RGB":
-            return {
-                "source_type": "node",
-                "node_type": "RGB",
-                "category": ncat,
-                "color": [float(c) for c in node.outputs[0].default_value[:3]]
-            }
-
-        # --- Noise Texture (Color Node) ---
-        if node.type == "TEX_NOISE":
-            record = {
-                "source_type": "node",
-                "node_type": "Noise Texture",
-                "category": ncat,
-            }
-            for pname in ["Scale", "Detail", "Lacunarity", "Distortion"]:
-                sock = node.inputs.get(pname)
-                if sock:
-                    if sock.is_linked:
-                        from_node = sock.links[0].from_node
-                        sub = self.record_node(from_node)
-                        record[pname.lower()] = sub if sub else {
-                            "source_type": "node", "node_type": from_node.type}
-                    else:
-                        record[pname.lower()] = self.get_socket_default(sock)
-            return record
-
-        # --- Checker Texture (Color Node) ---
-        if node.type == "TEX_CHECKER":
-            record = {
-                "source_type": "node",
-                "node_type": "Checker Texture",
-                "category": ncat,
-            }
-            for pname in ["Color1", "Color2", "Scale"]:
-                sock = node.inputs.get(pname)
-                if sock:
-                    if sock.is_linked:
-                        from_node = sock.links[0].from_node
-                        sub = self.record_node(from_node)
-                        record[pname.lower()] = sub if sub else {
-                            "source_type": "node", "node_type": from_node.type}
-                    else:
-                        record[pname.lower()] = self.get_socket_default(sock)
-            return record
+    def walk(self, root):
+        """
+        Record `root` and everything upstream of it with an explicit stack, in post-order.
+        A node is recorded once all of its inputs are in the node table; a node whose
+        recorder asked for missing inputs is retried after they are done, so the table
+        fills in the same order a depth-first recursion would give.
+        """
+        stack = [(root, 0)]
+        try:
+            while stack:
+                node, depth = stack[-1]
+                if node.name in self.node_records:
+                    stack.pop()
+                    continue
+
+                self._missing = []
+                self._depth = depth
+                record = self.record_node(node)
+                missing = list(dict.fromkeys(self._missing))
+                if missing:
+                    self._on_path.add(node.name)
+                    for child in reversed(missing):
+                        stack.append((child, depth + 1))
+                    continue
+
+                stack.pop()
+                self._on_path.discard(node.name)
+                self.node_records[node.name] = record
+        finally:
+            self._missing = None
+            self._on_path.clear()
+            self._depth = 0
+
+    def node_table(self):
+        return {name: rec for name, rec in self.node_records.items() if rec}
 
-        # --- Mix Node (dynamic type) ---
-        if node.type == "MIX":
-            a_sock = node.inputs.get("A")
-            if a_sock:
-                if a_sock.type == 'RGBA':
-                    mix_label = "Mix Color"
-                elif a_sock.type == 'VALUE':
-                    mix_label = "Mix Float"
-                elif a_sock.type == 'VECTOR':
-                    mix_label = "Mix Vector"
-                elif a_sock.type == 'SHADER':
-                    mix_label = "Mix Shader"
-                else:
-                    mix_label = "Mix"
-            else:
-                mix_label = "Mix"
-            record = {
-                "source_type": "node",
-                "node_type": mix_label,
-                "category": ncat,
-                "blend_type": getattr(node, "blend_type", None)
-            }
-            fac_sock = node.inputs.get("Factor")
-            if fac_sock:
-                if fac_sock.is_linked:
-                    from_node = fac_sock.links[0].from_node
-                    sub = self.record_node(from_node)
-                    record["fac"] = sub if sub else {
-                        "source_type": "node", "node_type": from_node.type}
-                else:
-                    record["fac"] = {"source_type": "default",
-                                     "value": self.get_socket_default(fac_sock)}
-            for key in ["A", "B"]:
-                sock = node.inputs.get(key)
-                if sock:
-                    if sock.is_linked:
-                        from_node = sock.links[0].from_node
-                        sub = self.record_node(from_node)
-                        if sub:
-                            record[key] = sub
-                        else:
-                            record[key] = {
-                                "source_type": "node", "node_type": from_node.type}
-                    else:
-                        record[key] = {"source_type": "default",
-                                       "value": self.get_socket_default(sock)}
-            return record
-
-        # --- MixRGB (legacy, Blender <4.0) ---
-        if node.type == "MIX_RGB":
-            record = {
-                "source_type": "node",
-                "node_type": "Mix Color",
-                "category": ncat,
-                "blend_type": getattr(node, "blend_type", "MIX")
-            }
-            fac_sock = node.inputs.get("Fac")
-            if fac_sock:
-                if fac_sock.is_linked:
-                    from_node = fac_sock.links[0].from_node
-                    sub = self.record_node(from_node)
-                    record["fac"] = sub if sub else {
-                        "source_type": "node", "node_type": from_node.type}
-                else:
-                    record["fac"] = {"source_type": "default",
-                                     "value": self.get_socket_default(fac_sock)}
-            for key, sock_name in [("A", "Color1"), ("B", "Color2")]:
-                sock = node.inputs.get(sock_name)
-                if sock:
-                    if sock.is_linked:
-                        from_node = sock.links[0].from_node
-                        sub = self.record_node(from_node)
-                        if sub:
-                            record[key] = sub
-                        else:
-                            record[key] = {
-                                "source_type": "node", "node_type": from_node.type}
-                    else:
-                        record[key] = {"source_type": "default",
-                                       "value": self.get_socket_default(sock)}
-            return record
-
-        # --- Invert Color ---
-        if node.type == "INVERT":
-            record = {
-                "source_type": "node",
-                "node_type": "Invert",
-                "category": ncat,
-            }
-            fac_sock = node.inputs.get("Fac")
-            if fac_sock:
-                if fac_sock.is_linked:
-                    from_node = fac_sock.links[0].from_node
-                    sub = self.record_node(from_node)
-                    record["fac"] = sub if sub else {
-                        "source_type": "node", "node_type": from_node.type}
-                else:
-                    record["fac"] = {"source_type": "default",
-                                     "value": self.get_socket_default(fac_sock)}
-            color_sock = node.inputs.get("Color")
-            if color_sock and color_sock.is_linked:
-                from_node = color_sock.links[0].from_node
-                sub = self.record_node(from_node)
-                if sub:
-                    record["input"] = sub
-                else:
-                    record["input"] = {
-                        "source_type": "node", "node_type": from_node.type}
-            return record
-
-        # --- Hue/Saturation/Value ---
-        if node.type == "HUE_SAT":
-            record = {
-                "source_type": "node",
-                "node_type": "HueSatVal",
-                "category": ncat,
-            }
-            for pname in ["Hue", "Saturation", "Value", "Fac"]:
-                sock = node.inputs.get(pname)
-                if sock:
-                    if sock.is_linked:
-                        from_node = sock.links[0].from_node
-                        sub = self.record_node(from_node)
-                        record[pname.lower()] = sub if sub else {
-                            "source_type": "node", "node_type": from_node.type}
-                    else:
-                        record[pname.lower()] = {"source_type": "default",
-                                                 "value": self.get_socket_default(sock)}
-            color_sock = node.inputs.get("Color")
-            if color_sock and color_sock.is_linked:
-                from_node = color_sock.links[0].from_node
-                sub = self.record_node(from_node)
-                if sub:
-                    record["input"] = sub
-                else:
-                    record["input"] = {
-                        "source_type": "node", "node_type": from_node.type}
-            return record
-
-        # --- Color Ramp (Color Node) ---
-        if node.type == "VALTORGB":
-            record = {
-                "source_type": "node",
-                "node_type": "Color Ramp",
-                "category": ncat,
-                "elements": []
-            }
-            # Record the ramp stops
-            for elem in node.color_ramp.elements:
-                record["elements"].append({
-                    "position": float(elem.position),
-                    "color": [float(c) for c in elem.color[:3]]
-                })
-            # Record the input if linked or value if default
-            input_sock = node.inputs.get("Fac")
-            if input_sock:
-                if input_sock.is_linked:
-                    from_node = input_sock.links[0].from_node
-                    sub = self.record_node(from_node)
-                    record["input"] = sub if sub else {"source_type": "node", "node_type": from_node.type}
-                else:
-                    record["input"] = {"source_type": "default", "value": self.get_socket_default(input_sock)}
-            return record
-
-        # --- Normal Map ---
-        if node.type == "NORMAL_MAP":
-            record = {
-                "source_type": "node",
-                "node_type": "Normal Map",
-                "category": ncat,
-                "strength": node.inputs["Strength"].default_value if not node.inputs["Strength"].is_linked else {
-                    "source_type": "node"}
-            }
-            if node.inputs["Color"].is_linked:
-                from_node = node.inputs["Color"].links[0].from_node
-                sub = self.record_node(from_node)
-                if sub:
-                    record["input"] = sub
-                else:
-                    record["input"] = {
-                        "source_type": "node", "node_type": from_node.type}
-            return record
-
-        # --- Bump ---
-        if node.type == "BUMP":
-            record = {
-                "source_type": "node",
-                "node_type": "Bump",
-                "category": ncat,
-                "strength": node.inputs["Strength"].default_value if not node.inputs["Strength"].is_linked else {
-                    "source_type": "node"}
-            }
-            if node.inputs["Height"].is_linked:
-                from_node = node.inputs["Height"].links[0].from_node
-                sub = self.record_node(from_node)
-                if sub:
-                    record["input"] = sub
-                else:
-                    record["input"] = {
-                        "source_type": "node", "node_type": from_node.type}
-            return record
-
-        # --- Value ---
-        if node.type == "VALUE":
-            return {
-                "source_type": "node",
-                "node_type": "Value",
-                "category": ncat,
-                "value": node.outputs[0].default_value
-            }
-
-        # --- Mapping ---
-        if node.type == "MAPPING":
-            record = {
-                "source_type": "node",
-                "node_type": "Mapping",
-                "category": ncat
-            }
-            for sock_name, key in [("Location", "location"), ("Rotation", "rotation"), ("Scale", "scale")]:
-                sock = node.inputs.get(sock_name)
-                if sock:
-                    val = [float(v) for v in sock.default_value[:3]]
-                    if sock_name == "Rotation":
-                        val = [round(math.degrees(x), 6) for x in val]
-                    record[key] = val
-            return record
-
-        return {"source_type": "node", "node_type": node.type, "category": ncat}
+    # ------------------------------------------------------------
+    # Node Recorders
+    # ------------------------------------------------------------
+    def record_node(self, node):
+        """Record one node through its registered recorder (see NODE_SPECS)."""
+        recorder = NODE_RECORDERS.get(node.type)
+        if recorder is None:
+            return {"source_type": "node", "node_type": node.type, "category": self.categorize_node(node)}
+        return recorder(self, node)
 
     # ------------------------------------------------------------
     # Principled BSDF Recorder
     # ------------------------------------------------------------
     def record_principled(self, node):
         data = {}
+        graph = self.graph_for(node)
 
         def add(name, socket_name, expected_node_categories):
             if socket_name not in node.inputs:
                 return
             sock = node.inputs[socket_name]
-            if sock.is_linked:
-                from_node = sock.links[0].from_node
-                sub = self.record_node(from_node)
+            if graph.is_linked(sock):
+                from_node = graph.from_node(sock)
+                sub = self.record_link(from_node)
                 if sub:
                     # Override category based on expected usage
                     if name in ["Base Color", "Emission Color", "Subsurface Color"]:
@@ -418,10 +321,10 @@ class MaterialCollector:
         for ch, socket_name, nodecats in channels:
             add(ch, socket_name, nodecats)
 
-        if "Normal" in node.inputs and node.inputs["Normal"].is_linked:
-            from_node = node.inputs["Normal"].links[0].from_node
+        if "Normal" in node.inputs and graph.is_linked(node.inputs["Normal"]):
+            from_node = graph.from_node(node.inputs["Normal"])
             if self.categorize_node(from_node) == "Vector Node":
-                sub = self.record_node(from_node)
+                sub = self.record_link(from_node)
                 if sub:
                     data["Normal"] = sub
             else:
@@ -437,12 +340,13 @@ class MaterialCollector:
     # ------------------------------------------------------------
     def record_mixshader(self, node):
         data = {"shader": "Mix Shader", "shaders": []}
+        graph = self.graph_for(node)
         fac_sock = node.inputs.get("Fac")
         if fac_sock:
-            if fac_sock.is_linked:
-                from_node = fac_sock.links[0].from_node
+            if graph.is_linked(fac_sock):
+                from_node = graph.from_node(fac_sock)
                 if self.categorize_node(from_node) in ["Float Node", "Color Node"]:
-                    sub = self.record_node(from_node)
+                    sub = self.record_link(from_node)
                     data["fac"] = sub if sub else {"source_type": "node", "node_type": from_node.type}
                 else:
                     data["fac"] = {"source_type": "node", "node_type": from_node.type}
@@ -450,8 +354,8 @@ class MaterialCollector:
                 data["fac"] = {"source_type": "default", "value": self.get_socket_default(fac_sock)}
         for sock in node.inputs:
             if sock.type == 'SHADER' and sock != node.outputs.get("Shader"):
-                if sock.is_linked:
-                    from_node = sock.links[0].from_node
+                if graph.is_linked(sock):
+                    from_node = graph.from_node(sock)
                     if from_node.type == "BSDF_PRINCIPLED":
                         data["shaders"].append(self.record_principled(from_node))
                     else:
@@ -467,30 +371,165 @@ class MaterialCollector:
         if not mat.use_nodes:
             return None
         ntree = mat.node_tree
+        graph = self.begin_tree(ntree)
         out = next((n for n in ntree.nodes if n.type == "OUTPUT_MATERIAL"), None)
         if not out:
             return None
         surf = out.inputs.get("Surface")
-        if not surf or not surf.is_linked:
+        if not surf or not graph.is_linked(surf):
             return None
-        from_node = surf.links[0].from_node
+        from_node = graph.from_node(surf)
         if from_node.type == "BSDF_PRINCIPLED":
-            return self.record_principled(from_node)
+            data = self.record_principled(from_node)
         elif from_node.type == "MIX_SHADER":
-            mix_data = self.record_mixshader(from_node)
-            return mix_data if mix_data else None
+            data = self.record_mixshader(from_node)
         else:
             return None
+        if data:
+            data["nodes"] = self.node_table()
+        return data if data else None
 
     # ------------------------------------------------------------
     # Main Collector
     # ------------------------------------------------------------
+    def iter_materials(self):
+        """
+        Yield (name, entry) as soon as each material is recorded. Only template
+        mode has to see every material first and buffers them.
+        """
+        recorded = ((mat.name, self.record_material(mat)) for mat in bpy.data.materials)
+        recorded = ((name, rec) for name, rec in recorded if rec)
+        if self.templates:
+            yield from self.pack_materials(dict(recorded)).items()
+        else:
+            yield from self.deduplicated(recorded)
+
     def collect_all_materials(self):
-        results = {}
+        return dict(self.iter_materials())
+
+    def deduplicated(self, recorded):
+        """Pass (name, record) pairs through, replacing repeated graphs by aliases."""
+        canonical_names = {}  # material hash -> first material recorded with it
+        for name, rec in recorded:
+            if self.deduplicate:
+                digest = material_hash(rec)
+                if digest in canonical_names:
+                    yield name, {"alias_of": canonical_names[digest]}
+                    continue
+                canonical_names[digest] = name
+            yield name, rec
+
+    def pack_materials(self, records):
+        """Apply deduplication and templates to {material name: full record}."""
+        results = dict(self.deduplicated(records.items()))
+        if self.templates:
+            self.build_templates(results)
+        return results
+
+    # ------------------------------------------------------------
+    # Incremental Collector
+    # ------------------------------------------------------------
+    def collect_changed_materials(self, previous, old_fingerprints):
+        """
+        Re-record only materials whose fingerprint differs from the last run and
+        reuse the saved records for the rest. Deleted materials drop out.
+        Every entry gets "changed": True/False, from comparing it with the entry
+        saved last time, so entries whose packing changed (a canonical becoming
+        an alias, a material joining or leaving a template) count as changed.
+        Returns (materials, fingerprints).
+        """
+        previous = {name: {k: v for k, v in rec.items() if k != "changed"} for name, rec in previous.items()}
+        full = expand_materials(copy.deepcopy(previous))
+        records = {}
+        fingerprints = {}
         for mat in bpy.data.materials:
+            fingerprint = material_fingerprint(mat)
+            fingerprints[mat.name] = fingerprint
+            if old_fingerprints.get(mat.name) == fingerprint and mat.name in full:
+                records[mat.name] = self.refresh_texture_proxies(full[mat.name])
+                continue
             rec = self.record_material(mat)
             if rec:
-                results[mat.name] = rec
+                records[mat.name] = rec
+
+        results = self.pack_materials(records)
+        changed = {name for name, rec in results.items() if previous.get(name) != rec}
+        # A template whose set of instances changed is rebuilt
+        instances, old_instances = template_instances(results), template_instances(previous)
+        changed.update(name for name in results if instances.get(name) != old_instances.get(name))
+        # Aliases and instances follow a rebuilt canonical/template (or the instance they alias)
+        grew = True
+        while grew:
+            grew = False
+            for name, rec in results.items():
+                target = rec.get("alias_of") or rec.get("template")
+                if target in changed and name not in changed:
+                    changed.add(name)
+                    grew = True
+        for name, rec in results.items():
+            rec["changed"] = name in changed
+        return results, fingerprints
+
+    def refresh_texture_proxies(self, record):
+        """Replace the proxy data of a reused record's image textures with the current manifest's."""
+        def walk(value):
+            if isinstance(value, dict):
+                if value.get("node_type") == "Image Texture":
+                    for key in ("resolution", "proxies", "proxy_level"):
+                        value.pop(key, None)
+                    proxies = self.texture_proxies.get(value.get("file_path"))
+                    if proxies:
+                        value["resolution"] = proxies["size"]
+                        value["proxies"] = proxies["proxies"]
+                        value["proxy_level"] = proxies["level"]
+                for item in value.values():
+                    walk(item)
+            elif isinstance(value, list):
+                for item in value:
+                    walk(item)
+        walk(record)
+        return record
+
+    # ------------------------------------------------------------
+    # Parameterized templates
+    # ------------------------------------------------------------
+    @staticmethod
+    def build_templates(results):
+        """
+        Group Principled materials by topology. The first material of each group
+        becomes the template and lists the varying channels under "parameters";
+        the others are replaced by {"template": name, "overrides": {channel: value}}.
+        """
+        groups = {}
+        for name, rec in results.items():
+            if "alias_of" in rec:
+                continue
+            key = topology_hash(rec)
+            if key is not None:
+                groups.setdefault(key, []).append(name)
+
+        for names in groups.values():
+            if len(names) < 2:
+                continue
+            template_name = names[0]
+            template = results[template_name]
+            parameters = {}
+            for channel, info in template["channels"].items():
+                if info.get("source_type") != "default":
+                    continue
+                values = [results[n]["channels"][channel]["value"] for n in names]
+                if any(v != values[0] for v in values[1:]):
+                    parameters[channel] = "color" if isinstance(values[0], list) else "float"
+            if not parameters:
+                continue
+
+            template["parameters"] = parameters
+            for name in names[1:]:
+                channels = results[name]["channels"]
+                results[name] = {
+                    "template": template_name,
+                    "overrides": {ch: channels[ch]["value"] for ch in parameters},
+                }
         return results
 
     # ------------------------------------------------------------
@@ -499,7 +538,12 @@ class MaterialCollector:
     def run_and_save_json(self, output_path=None):
         """
         Save JSON to the current .blend's folder in 'to_maya' with the same name as the .blend file,
-        unless output_path is given.
+        unless output_path is given. In incremental mode the fingerprints of the last run are kept
+        next to it in <name>.fingerprints.json. JSON layouts also get an offset index
+        in <name>.index.json. Each file is written to a temporary file first and
+        only replaces the old one once complete; the index and fingerprints are
+        written after the material file, so they never describe a file that is
+        not there.
         """
         # If output_path is not provided, compute it based on the current .blend
         if output_path is None:
@@ -509,14 +553,51 @@ class MaterialCollector:
             blend_dir = os.path.dirname(blend_path)
             blend_base = os.path.splitext(os.path.basename(blend_path))[0]
             output_folder = os.path.join(blend_dir, "to_maya")
-            output_path = os.path.join(output_folder, f"{blend_base}.json")
+            extension = {"jsonl": ".jsonl", "binary": BINARY_EXTENSION}.get(self.layout, ".json")
+            output_path = os.path.join(output_folder, f"{blend_base}{extension}")
+
+        fingerprints_path = os.path.splitext(output_path)[0] + ".fingerprints.json"
+        self.texture_proxies = read_manifest(os.path.splitext(output_path)[0] + ".proxies.json")
+        if self.incremental:
+            previous, old_fingerprints = {}, {}
+            if os.path.exists(output_path) and os.path.exists(fingerprints_path):
+                try:
+                    previous = load_materials(output_path)
+                    with open(fingerprints_path, "r", encoding="utf-8") as f:
+                        old_fingerprints = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"Could not read the last export ({e}), exporting every material")
+                    previous, old_fingerprints = {}, {}
+            mats_json, fingerprints = self.collect_changed_materials(previous, old_fingerprints)
+            n_changed = sum(1 for rec in mats_json.values() if rec["changed"])
+            print(f"Incremental export: {n_changed} changed, {len(mats_json) - n_changed} unchanged")
+            materials = mats_json.items()
+        else:
+            materials = self.iter_materials()
 
-        mats_json = self.collect_all_materials()
-        print(json.dumps(mats_json, indent=4))
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(mats_json, f, indent=4)
-        print(f"Materials JSON saved to: {output_path}")
+        if self.layout == "binary":
+            output = atomic_open(output_path, "wb")
+        else:
+            # newline="\n" keeps the byte offsets of the index valid on Windows
+            output = atomic_open(output_path, "w", encoding="utf-8", newline="\n")
+        with output as f:
+            if self.layout == "binary":
+                writer = BinaryMaterialWriter(f, **self.binary_options)
+            else:
+                writer = MaterialWriter(f, layout=self.layout, indent=None if self.compact else 4, echo=self.echo)
+            with writer:
+                for name, rec in materials:
+                    writer.write(name, rec)
+        print(f"{writer.count} materials saved to: {output_path}")
+
+        # Lets reader.read_materials() load a few materials without parsing the file
+        if self.layout != "binary":
+            write_index(output_path, writer)
+
+        if self.incremental:
+            with atomic_open(fingerprints_path, "w", encoding="utf-8") as f:
+                json.dump(fingerprints, f, indent=4)
 
     # ------------------------------------------------------------
     # "run" Entrypoint for batch scripts
@@ -525,6 +606,209 @@ class MaterialCollector:
         self.run_and_save_json()
 
 
+# ------------------------------------------------------------
+# Node Recorder Registry
+# ------------------------------------------------------------
+NODE_CATEGORIES = {
+    "BSDF_PRINCIPLED": "Shader Node",
+    "MIX_SHADER": "Shader Node",
+    "TEX_IMAGE": "Color Node",
+    "MIX_RGB": "Color Node",
+    "HUE_SAT": "Color Node",
+    "INVERT": "Color Node",
+    "RGB": "Color Node",
+    "TEX_NOISE": "Color Node",
+    "TEX_CHECKER": "Color Node",
+    "VALTORGB": "Color Node",
+    "VALUE": "Float Node",
+    "MAPPING": "Vector Node",
+    "NORMAL_MAP": "Vector Node",
+    "BUMP": "Vector Node",
+}
+
+# Socket type of the MIX node's "A" input -> (node_type label, category)
+MIX_SOCKET_TYPES = {
+    "RGBA": ("Mix Color", "Color Node"),
+    "VALUE": ("Mix Float", "Float Node"),
+    "VECTOR": ("Mix Vector", "Vector Node"),
+    "SHADER": ("Mix Shader", "Shader Node"),
+}
+
+
+def mix_label(node):
+    a_sock = node.inputs.get("A")
+    if not a_sock:
+        return "Mix"
+    return MIX_SOCKET_TYPES.get(a_sock.type, ("Mix", "Other"))[0]
+
+
+def mix_category(node):
+    a_sock = node.inputs.get("A")
+    if not a_sock:
+        return "Other"
+    return MIX_SOCKET_TYPES.get(a_sock.type, ("Mix", "Other"))[1]
+
+
+def ramp_elements(node):
+    return [{"position": float(elem.position), "color": [float(c) for c in elem.color[:3]]}
+            for elem in node.color_ramp.elements]
+
+
+class NodeSpec:
+    """
+    Declarative description of how one Blender node type is recorded.
+
+    label / category: fixed strings, or callables taking the node.
+    props:  [(key, getter(node))] read from node properties, recorded first.
+    inputs: [(socket name, key, kind)] read from input sockets, in order. Kinds:
+        "raw"      linked -> node reference, else the plain default value
+        "default"  linked -> node reference, else {"source_type": "default", "value": ...}
+        "link"     node reference, left out when nothing is connected
+        "strength" default_value as is, {"source_type": "node"} when linked
+        "vector"   default value as a 3-float list, links ignored
+        "rotation" like "vector", converted to degrees
+    """
+    def __init__(self, label, category=None, props=(), inputs=()):
+        self.label = label
+        self.category = category
+        self.props = list(props)
+        self.inputs = list(inputs)
+
+
+def record_image_texture(collector, node):
+    if not node.image or not node.image.filepath:
+        return None
+    graph = collector.graph_for(node)
+
+    # Absolute path
+    abs_path = bpy.path.abspath(node.image.filepath)
+
+    # Determine category based on the slot it drives
+    # Check if this image texture eventually drives Base Color, Emission, or Normal
+    # We'll use a default mapping for simplicity
+    category = "Other"
+    for link in graph.output_links(node):
+        to_node = link.to_node
+        to_sock = link.to_socket
+        if to_node.type == "BSDF_PRINCIPLED":
+            if to_sock.name in {"Base Color", "Emission"}:
+                category = "Color Node"
+            elif to_sock.name == "Normal":
+                category = "Color Node"  # keep Normal as Color for now
+            else:
+                category = "Float Node"
+
+    record = {
+        "source_type": "node",
+        "node_type": "Image Texture",
+        "category": category,  # Color Node or Float Node
+        "file_path": abs_path
+    }
+
+    # Downsampled versions Maya may load instead; proxy_level is the one that fits the scene budget
+    proxies = collector.texture_proxies.get(abs_path)
+    if proxies:
+        record["resolution"] = proxies["size"]
+        record["proxies"] = proxies["proxies"]
+        record["proxy_level"] = proxies["level"]
+
+    # Record vector input if connected
+    if "Vector" in node.inputs and graph.is_linked(node.inputs["Vector"]):
+        sub_node = graph.from_node(node.inputs["Vector"])
+        if collector.categorize_node(sub_node) == "Vector Node":
+            sub = collector.record_link(sub_node)
+            if sub:
+                record["vector"] = sub
+
+    return record
+
+
+def compile_recorder(node_type, spec):
+    """Turn a NodeSpec into a recorder function named record_<type> (visible in profiles)."""
+    label = spec.label
+    category = spec.category if spec.category is not None else NODE_CATEGORIES.get(node_type, "Other")
+    props = tuple(spec.props)
+    inputs = tuple(spec.inputs)
+    dynamic_label = callable(label)
+    dynamic_category = callable(category)
+
+    def recorder(collector, node):
+        graph = collector.graph_for(node)
+        record = {
+            "source_type": "node",
+            "node_type": label(node) if dynamic_label else label,
+            "category": category(node) if dynamic_category else category,
+        }
+        for key, getter in props:
+            record[key] = getter(node)
+        for sock_name, key, kind in inputs:
+            sock = node.inputs.get(sock_name)
+            if not sock:
+                continue
+            if kind == "vector" or kind == "rotation":
+                val = [float(v) for v in sock.default_value[:3]]
+                if kind == "rotation":
+                    val = [round(math.degrees(x), 6) for x in val]
+                record[key] = val
+            elif graph.is_linked(sock):
+                if kind == "strength":
+                    record[key] = {"source_type": "node"}
+                    continue
+                from_node = graph.from_node(sock)
+                sub = collector.record_link(from_node)
+                record[key] = sub if sub else {"source_type": "node", "node_type": from_node.type}
+            elif kind == "raw":
+                record[key] = collector.get_socket_default(sock)
+            elif kind == "default":
+                record[key] = {"source_type": "default", "value": collector.get_socket_default(sock)}
+            elif kind == "strength":
+                record[key] = sock.default_value
+        return record
+
+    name = f"record_{node_type.lower()}"
+    recorder.__name__ = recorder.__qualname__ = name
+    recorder.__code__ = recorder.__code__.replace(co_name=name)
+    return recorder
+
+
+NODE_SPECS = {
+    "TEX_IMAGE": record_image_texture,
+    "RGB": NodeSpec("RGB", props=[
+        ("color", lambda node: [float(c) for c in node.outputs[0].default_value[:3]])]),
+    "TEX_NOISE": NodeSpec("Noise Texture", inputs=[
+        (name, name.lower(), "raw") for name in ["Scale", "Detail", "Lacunarity", "Distortion"]]),
+    "TEX_CHECKER": NodeSpec("Checker Texture", inputs=[
+        (name, name.lower(), "raw") for name in ["Color1", "Color2", "Scale"]]),
+    "MIX": NodeSpec(mix_label, category=mix_category, props=[
+        ("blend_type", lambda node: getattr(node, "blend_type", None))], inputs=[
+        ("Factor", "fac", "default"), ("A", "A", "default"), ("B", "B", "default")]),
+    # Legacy MixRGB (Blender <4.0)
+    "MIX_RGB": NodeSpec("Mix Color", props=[
+        ("blend_type", lambda node: getattr(node, "blend_type", "MIX"))], inputs=[
+        ("Fac", "fac", "default"), ("Color1", "A", "default"), ("Color2", "B", "default")]),
+    "INVERT": NodeSpec("Invert", inputs=[
+        ("Fac", "fac", "default"), ("Color", "input", "link")]),
+    "HUE_SAT": NodeSpec("HueSatVal", inputs=[
+        (name, name.lower(), "default") for name in ["Hue", "Saturation", "Value", "Fac"]] + [
+        ("Color", "input", "link")]),
+    "VALTORGB": NodeSpec("Color Ramp", props=[("elements", ramp_elements)], inputs=[
+        ("Fac", "input", "default")]),
+    "NORMAL_MAP": NodeSpec("Normal Map", inputs=[
+        ("Strength", "strength", "strength"), ("Color", "input", "link")]),
+    "BUMP": NodeSpec("Bump", inputs=[
+        ("Strength", "strength", "strength"), ("Height", "input", "link")]),
+    "VALUE": NodeSpec("Value", props=[("value", lambda node: node.outputs[0].default_value)]),
+    "MAPPING": NodeSpec("Mapping", inputs=[
+        ("Location", "location", "vector"), ("Rotation", "rotation", "rotation"), ("Scale", "scale", "vector")]),
+}
+
+# Node type -> recorder(collector, node), compiled once at import
+NODE_RECORDERS = {
+    node_type: spec if callable(spec) else compile_recorder(node_type, spec)
+    for node_type, spec in NODE_SPECS.items()
+}
+
+
 if __name__ == "__main__":
     collector = MaterialCollector()
     collector.run_and_save_json()  # <--- No arguments needed!
\ No newline at end of file
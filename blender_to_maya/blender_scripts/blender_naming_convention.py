@@ -1,65 +1,134 @@
 import bpy
+import os
 import re
+import json
+
+# Prefix used for names that don't start with a letter -> bpy.data collection
+DATA_BLOCKS = {
+    "obj": "objects",
+    "mat": "materials",
+    "col": "collections",
+    "mesh": "meshes",
+    "curve": "curves",
+    "arm": "armatures",
+    "cam": "cameras",
+    "light": "lights",
+    "img": "images",
+    "tex": "textures",
+    "ng": "node_groups",
+    "act": "actions",
+}
+
+INVALID_CHARS = re.compile(r'[^A-Za-z0-9_]')
+UNDERSCORES = re.compile(r'_+')
+# Names clean_name() would return unchanged
+CLEAN_NAME = re.compile(r'[A-Za-z][A-Za-z0-9]*(?:_[A-Za-z0-9]+)*')
+
+TEMP_PREFIX = "__b2m_rename_"
+RENAME_MAP_VERSION = 1
+
+
+def rename_map_path():
+    """to_maya/<blend>.rename_map.json, or None for an unsaved file."""
+    blend_path = bpy.data.filepath
+    if not blend_path:
+        return None
+    blend_name = os.path.splitext(os.path.basename(blend_path))[0]
+    return os.path.join(os.path.dirname(blend_path), "to_maya", f"{blend_name}.rename_map.json")
+
 
 class MayaNamingConvention:
     def __init__(self):
         # Define the datablocks we want to rename
-        self.data_blocks = {
-            "obj": bpy.data.objects,
-            "mat": bpy.data.materials,
-            "col": bpy.data.collections,
-            "mesh": bpy.data.meshes,
-            "curve": bpy.data.curves,
-            "arm": bpy.data.armatures,
-            "cam": bpy.data.cameras,
-            "light": bpy.data.lights,
-            "img": bpy.data.images,
-            "tex": bpy.data.textures,
-            "ng": bpy.data.node_groups,
-            "act": bpy.data.actions,
-        }
+        self.data_blocks = {prefix: getattr(bpy.data, attr) for prefix, attr in DATA_BLOCKS.items()}
 
     @staticmethod
     def clean_name(name: str, prefix: str = "item") -> str:
         """Cleans the name to only English letters, numbers, and underscores"""
+        if CLEAN_NAME.fullmatch(name):
+            return name
         # Keep only A-Z, a-z, 0-9 and underscores
-        name = re.sub(r'[^A-Za-z0-9_]', '_', name)
+        name = INVALID_CHARS.sub('_', name)
         # Collapse multiple underscores
-        name = re.sub(r'_+', '_', name)
+        name = UNDERSCORES.sub('_', name)
         # Remove leading/trailing underscores
         name = name.strip('_')
         # Prepend prefix if name starts with number or underscore
-        if not name or re.match(r'^[^A-Za-z]', name):
+        if not name or not name[0].isalpha():
             name = f"{prefix}_{name}"
         return name
 
     @staticmethod
-    def ensure_unique(name: str, existing_names: set) -> str:
-        """Appends _01, _02, etc., if name already exists"""
+    def ensure_unique(name: str, existing_names: set, counters: dict = None) -> str:
+        """
+        Appends _01, _02, etc., if name already exists.
+        `counters` remembers the last suffix used per name, so a thousand
+        collisions on one name don't re-probe _01, _02, ... every time.
+        """
         if name not in existing_names:
             existing_names.add(name)
             return name
 
-        counter = 1
+        # Suffixes below the remembered one are all taken (names are never released)
+        counter = counters.get(name, 0) + 1 if counters is not None else 1
         new_name = f"{name}_{counter:02d}"
         while new_name in existing_names:
             counter += 1
             new_name = f"{name}_{counter:02d}"
+        if counters is not None:
+            counters[name] = counter
         existing_names.add(new_name)
         return new_name
 
-    # Calls the Code
-    def rename_all(self):
-        """Rename all objects, materials, collections, etc., in the scene"""
+    def planned_renames(self):
+        """Yield (prefix, item, old_name, new_name) for every datablock that needs a new name."""
         for prefix, datablock in self.data_blocks.items():
             existing_names = set()
+            counters = {}
             for item in datablock:
                 old_name = item.name
                 base_name = self.clean_name(old_name, prefix=prefix)
-                new_name = self.ensure_unique(base_name, existing_names)
+                new_name = self.ensure_unique(base_name, existing_names, counters)
                 if old_name != new_name:
-                    print(f"Renaming {prefix.upper()}: {old_name} -> {new_name}")
-                    item.name = new_name
+                    yield prefix, item, old_name, new_name
+
+    # Calls the Code
+    def rename_all(self):
+        """
+        Rename all objects, materials, collections, etc., in the scene.
+        Every renamed datablock first gets a temporary name, so a final name is
+        never still held by another datablock waiting for its own rename (Blender
+        would resolve that with a .001 suffix). Writes the old -> new names to
+        to_maya/<blend>.rename_map.json, empty when nothing needed renaming.
+        """
+        renames = list(self.planned_renames())
+        for i, (prefix, item, old_name, new_name) in enumerate(renames):
+            item.name = f"{TEMP_PREFIX}{i}"
+
+        rename_map = {attr: {} for attr in DATA_BLOCKS.values()}
+        for prefix, item, old_name, new_name in renames:
+            print(f"Renaming {prefix.upper()}: {old_name} -> {new_name}")
+            item.name = new_name
+            rename_map[DATA_BLOCKS[prefix]][old_name] = item.name
+
+        self.save_rename_map(rename_map)
+        return {attr: len(names) for attr, names in rename_map.items() if names}
+
+    @staticmethod
+    def save_rename_map(rename_map):
+        """
+        Save this run's renames, replacing the map of any earlier export. The
+        pipeline never saves the .blend, so every export renames the original
+        names again and the map must not carry anything over.
+        """
+        path = rename_map_path()
+        if path is None:
+            return
+        names = {attr: pairs for attr, pairs in rename_map.items() if pairs}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"version": RENAME_MAP_VERSION, "names": names}, f, indent=4)
+        print(f"Rename map saved to: {path}")
 
 
 # --------------------------
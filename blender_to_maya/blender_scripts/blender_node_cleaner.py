@@ -1,5 +1,8 @@
 import bpy
 
+from blender_node_graph import GraphLink, NodeGraphIndex
+
+
 class MaterialNodeCleaner:
     """
     Soft-deletes unwanted nodes, emulating Ctrl+X, reconnecting upstream to downstream
@@ -25,32 +28,80 @@ class MaterialNodeCleaner:
             "TEX_COORD"  # Texture Coordinate node
         }
 
-    def soft_delete_node(self, node):
-        tree = node.id_data
-        # Collect first upstream connection
-        first_input_source = None
-        for input_sock in node.inputs:
-            if input_sock.is_linked:
-                first_input_source = input_sock.links[0].from_socket
-                break
+    def soft_delete_node(self, node, graph=None):
+        self.splice_nodes(node.id_data, [node], graph)
+
+    def splice_nodes(self, tree, nodes, graph=None):
+        """
+        Soft-delete several nodes at once, with the same result as calling
+        soft_delete_node() on each of them in order.
+
+        The node-by-node relinking is replayed on the link index only; the tree
+        then gets one links.new() per input whose final source changed, instead
+        of one per removed node along a chain.
+        Returns the number of links created.
+        """
+        if graph is None:
+            graph = NodeGraphIndex(tree)
+        removed = set(nodes)
+        # Sources of the inputs as they are in the tree, before the replay
+        original = {}
+        touched = {}   # input socket -> its node
+
+        for node in nodes:
+            # First upstream connection
+            source = next((graph.links(s)[0] for s in node.inputs if graph.is_linked(s)), None)
+            if source:
+                # Connect this source to all output links
+                for link in graph.output_links(node):
+                    if link.to_socket not in original:
+                        original[link.to_socket] = list(graph.links(link.to_socket))
+                        touched[link.to_socket] = link.to_node
+                    graph.add_link(GraphLink(source.from_node, source.from_socket, link.to_node, link.to_socket))
+            graph.remove_node(node)
+
+        # Apply the difference to the tree
+        created = 0
+        stale = set()
+        for sock, owner in touched.items():
+            if owner in removed:
+                continue
+            wanted = [l.from_socket for l in graph.links(sock)]
+            before = original[sock]
+            for src in wanted:
+                if not any(l.from_socket == src for l in before):
+                    # Replaces the old link unless the socket takes several
+                    tree.links.new(src, sock)
+                    created += 1
+            if not wanted or getattr(sock, "is_multi_input", False):
+                stale.update((l.from_socket, sock) for l in before
+                             if l.from_node not in removed and l.from_socket not in wanted)
+        if stale:
+            for link in [l for l in tree.links if (l.from_socket, l.to_socket) in stale]:
+                tree.links.remove(link)
+
+        for node in nodes:
+            tree.nodes.remove(node)
+        return created
 
-        if first_input_source:
-            # Connect this source to all output links
-            for output_sock in node.outputs:
-                for link in list(output_sock.links):
-                    tree.links.new(first_input_source, link.to_socket)
+    def is_unwanted(self, node):
+        return node.type not in self.allowed_nodes and node.type != "MIX"
 
-        # Remove node
-        tree.nodes.remove(node)
+    def has_work(self):
+        """True if any material has a node that clean_materials() would remove."""
+        return any(
+            self.is_unwanted(node)
+            for mat in bpy.data.materials if mat.use_nodes
+            for node in mat.node_tree.nodes
+        )
 
     def clean_materials(self):
         for mat in bpy.data.materials:
             if not mat.use_nodes:
                 continue
-            nodes = list(mat.node_tree.nodes)
-            for node in nodes:
-                if node.type not in self.allowed_nodes and node.type != "MIX":
-                    self.soft_delete_node(node)
+            unwanted = [node for node in mat.node_tree.nodes if self.is_unwanted(node)]
+            if unwanted:
+                self.splice_nodes(mat.node_tree, unwanted)
 
         print("Node cleanup complete!")
 
@@ -0,0 +1,87 @@
+from collections import namedtuple
+
+# Plain snapshot of a link, so the index never touches a freed bpy link
+GraphLink = namedtuple("GraphLink", ["from_node", "from_socket", "to_node", "to_socket"])
+
+
+class NodeGraphIndex:
+    """
+    Socket adjacency for one node tree.
+
+    In Blender every `socket.links` / `socket.is_linked` lookup scans the whole
+    link list of the tree, so walking a material costs O(nodes x links).
+    This index reads `node_tree.links` once and answers the same questions
+    from dictionaries. Cleaners that edit the tree keep it in sync through
+    add_link() and remove_node().
+    """
+    def __init__(self, node_tree):
+        self.node_tree = node_tree
+        self.links_by_socket = {}
+        self.rebuild()
+
+    def rebuild(self):
+        self.links_by_socket = {}
+        for link in self.node_tree.links:
+            self._insert(GraphLink(link.from_node, link.from_socket, link.to_node, link.to_socket))
+
+    def _insert(self, glink):
+        self.links_by_socket.setdefault(glink.from_socket, []).append(glink)
+        self.links_by_socket.setdefault(glink.to_socket, []).append(glink)
+
+    def _discard(self, glink):
+        for sock in (glink.from_socket, glink.to_socket):
+            remaining = [l for l in self.links_by_socket.get(sock, ()) if l is not glink]
+            if remaining:
+                self.links_by_socket[sock] = remaining
+            else:
+                self.links_by_socket.pop(sock, None)
+
+    # ------------------------------------------------
+    # Queries
+    # ------------------------------------------------
+    def links(self, socket):
+        """Links touching a socket (incoming for inputs, outgoing for outputs)."""
+        return self.links_by_socket.get(socket, ())
+
+    def is_linked(self, socket):
+        return socket in self.links_by_socket
+
+    def from_node(self, socket):
+        """First upstream node feeding an input socket, or None."""
+        links = self.links_by_socket.get(socket)
+        return links[0].from_node if links else None
+
+    def from_socket(self, socket):
+        """First upstream socket feeding an input socket, or None."""
+        links = self.links_by_socket.get(socket)
+        return links[0].from_socket if links else None
+
+    def output_links(self, node):
+        """All links leaving a node, in output socket order."""
+        return [l for out in node.outputs for l in self.links_by_socket.get(out, ())]
+
+    def node_is_linked(self, node):
+        return any(s in self.links_by_socket for s in node.inputs) or \
+            any(s in self.links_by_socket for s in node.outputs)
+
+    # ------------------------------------------------
+    # Edits (mirror what was done to the real tree)
+    # ------------------------------------------------
+    def add_link(self, link):
+        """Record a link returned by `tree.links.new`, dropping the one it replaced."""
+        if not getattr(link.to_socket, "is_multi_input", False):
+            for old in list(self.links_by_socket.get(link.to_socket, ())):
+                self._discard(old)
+        self._insert(GraphLink(link.from_node, link.from_socket, link.to_node, link.to_socket))
+
+    def remove_links_to(self, socket):
+        """Drop the links into an input socket after they were removed from the tree."""
+        for glink in list(self.links_by_socket.get(socket, ())):
+            self._discard(glink)
+
+    def remove_node(self, node):
+        """Drop every link touching a node before it is removed from the tree."""
+        for sock in list(node.inputs) + list(node.outputs):
+            for glink in list(self.links_by_socket.get(sock, ())):
+                self._discard(glink)
+
@@ -0,0 +1,99 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import bpy
+
+SHARED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared")
+if SHARED_DIR not in sys.path:
+    sys.path.append(SHARED_DIR)
+
+from texture_proxies import choose_level, make_proxies, write_manifest
+
+DEFAULT_BUDGET_MB = 4096
+
+
+def manifest_path():
+    """to_maya/<blend>.proxies.json, next to the material JSON, or None for an unsaved file."""
+    blend_path = bpy.data.filepath
+    if not blend_path:
+        return None
+    blend_name = os.path.splitext(os.path.basename(blend_path))[0]
+    return os.path.join(os.path.dirname(blend_path), "to_maya", f"{blend_name}.proxies.json")
+
+
+class TextureProxyBuilder:
+    """
+    Writes 1/2, 1/4 and 1/8 versions of every image the material export will
+    reference into to_maya/proxies/, then picks the sharpest level at which the
+    whole scene's textures fit in budget_mb (uncompressed) and records it all in
+    the proxies manifest. The material exporter copies it into the JSON, so Maya
+    can choose between full resolution and proxies at import time.
+
+    Images are handled by a thread pool, as decoding and resizing release the
+    GIL (workers=0 runs them one by one); proxies newer than their source are
+    reused.
+    """
+    def __init__(self, budget_mb=None, workers=None):
+        self.budget_bytes = int((budget_mb or DEFAULT_BUDGET_MB) * 1048576)
+        self.workers = workers if workers is not None else min(4, os.cpu_count() or 1)
+
+    @staticmethod
+    def referenced_images():
+        """Absolute paths of the images of Image Texture nodes, as the material exporter records them."""
+        paths = []
+        for mat in bpy.data.materials:
+            if not mat.use_nodes or not mat.node_tree:
+                continue
+            for node in mat.node_tree.nodes:
+                if node.type == "TEX_IMAGE" and node.image and node.image.filepath:
+                    paths.append(bpy.path.abspath(node.image.filepath))
+        return list(dict.fromkeys(paths))
+
+    def run_jobs(self, sources, folder):
+        """{source: make_proxies() result}; failed images are reported and left out."""
+        results = {}
+        if self.workers > 0 and len(sources) > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = {pool.submit(make_proxies, source, folder): source for source in sources}
+                for future in as_completed(futures):
+                    try:
+                        results[futures[future]] = future.result()
+                    except Exception as e:
+                        print(f"[proxies] {futures[future]}: {e}")
+            return results
+        for source in sources:
+            try:
+                results[source] = make_proxies(source, folder)
+            except Exception as e:
+                print(f"[proxies] {source}: {e}")
+        return results
+
+    def build_all(self):
+        manifest = manifest_path()
+        if manifest is None:
+            print("Please save your Blender file first!")
+            return {}
+
+        sources = []
+        for path in self.referenced_images():
+            if os.path.isfile(path):
+                sources.append(path)
+            else:
+                print(f"[proxies] Missing texture, no proxies: {path}")
+        results = self.run_jobs(sources, os.path.join(os.path.dirname(manifest), "proxies"))
+
+        generated = sum(entry.pop("generated") for entry in results.values())
+        level = choose_level(results, self.budget_bytes)
+        write_manifest(manifest, results, level, self.budget_bytes)
+
+        full = sum(entry["bytes"] for entry in results.values())
+        print(f"Texture proxies: {len(results)} images, {generated} levels written, "
+              f"{full / 1048576:.0f} MiB at full size, level 1/{level} for a "
+              f"{self.budget_bytes / 1048576:.0f} MiB budget")
+        return {"images": len(results), "generated": generated, "level": level, "full_bytes": full}
+
+
+# Usage
+if __name__ == "__main__":
+    TextureProxyBuilder().build_all()
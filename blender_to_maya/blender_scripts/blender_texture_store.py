@@ -0,0 +1,65 @@
+import os
+import sys
+
+import bpy
+
+SHARED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared")
+if SHARED_DIR not in sys.path:
+    sys.path.append(SHARED_DIR)
+
+from texture_store import STORE_ENV, TextureStore
+
+
+class TextureStoreLinker:
+    """
+    Points the scene's file images at the shared texture store, so the FBX and
+    the material JSON reference one copy per distinct texture across exports.
+    The store comes from the argument or $B2M_TEXTURE_STORE; without one, or
+    for an unsaved file (which could not own a ref), this does nothing.
+    """
+    def __init__(self, store_root=None):
+        self.store_root = store_root or os.environ.get(STORE_ENV)
+
+    def scene_images(self):
+        """
+        ({image: absolute path} of file images to move into the store,
+         object paths of images already pointing into it).
+        """
+        objects_dir = os.path.normcase(os.path.join(os.path.abspath(self.store_root), "objects"))
+        to_store, stored = {}, []
+        for img in bpy.data.images:
+            if img.source != "FILE" or img.packed_file or not img.filepath:
+                continue
+            path = os.path.abspath(bpy.path.abspath(img.filepath))
+            if os.path.normcase(path).startswith(objects_dir):
+                stored.append(path)
+            elif os.path.isfile(path):
+                to_store[img] = path
+        return to_store, stored
+
+    def link_all(self):
+        if not self.store_root:
+            print("No texture store configured, keeping image paths.")
+            return {}
+        blend_path = bpy.data.filepath
+        if not blend_path:
+            # Objects without a ref would be removed by the next prune
+            print("Unsaved file, not using the texture store.")
+            return {}
+        store = TextureStore(self.store_root)
+        images, stored = self.scene_images()
+
+        targets = store.plan(images.values())
+        store.write_ref(TextureStore.ref_key(blend_path), blend_path, list(targets.values()) + stored)
+        counts = store.materialize(targets)
+        for img, path in images.items():
+            img.filepath = targets[path]
+
+        print(f"Texture store: {len(images)} images -> {len(set(targets.values()))} objects "
+              f"({counts['existing']} already stored, {counts['copied']} copied, {counts['unlinked']} unlinked from a source)")
+        return dict(counts, images=len(images))
+
+
+# Usage
+if __name__ == "__main__":
+    TextureStoreLinker().link_all()
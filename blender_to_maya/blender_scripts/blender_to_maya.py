@@ -1,23 +1,484 @@
 import sys
+import os
+import ast
+import json
+import time
+import hashlib
+import tracemalloc
+from array import array
+from collections import namedtuple
 from pathlib import Path
 import importlib
+import importlib.util
+
+import bpy
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHARED_DIR = os.path.join(PACKAGE_DIR, "shared")
+if SHARED_DIR not in sys.path:
+    sys.path.append(SHARED_DIR)
+
+from dev_mode import fresh
+
+# Datablock collections counted before and after every stage
+COUNTED_DATA = (
+    "objects", "meshes", "materials", "node_groups", "images", "textures",
+    "cameras", "lights", "collections", "actions", "worlds",
+)
+
+
+def scene_counts():
+    """Datablock, material, node, link and image counts of the open .blend."""
+    trees = [m.node_tree for m in bpy.data.materials if m.node_tree] + list(bpy.data.node_groups)
+    return {
+        "datablocks": sum(len(getattr(bpy.data, attr)) for attr in COUNTED_DATA),
+        "materials": len(bpy.data.materials),
+        "nodes": sum(len(tree.nodes) for tree in trees),
+        "links": sum(len(tree.links) for tree in trees),
+        "images": len(bpy.data.images),
+    }
+
+
+# ------------------------------------------------
+# Scene fingerprints, one per kind of data a stage can read
+# ------------------------------------------------
+def _feed_rna(feed, struct):
+    """Hash the editable simple properties of a bpy struct (e.g. a modifier)."""
+    for prop in struct.bl_rna.properties:
+        if prop.is_readonly or prop.type == "COLLECTION":
+            continue
+        value = getattr(struct, prop.identifier, None)
+        if prop.type == "POINTER":
+            value = getattr(value, "name", None)
+        elif isinstance(value, set):
+            # Enum flags; set order changes between Python processes
+            value = sorted(value)
+        elif hasattr(value, "__len__") and not isinstance(value, str):
+            value = list(value)
+        feed(prop.identifier, value)
+
+
+def _feed_array(digest, collection, attr, typecode, width):
+    values = array(typecode, [0]) * (len(collection) * width)
+    collection.foreach_get(attr, values)
+    digest.update(values.tobytes())
+
+
+def _action_fcurves(action):
+    if hasattr(action, "fcurves"):
+        return list(action.fcurves)
+    # Layered actions (Blender 5.0+ no longer has Action.fcurves)
+    return [fcurve for layer in action.layers for strip in layer.strips
+            for bag in strip.channelbags for fcurve in bag.fcurves]
+
+
+def fingerprint_objects(digest, feed):
+    """Everything the FBX export writes: objects, meshes, lights, cameras, curves, rigs and animation."""
+    scene = bpy.context.scene
+    feed(scene.frame_start, scene.frame_end, scene.render.fps, scene.render.fps_base)
+    for obj in bpy.data.objects:
+        feed(obj.name, obj.type, getattr(obj.data, "name", None), getattr(obj.parent, "name", None),
+             obj.parent_bone, [list(row) for row in obj.matrix_world], obj.hide_render,
+             [slot.material.name if slot.material else None for slot in obj.material_slots],
+             [group.name for group in obj.vertex_groups])
+        for mod in obj.modifiers:
+            _feed_rna(feed, mod)
+        animation = obj.animation_data
+        feed(getattr(getattr(animation, "action", None), "name", None))
+        if obj.pose:
+            for bone in obj.pose.bones:
+                feed(bone.name, [list(row) for row in bone.matrix_basis])
+    for mesh in bpy.data.meshes:
+        feed(mesh.name, len(mesh.vertices), len(mesh.polygons), [m.name if m else None for m in mesh.materials],
+             mesh.has_custom_normals, getattr(mesh.shape_keys, "name", None))
+        _feed_array(digest, mesh.vertices, "co", "f", 3)
+        _feed_array(digest, mesh.loops, "vertex_index", "i", 1)
+        _feed_array(digest, mesh.polygons, "loop_total", "i", 1)
+        _feed_array(digest, mesh.polygons, "material_index", "i", 1)
+        _feed_array(digest, mesh.polygons, "use_smooth", "b", 1)
+        for uv_layer in mesh.uv_layers:
+            feed(uv_layer.name)
+            _feed_array(digest, uv_layer.data, "uv", "f", 2)
+        if mesh.has_custom_normals:
+            if hasattr(mesh, "corner_normals"):
+                _feed_array(digest, mesh.corner_normals, "vector", "f", 3)
+            else:
+                # Before Blender 4.1 loop normals are only valid after calc_normals_split()
+                mesh.calc_normals_split()
+                _feed_array(digest, mesh.loops, "normal", "f", 3)
+    for key in bpy.data.shape_keys:
+        feed(key.name, getattr(key.user, "name", None), key.use_relative)
+        for block in key.key_blocks:
+            feed(block.name, block.value, block.mute, getattr(block.relative_key, "name", None), block.vertex_group)
+            _feed_array(digest, block.data, "co", "f", 3)
+    for data in list(bpy.data.lights) + list(bpy.data.cameras):
+        _feed_rna(feed, data)
+    for curve in bpy.data.curves:
+        _feed_rna(feed, curve)
+        for spline in curve.splines:
+            feed(spline.type, spline.use_cyclic_u, len(spline.points), len(spline.bezier_points))
+            _feed_array(digest, spline.points, "co", "f", 4)
+            for attr in ("co", "handle_left", "handle_right"):
+                _feed_array(digest, spline.bezier_points, attr, "f", 3)
+    for armature in bpy.data.armatures:
+        feed(armature.name, [(bone.name, getattr(bone.parent, "name", None)) for bone in armature.bones])
+        _feed_array(digest, armature.bones, "head_local", "f", 3)
+        _feed_array(digest, armature.bones, "tail_local", "f", 3)
+        _feed_array(digest, armature.bones, "matrix_local", "f", 16)
+    for action in bpy.data.actions:
+        feed(action.name)
+        for fcurve in _action_fcurves(action):
+            feed(fcurve.data_path, fcurve.array_index, fcurve.mute,
+                 [point.interpolation for point in fcurve.keyframe_points])
+            for attr in ("co", "handle_left", "handle_right"):
+                _feed_array(digest, fcurve.keyframe_points, attr, "f", 2)
+
+
+def fingerprint_materials(digest, feed):
+    from blender_material_exporter import material_fingerprint
+    for mat in bpy.data.materials:
+        feed(mat.name, mat.users, material_fingerprint(mat))
+
+
+def fingerprint_images(digest, feed):
+    for img in bpy.data.images:
+        feed(img.name, img.source, img.filepath, bool(img.packed_file), img.colorspace_settings.name)
+
+
+def fingerprint_names(digest, feed):
+    for attr in COUNTED_DATA:
+        feed(attr, [item.name for item in getattr(bpy.data, attr)])
+
+
+def fingerprint_proxies(digest, feed):
+    from blender_texture_proxies import manifest_path
+    path = manifest_path()
+    if path and os.path.exists(path):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    else:
+        feed(None)
+
+
+SCENE_FINGERPRINTS = {
+    "objects": fingerprint_objects,
+    "materials": fingerprint_materials,
+    "images": fingerprint_images,
+    "names": fingerprint_names,
+    "proxies": fingerprint_proxies,
+}
+
+
+def scene_fingerprint(kind):
+    digest = hashlib.sha1()
+
+    def feed(*parts):
+        digest.update(repr(parts).encode("utf-8"))
+
+    SCENE_FINGERPRINTS[kind](digest, feed)
+    return digest.hexdigest()
+
+
+def module_sources(path):
+    """
+    `path` and the files of every module of this package it imports, directly
+    or through other package modules (imports inside functions included).
+    """
+    seen, pending = set(), [os.path.abspath(path)]
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                try:
+                    spec = importlib.util.find_spec(name)
+                except (ImportError, ValueError):
+                    continue
+                origin = getattr(spec, "origin", None)
+                if origin and origin.endswith(".py") and os.path.abspath(origin).startswith(PACKAGE_DIR + os.sep):
+                    pending.append(os.path.abspath(origin))
+    return sorted(seen)
+
+
+# name:    the stage runs through the method run_<name>
+# reads:   scene data the stage depends on (keys of SCENE_FINGERPRINTS)
+# writes:  scene data the stage may change
+# probe:   class in the module whose has_work() says whether there is anything to do
+# outputs: files the stage writes to to_maya/, as suffixes of the .blend name; a stage
+#          with outputs is skipped when its reads are unchanged since they were written
+Stage = namedtuple("Stage", ["name", "module", "reads", "writes", "probe", "outputs"])
 
 
 class BlenderToMayaPipeline:
-    def __init__(self, scripts_path):
+    # In run order
+    STAGES = [
+        Stage("delete_unused_data", "blender_delete_unused_data",
+              reads=("materials",), writes=("materials",), probe="DeleteFloatingNodes", outputs=()),
+        Stage("legacy_material_cleaner", "blender_legacy_material_cleaner",
+              reads=("materials",), writes=("materials",), probe="LegacyMaterialCleaner", outputs=()),
+        Stage("node_cleaner", "blender_node_cleaner",
+              reads=("materials",), writes=("materials",), probe="MaterialNodeCleaner", outputs=()),
+        Stage("naming_convention", "blender_naming_convention",
+              reads=("names",), writes=("names", "objects", "materials", "images"),
+              probe=None, outputs=()),  # always runs: its rename map must match this export
+        Stage("unpack_textures", "blender_unpack_textures",
+              reads=("images",), writes=("images",), probe="TextureUnpacker", outputs=()),
+        Stage("texture_store", "blender_texture_store",
+              reads=("images",), writes=("images",), probe=None, outputs=()),
+        Stage("texture_proxies", "blender_texture_proxies",
+              reads=("materials", "images"), writes=("proxies",), probe=None, outputs=()),
+        Stage("fbx_export", "blender_fbx_export",
+              reads=("objects", "materials", "images"), writes=(), probe=None, outputs=(".fbx",)),
+        Stage("material_exporter", "blender_material_exporter",
+              reads=("materials", "images", "proxies"), writes=(), probe=None, outputs=(".json",)),
+    ]
+    # Replaces the first three cleaners when fused_cleanup is on (and also fixes colorspaces)
+    FUSED_CLEANUP = Stage("fused_cleanup", "blender_cleanup_engine",
+                          reads=("materials", "images"), writes=("materials", "images"), probe=None, outputs=())
+    FUSED_REPLACES = ("delete_unused_data", "legacy_material_cleaner", "node_cleaner")
+
+    def __init__(self, scripts_path, report=True, trace_memory=True, incremental=False, fused_cleanup=False,
+                 texture_proxies=False, texture_budget_mb=None, texture_store=None):
+        """
+        report:       write to_maya/<blend>.pipeline_report.json after run_all
+        trace_memory: measure peak Python memory per stage with tracemalloc
+                      (slows allocation-heavy stages down noticeably)
+        incremental:  skip stages whose probe finds nothing to do, and reuse FBX/JSON
+                      outputs whose inputs are unchanged since the last run
+                      (state in to_maya/<blend>.stage_fingerprints.json)
+        fused_cleanup: run the material cleaners as one pass of blender_cleanup_engine
+        texture_proxies: write downsampled textures and record them in the material JSON;
+                      off, a proxies manifest left by an earlier run is removed so Maya
+                      imports full resolution
+        texture_budget_mb: scene texture memory the proxy level is chosen for
+                      (None = blender_texture_proxies.DEFAULT_BUDGET_MB)
+        texture_store: shared content-addressed texture store to point images at
+                      (None = $B2M_TEXTURE_STORE, unset = keep image paths)
+        """
         self.scripts_path = Path(scripts_path)
         if str(self.scripts_path) not in sys.path:
             sys.path.append(str(self.scripts_path))
+        self.report = report
+        self.trace_memory = trace_memory
+        self.incremental = incremental
+        self.fused_cleanup = fused_cleanup
+        self.texture_proxies = texture_proxies
+        self.texture_budget_mb = texture_budget_mb
+        self.texture_store = texture_store
+        self.failures = []
+        self.errors = {}
+        self.stage_reports = []
+        # Scene fingerprints of this run; dropped when a stage writes that kind of data
+        self.fingerprints = {}
+        # Extra per-stage results for the report (e.g. per-rule cleanup stats)
+        self.stage_details = {}
+        # Probe objects of this run's stages; they may hold bpy data of the open file
+        self.probes = {}
 
-    def run_all(self):
-        self.run_delete_unused_data()
-        self.run_legacy_material_cleaner()
-        self.run_node_cleaner()
-        self.run_naming_convention()
-        self.run_unpack_textures()
-        self.run_fbx_export()
-        self.run_material_exporter()
-        print("\nAll modules processed successfully!")
+    def run_all(self, stages=None):
+        """
+        Run every stage, or only the named ones (in pipeline order).
+        Returns the names of the modules that failed.
+        """
+        self.failures = []
+        self.errors = {}
+        self.stage_reports = []
+        self.fingerprints = {}
+        self.stage_details = {}
+        self.probes = {}
+        started = time.strftime("%Y-%m-%d %H:%M:%S")
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        stored = self.load_stage_fingerprints()
+        if not self.texture_proxies:
+            self.remove_proxy_manifest()
+
+        for stage in self.stages():
+            if stages is None or stage.name in stages:
+                self.run_stage(stage, stored)
+
+        self.save_stage_fingerprints(stored)
+        self.probes = {}
+
+        totals = {
+            "wall_seconds": round(time.perf_counter() - wall_start, 4),
+            "cpu_seconds": round(time.process_time() - cpu_start, 4),
+        }
+        if self.report:
+            self.write_report(started, totals)
+        if self.failures:
+            print(f"\nFinished with errors in: {', '.join(self.failures)}")
+        else:
+            print("\nAll modules processed successfully!")
+        return self.failures
+
+    # ------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------
+    def stages(self):
+        stages = [stage for stage in self.STAGES if self.texture_proxies or stage.name != "texture_proxies"]
+        if not self.fused_cleanup:
+            return stages
+        rest = [stage for stage in stages if stage.name not in self.FUSED_REPLACES]
+        return [self.FUSED_CLEANUP] + rest
+
+    def remove_proxy_manifest(self):
+        """Drop the proxies manifest of an earlier run, so the material export doesn't pick it up."""
+        base = self.output_base()
+        if base and os.path.exists(base + ".proxies.json"):
+            os.remove(base + ".proxies.json")
+            print("Texture proxies are off, removed the proxies manifest of an earlier run")
+
+    def output_base(self):
+        blend_path = bpy.data.filepath
+        if not blend_path:
+            return None
+        blend_name = os.path.splitext(os.path.basename(blend_path))[0]
+        return os.path.join(os.path.dirname(blend_path), "to_maya", blend_name)
+
+    def load_stage_fingerprints(self):
+        base = self.output_base()
+        if not self.incremental or base is None:
+            return {}
+        try:
+            with open(base + ".stage_fingerprints.json", "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_stage_fingerprints(self, stored):
+        base = self.output_base()
+        if not self.incremental or base is None or not stored:
+            return
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+        with open(base + ".stage_fingerprints.json", "w", encoding="utf-8") as f:
+            json.dump(stored, f, indent=4)
+
+    def input_fingerprint(self, stage, module):
+        """Hash of everything a stage with outputs depends on, including its code and the code it imports."""
+        digest = hashlib.sha1(bpy.app.version_string.encode("utf-8"))
+        for path in module_sources(module.__file__):
+            digest.update(os.path.relpath(path, PACKAGE_DIR).encode("utf-8"))
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        for kind in stage.reads:
+            if kind not in self.fingerprints:
+                self.fingerprints[kind] = scene_fingerprint(kind)
+            digest.update(f"{kind}:{self.fingerprints[kind]}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def check_stage(self, stage, stored):
+        """
+        Returns (reason to skip or None, input fingerprint or None).
+        The fingerprint is stored once a stage with outputs has run.
+        """
+        if not self.incremental:
+            return None, None
+        module = importlib.import_module(stage.module)
+        if stage.probe:
+            probe = self.probes[stage.name] = getattr(module, stage.probe)()
+            if not probe.has_work():
+                return "nothing to do", None
+        base = self.output_base()
+        if not stage.outputs or base is None:
+            return None, None
+        fingerprint = self.input_fingerprint(stage, module)
+        if stored.get(stage.name) == fingerprint and all(os.path.exists(base + s) for s in stage.outputs):
+            return "inputs unchanged, reusing " + ", ".join(os.path.basename(base + s) for s in stage.outputs), None
+        return None, fingerprint
+
+    def run_stage(self, stage, stored):
+        """Run one stage (unless it can be skipped) and record its timings, peak memory and scene counts."""
+        name, module_name = stage.name, stage.module
+        try:
+            reason, fingerprint = self.check_stage(stage, stored)
+        except Exception as e:
+            print(f"[{name}] could not check for work, running it: {e}")
+            reason, fingerprint = None, None
+        if reason:
+            print(f"[{name}] skipped: {reason}")
+            self.stage_reports.append({
+                "stage": name, "module": module_name, "status": "skipped", "reason": reason,
+                "reads": list(stage.reads), "writes": list(stage.writes),
+            })
+            return
+
+        before = scene_counts()
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        elif self.trace_memory:
+            tracemalloc.reset_peak()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+
+        getattr(self, f"run_{name}")()
+
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        peak = tracemalloc.get_traced_memory()[1] if self.trace_memory else None
+        if tracing:
+            tracemalloc.stop()
+        after = scene_counts()
+
+        failed = module_name in self.failures
+        for kind in stage.writes:
+            self.fingerprints.pop(kind, None)
+        if fingerprint and not failed:
+            stored[name] = fingerprint
+        else:
+            stored.pop(name, None)
+
+        self.stage_reports.append({
+            "stage": name,
+            "module": module_name,
+            "status": "failed" if failed else "ok",
+            "reads": list(stage.reads),
+            "writes": list(stage.writes),
+            "error": self.errors.get(module_name),
+            "wall_seconds": round(wall, 4),
+            "cpu_seconds": round(cpu, 4),
+            "peak_memory_bytes": peak,
+            "details": self.stage_details.get(name),
+            "before": before,
+            "after": after,
+        })
+        print(f"[{name}] {wall:.2f}s wall, {cpu:.2f}s cpu"
+              + (f", peak {peak / 1048576:.1f} MiB" if peak is not None else ""))
+
+    def write_report(self, started, totals):
+        blend_path = bpy.data.filepath
+        if not blend_path:
+            print("Unsaved .blend, no pipeline report written")
+            return None
+        blend_name = os.path.splitext(os.path.basename(blend_path))[0]
+        report_path = os.path.join(os.path.dirname(blend_path), "to_maya", f"{blend_name}.pipeline_report.json")
+        os.makedirs(os.path.dirname(report_path), exist_ok=True)
+        report = {
+            "blend": blend_path,
+            "blender_version": bpy.app.version_string,
+            "started": started,
+            "total": totals,
+            "failures": self.failures,
+            "stages": self.stage_reports,
+        }
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+        print(f"Pipeline report saved to: {report_path}")
+        return report_path
+
+    def _fail(self, module_name, error):
+        print(f"Error in {module_name}: {error}")
+        self.failures.append(module_name)
+        self.errors[module_name] = str(error)
 
     # ------------------------------------------------
     # Individual steps
@@ -26,78 +487,127 @@ class BlenderToMayaPipeline:
     def run_delete_unused_data(self):
         try:
             import blender_delete_unused_data
-            importlib.reload(blender_delete_unused_data)
+            fresh(blender_delete_unused_data)
             print("Running DeleteFloatingNodes.clean_all()")
-            blender_delete_unused_data.DeleteFloatingNodes.clean_all()
+            probe = self.probes.pop("delete_unused_data", None)
+            self.stage_details["delete_unused_data"] = blender_delete_unused_data.DeleteFloatingNodes.clean_all(probe)
+        except Exception as e:
+            self._fail("blender_delete_unused_data", e)
+
+    def run_fused_cleanup(self):
+        try:
+            import blender_cleanup_engine
+            fresh(blender_cleanup_engine)
+            print("Running CleanupEngine.clean_all()")
+            self.stage_details["fused_cleanup"] = blender_cleanup_engine.CleanupEngine().clean_all()
         except Exception as e:
-            print(f"Error in blender_delete_unused_data: {e}")
+            self._fail("blender_cleanup_engine", e)
 
     def run_legacy_material_cleaner(self):
         try:
             import blender_legacy_material_cleaner
-            importlib.reload(blender_legacy_material_cleaner)
+            fresh(blender_legacy_material_cleaner)
             print("Running LegacyMaterialCleaner.clean_scene_materials()")
             cleaner = blender_legacy_material_cleaner.LegacyMaterialCleaner()
             cleaner.clean_scene_materials()
         except Exception as e:
-            print(f"Error in blender_legacy_material_cleaner: {e}")
+            self._fail("blender_legacy_material_cleaner", e)
 
     def run_node_cleaner(self):
         try:
             import blender_node_cleaner
-            importlib.reload(blender_node_cleaner)
+            fresh(blender_node_cleaner)
             print("Running MaterialNodeCleaner.clean_materials()")
             node_cleaner = blender_node_cleaner.MaterialNodeCleaner()
             node_cleaner.clean_materials()
         except Exception as e:
-            print(f"Error in blender_node_cleaner: {e}")
+            self._fail("blender_node_cleaner", e)
 
     def run_naming_convention(self):
         try:
             import blender_naming_convention
-            importlib.reload(blender_naming_convention)
+            fresh(blender_naming_convention)
             print("Running MayaNamingConvention.rename_all()")
             fix_naming = blender_naming_convention.MayaNamingConvention()
-            fix_naming.rename_all()
+            self.stage_details["naming_convention"] = fix_naming.rename_all()
         except Exception as e:
-            print(f"Error in blender_naming_convention: {e}")
+            self._fail("blender_naming_convention", e)
 
     def run_unpack_textures(self):
         try:
             import blender_unpack_textures
-            importlib.reload(blender_unpack_textures)
+            fresh(blender_unpack_textures)
             print("Running TextureUnpacker.unpack_all()")
             unpacker = blender_unpack_textures.TextureUnpacker()
-            unpacker.unpack_all()
+            self.stage_details["unpack_textures"] = unpacker.unpack_all()
+        except Exception as e:
+            self._fail("blender_unpack_textures", e)
+
+    def run_texture_store(self):
+        try:
+            import blender_texture_store
+            fresh(blender_texture_store)
+            print("Running TextureStoreLinker.link_all()")
+            linker = blender_texture_store.TextureStoreLinker(self.texture_store)
+            self.stage_details["texture_store"] = linker.link_all()
+        except Exception as e:
+            self._fail("blender_texture_store", e)
+
+    def run_texture_proxies(self):
+        try:
+            import blender_texture_proxies
+            fresh(blender_texture_proxies)
+            print("Running TextureProxyBuilder.build_all()")
+            builder = blender_texture_proxies.TextureProxyBuilder(self.texture_budget_mb)
+            self.stage_details["texture_proxies"] = builder.build_all()
         except Exception as e:
-            print(f"Error in blender_unpack_textures: {e}")
+            self._fail("blender_texture_proxies", e)
 
     def run_fbx_export(self):
         try:
             import blender_fbx_export
-            importlib.reload(blender_fbx_export)
+            fresh(blender_fbx_export)
             print("Running FBXExporter.export_all()")
             exporter = blender_fbx_export.FBXExporter()
             exporter.export_all()
         except Exception as e:
-            print(f"Error in blender_fbx_export: {e}")
+            self._fail("blender_fbx_export", e)
 
     def run_material_exporter(self):
         try:
             import blender_material_exporter
-            importlib.reload(blender_material_exporter)
+            fresh(blender_material_exporter)
             print("Running MaterialCollector.run()")
             collector = blender_material_exporter.MaterialCollector()
             collector.run()
         except Exception as e:
-            print(f"Error in blender_material_exporter: {e}")
+            self._fail("blender_material_exporter", e)
 
 
 # -------------------------------
 # Usage
 # -------------------------------
 if __name__ == "__main__":
+    # blender --background scene.blend --python blender_to_maya.py [-- --strict] [--incremental]
+    # --strict makes Blender exit non-zero when a step failed (used by blender_batch_export)
+    # --incremental skips stages with nothing to do and reuses outputs whose inputs are unchanged
+    # --fused-cleanup runs the material cleaners as one pass (blender_cleanup_engine)
+    # --texture-proxies writes downsampled textures for Maya (off: Maya gets full resolution)
+    # --texture-budget MB sets the scene texture memory the proxy level is chosen for (implies --texture-proxies)
+    # --texture-store DIR points the images at a shared content-addressed store
+    script_args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    budget = store = None
+    if "--texture-budget" in script_args:
+        budget = float(script_args[script_args.index("--texture-budget") + 1])
+    if "--texture-store" in script_args:
+        store = script_args[script_args.index("--texture-store") + 1]
     pipeline = BlenderToMayaPipeline(
-        r"C:\Users\Mpho\Documents\blender_to_maya\blender_to_maya\blender_scripts"
+        Path(__file__).resolve().parent,
+        incremental="--incremental" in script_args,
+        fused_cleanup="--fused-cleanup" in script_args,
+        texture_proxies="--texture-proxies" in script_args or budget is not None,
+        texture_budget_mb=budget,
+        texture_store=store,
     )
-    pipeline.run_all()
+    if pipeline.run_all() and "--strict" in script_args:
+        sys.exit(1)
@@ -1,15 +1,104 @@
 import bpy
 import os
+import hashlib
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Extension for packed images that never had a file path
+FORMAT_EXTENSIONS = {
+    "PNG": ".png", "JPEG": ".jpg", "TARGA": ".tga", "TARGA_RAW": ".tga", "BMP": ".bmp",
+    "TIFF": ".tif", "OPEN_EXR": ".exr", "OPEN_EXR_MULTILAYER": ".exr", "HDR": ".hdr", "WEBP": ".webp",
+}
+
+
+def file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
 class TextureUnpacker:
-    def __init__(self):
+    """
+    Unpacks packed images into the 'textures' folder next to the .blend.
+
+    Packed bytes are read in Blender's thread, then hashed and written by a
+    thread pool. Identical payloads are written once, files already on disk
+    with the same content are left alone, and the images are repointed at the
+    end in one pass. Only payloads that can have a twin (same size as another
+    packed image or as the file on disk) are hashed.
+    """
+    def __init__(self, workers=None, max_pending_mb=1024):
         # Determine the directory of the current .blend file
         self.blend_dir = os.path.dirname(bpy.data.filepath)
         if not self.blend_dir:
             # If the blend file isn't saved yet, default to home directory
             self.blend_dir = os.path.expanduser("~")
             print("Blend file not saved. Using home directory instead.")
+        self.texture_dir = os.path.join(self.blend_dir, "textures")
+        self.workers = workers or min(8, os.cpu_count() or 2)
+        # Packed bytes held in memory while waiting for a writer
+        self.max_pending = max_pending_mb << 20
+        self._lock = threading.Lock()
+        self._by_hash = {}   # sha256 -> file path
+        self._owners = {}    # file path -> sha256 (None for unhashed payloads)
+
+    @staticmethod
+    def has_work():
+        """True if any image is still packed into the .blend."""
+        return any(img.packed_file for img in bpy.data.images)
 
+    @staticmethod
+    def file_name(img):
+        """Same name WRITE_LOCAL would use: the image's file name, else its datablock name."""
+        name = bpy.path.basename(img.filepath) or img.name
+        if not os.path.splitext(name)[1]:
+            name += FORMAT_EXTENSIONS.get(img.file_format, ".png")
+        return name
+
+    # ------------------------------------------------
+    # Worker side (no bpy access)
+    # ------------------------------------------------
+    def store(self, data, name, shared_size=True):
+        """
+        Write one payload unless it is a duplicate or already on disk. Returns (path, status).
+        shared_size=False means no other packed image has this size, so it cannot be a duplicate.
+        """
+        digest = hashlib.sha256(data).hexdigest() if shared_size else None
+        with self._lock:
+            if digest in self._by_hash:
+                return self._by_hash[digest], "duplicate"
+            path = os.path.join(self.texture_dir, name)
+            if path in self._owners:
+                # Another image with different content already claimed this name
+                stem, ext = os.path.splitext(name)
+                suffix = digest[:8] if digest else str(len(self._owners))
+                path = os.path.join(self.texture_dir, f"{stem}_{suffix}{ext}")
+            if digest:
+                self._by_hash[digest] = path
+            self._owners[path] = digest
+
+        if os.path.isfile(path) and os.path.getsize(path) == len(data):
+            if (digest or hashlib.sha256(data).hexdigest()) == file_digest(path):
+                return path, "existing"
+        # Unique per process and thread: another Blender (batch export) may be
+        # unpacking into the same textures folder
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path, "written"
+
+    # ------------------------------------------------
+    # Main
+    # ------------------------------------------------
     def unpack_all(self):
         """Unpack only packed images into Blender's default 'textures' folder with progress bar."""
         images = [img for img in bpy.data.images if img.packed_file]  # only packed images
@@ -17,18 +106,61 @@ class TextureUnpacker:
 
         if total == 0:
             print("No packed images found. All images are already unpacked.")
-            return
+            return {}
 
+        os.makedirs(self.texture_dir, exist_ok=True)
         wm = bpy.context.window_manager
         wm.progress_begin(0, total)
 
-        for i, img in enumerate(images):
+        results = {}
+        fallback = []
+        pending = {}
+        pending_bytes = 0
+
+        def collect(futures):
+            nonlocal pending_bytes
+            for future in futures:
+                img, size = pending.pop(future)
+                pending_bytes -= size
+                try:
+                    results[img] = future.result()
+                except OSError as e:
+                    print(f"Could not write {img.name} ({e}), unpacking it the slow way")
+                    fallback.append(img)
+                wm.progress_update(len(results) + len(fallback))
+
+        sizes = Counter(img.packed_file.size for img in images)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for img in images:
+                if len(img.packed_files) > 1:
+                    # UDIM tiles: one image, several files, leave those to Blender
+                    fallback.append(img)
+                    continue
+                data = img.packed_file.data
+                while pending and pending_bytes + len(data) > self.max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                shared = sizes[img.packed_file.size] > 1
+                pending[pool.submit(self.store, data, self.file_name(img), shared)] = (img, len(data))
+                pending_bytes += len(data)
+            collect(list(pending))
+
+        # Repoint every image, then drop the packed data without writing again
+        counts = {"written": 0, "existing": 0, "duplicate": 0, "fallback": len(fallback)}
+        for img, (path, status) in results.items():
+            img.filepath = bpy.path.relpath(path)
+            img.unpack(method='USE_ORIGINAL')
+            counts[status] += 1
+            print(f"Unpacked: {img.name} ({status})")
+        for img in fallback:
             img.unpack(method='WRITE_LOCAL')
             print(f"Unpacked: {img.name}")
-            wm.progress_update(i + 1)
 
         wm.progress_end()
-        print(f"Total unpacked images: {total}")
+        print(f"Total unpacked images: {total} "
+              f"({counts['written']} written, {counts['existing']} already on disk, "
+              f"{counts['duplicate']} duplicates, {counts['fallback']} by Blender)")
+        return counts
 
 
 # Usage:
@@ -0,0 +1,191 @@
+# blender_watch.py
+# Watch folders for saved .blend files and keep their to_maya/ exports fresh.
+#
+#   python blender_watch.py //server/assets --recursive --workers 4
+#
+# Polls the folders (no extra dependency, works on network shares), waits until
+# a file has stopped changing for --debounce seconds, skips it if its content
+# hash matches the last export, and otherwise exports it through
+# blender_batch_export.BatchExporter. What was exported is kept in a state file
+# so a restart only picks up files that changed while the daemon was down.
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from blender_batch_export import BatchExporter, collect_blend_files, find_blender
+
+STATE_VERSION = 1
+
+
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class WatchDaemon:
+    """
+    folders:  directories to watch
+    exporter: BatchExporter used for each file (its timeout/retries apply)
+    debounce: seconds a file's size and mtime must stay unchanged before export
+    interval: seconds between folder scans
+    """
+    def __init__(self, folders, exporter, state_path, debounce=10.0, interval=2.0, recursive=False):
+        self.folders = folders
+        self.exporter = exporter
+        self.state_path = state_path
+        self.debounce = debounce
+        self.interval = interval
+        self.recursive = recursive
+        self.state = self.load_state()
+        self.settling = {}   # path -> ((mtime, size), time first seen with that signature)
+        self.running = {}    # path -> (future, signature, sha256)
+
+    # ------------------------------------------------
+    # Persistent state
+    # ------------------------------------------------
+    def load_state(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != STATE_VERSION:
+            return {}
+        return data["files"]
+
+    def save_state(self):
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": STATE_VERSION, "files": self.state}, f, indent=4)
+        os.replace(tmp_path, self.state_path)
+
+    # ------------------------------------------------
+    # Scanning
+    # ------------------------------------------------
+    @staticmethod
+    def signature(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return [stat.st_mtime, stat.st_size]
+
+    def settled_files(self, now, force=False):
+        """Files whose signature differs from the last export and has not changed for `debounce`."""
+        ready = []
+        seen = set()
+        for path in collect_blend_files(self.folders, self.recursive):
+            seen.add(path)
+            sig = self.signature(path)
+            if sig is None or path in self.running:
+                continue
+            known = self.state.get(path)
+            if known and known["signature"] == sig:
+                self.settling.pop(path, None)
+                continue
+            previous = self.settling.get(path)
+            if previous is None or previous[0] != sig:
+                # New save (or another save during the debounce window): restart the wait
+                self.settling[path] = (sig, now)
+                if not force:
+                    continue
+            if force or now - self.settling[path][1] >= self.debounce:
+                del self.settling[path]
+                ready.append((path, sig))
+        for path in set(self.settling) - seen:
+            del self.settling[path]
+        return ready
+
+    def submit(self, pool, path, sig):
+        digest = file_hash(path)
+        known = self.state.get(path)
+        if known and known["sha256"] == digest:
+            # Touched or re-saved without changes
+            known["signature"] = sig
+            self.save_state()
+            print(f"Unchanged content, skipping: {path}")
+            return
+        print(f"Exporting: {path}")
+        self.running[path] = (pool.submit(self.exporter.export_one, path), sig, digest)
+
+    def collect_finished(self):
+        for path, (future, sig, digest) in list(self.running.items()):
+            if not future.done():
+                continue
+            del self.running[path]
+            try:
+                entry = future.result()
+            except Exception as e:
+                entry = {"status": "failed", "seconds": 0, "error": str(e)}
+            # Failed exports are remembered too, they are retried on the next change
+            self.state[path] = {
+                "signature": sig,
+                "sha256": digest,
+                "status": entry["status"],
+                "exported_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "seconds": entry["seconds"],
+            }
+            self.save_state()
+            print(f"{entry['status']:7s} {entry['seconds']:8.1f}s  {path}")
+
+    # ------------------------------------------------
+    # Loops
+    # ------------------------------------------------
+    def run_once(self):
+        """Export everything that changed since the last run without debouncing, then return."""
+        with ThreadPoolExecutor(max_workers=self.exporter.workers) as pool:
+            for path, sig in self.settled_files(time.time(), force=True):
+                self.submit(pool, path, sig)
+        self.collect_finished()
+
+    def run(self):
+        print(f"Watching {', '.join(self.folders)} (debounce {self.debounce}s, {self.exporter.workers} worker(s))")
+        with ThreadPoolExecutor(max_workers=self.exporter.workers) as pool:
+            try:
+                while True:
+                    self.collect_finished()
+                    for path, sig in self.settled_files(time.time()):
+                        self.submit(pool, path, sig)
+                    time.sleep(self.interval)
+            except KeyboardInterrupt:
+                print("Stopping, waiting for running exports...")
+        self.collect_finished()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export .blend files for Maya whenever they are saved.")
+    parser.add_argument("folders", nargs="+", help="folders to watch")
+    parser.add_argument("-r", "--recursive", action="store_true", help="watch sub-folders too")
+    parser.add_argument("-j", "--workers", type=int, default=2, help="concurrent Blender processes")
+    parser.add_argument("--debounce", type=float, default=10.0, help="seconds a file must stay unchanged")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between scans")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds per export before Blender is killed")
+    parser.add_argument("--retries", type=int, default=0, help="extra attempts for a failed export")
+    parser.add_argument("--blender", default=None, help="path to the Blender executable")
+    parser.add_argument("--state", default=None, help="state file (default: .blender_to_maya_watch.json in the first folder)")
+    parser.add_argument("--once", action="store_true", help="export what changed since the last run and exit")
+    args = parser.parse_args(argv)
+
+    blender_exe = find_blender(args.blender)
+    if not blender_exe:
+        parser.error("No Blender executable found, pass --blender or set BLENDER_EXE")
+    state_path = args.state or os.path.join(args.folders[0], ".blender_to_maya_watch.json")
+
+    exporter = BatchExporter(blender_exe, workers=args.workers, timeout=args.timeout, retries=args.retries)
+    daemon = WatchDaemon(args.folders, exporter, state_path, args.debounce, args.interval, args.recursive)
+    if args.once:
+        daemon.run_once()
+    else:
+        daemon.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+# blender_worker.py
+# Long-lived worker for shared/blender_pool.py. Started by the pool as
+#
+#   blender --background --python blender_worker.py -- --address 127.0.0.1:PORT --token N
+#
+# with the connection key in $B2M_WORKER_AUTHKEY. It connects back to the pool,
+# then takes jobs until told to quit, so Blender and the pipeline modules are
+# loaded once per worker instead of once per export.
+#
+# --stub runs without Blender (plain Python) and fakes the export, for testing
+# the pool: a .blend whose name contains "crash" kills the worker, "slow" sleeps.
+import os
+import sys
+import time
+import traceback
+from multiprocessing.connection import Client
+
+AUTHKEY_ENV = "B2M_WORKER_AUTHKEY"
+
+
+def parse_args(argv):
+    args = argv[argv.index("--") + 1:] if "--" in argv else []
+    options = {"stub": "--stub" in args}
+    for key in ("--address", "--token"):
+        if key in args:
+            options[key[2:]] = args[args.index(key) + 1]
+    host, port = options["address"].rsplit(":", 1)
+    options["address"] = (host, int(port))
+    options["token"] = int(options["token"])
+    return options
+
+
+# ------------------------------------------------
+# Job handlers
+# ------------------------------------------------
+class PipelineHandler:
+    """Open the .blend and run the requested pipeline stages on it."""
+    def __init__(self):
+        import bpy
+        from blender_to_maya import BlenderToMayaPipeline
+        self.bpy = bpy
+        self.pipeline = BlenderToMayaPipeline(os.path.dirname(os.path.abspath(__file__)))
+
+    def __call__(self, job):
+        self.bpy.ops.wm.open_mainfile(filepath=job["blend"], load_ui=False)
+        self.pipeline.incremental = job.get("incremental", False)
+        self.pipeline.fused_cleanup = job.get("fused_cleanup", False)
+        self.pipeline.texture_proxies = job.get("texture_proxies", False)
+        self.pipeline.texture_budget_mb = job.get("texture_budget_mb")
+        self.pipeline.texture_store = job.get("texture_store")
+        return self.pipeline.run_all(job.get("stages"))
+
+
+class StubHandler:
+    """Stand-in for PipelineHandler that never touches Blender."""
+    def __call__(self, job):
+        name = os.path.basename(job["blend"])
+        if "crash" in name:
+            os._exit(3)
+        if "slow" in name:
+            time.sleep(job.get("seconds", 5))
+        return ["stub_stage"] if "fail" in name else []
+
+
+def serve(conn, handler):
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job.get("quit"):
+            return
+        start = time.perf_counter()
+        reply = {"blend": job.get("blend"), "pid": os.getpid()}
+        try:
+            failures = handler(job)
+            reply.update(ok=not failures, failures=failures)
+        except Exception:
+            reply.update(ok=False, failures=[], error=traceback.format_exc())
+        reply["seconds"] = round(time.perf_counter() - start, 3)
+        # Blender output arrives in the pool's log, flush it per job
+        sys.stdout.flush()
+        conn.send(reply)
+
+
+def main(argv=None):
+    options = parse_args(sys.argv if argv is None else argv)
+    if not options["stub"]:
+        scripts_dir = os.path.dirname(os.path.abspath(__file__))
+        if scripts_dir not in sys.path:
+            sys.path.append(scripts_dir)
+    handler = StubHandler() if options["stub"] else PipelineHandler()
+
+    authkey = bytes.fromhex(os.environ[AUTHKEY_ENV])
+    with Client(options["address"], authkey=authkey) as conn:
+        conn.send({"token": options["token"], "pid": os.getpid()})
+        serve(conn, handler)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,395 @@
+import os
+import sys
+import time
+
 import bpy
+import numpy as np
+
+SHARED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "shared")
+if SHARED_DIR not in sys.path:
+    sys.path.append(SHARED_DIR)
+
+from mesh_split import grid_mesh, plan_split
+
+# Attribute data type -> (foreach property, values per element, dtype)
+ATTRIBUTE_FIELDS = {
+    "FLOAT": ("value", 1, np.float32),
+    "INT": ("value", 1, np.int32),
+    "INT8": ("value", 1, np.int32),
+    "BOOLEAN": ("value", 1, bool),
+    "FLOAT2": ("vector", 2, np.float32),
+    "INT32_2D": ("value", 2, np.int32),
+    "FLOAT_VECTOR": ("vector", 3, np.float32),
+    "FLOAT_COLOR": ("color", 4, np.float32),
+    "BYTE_COLOR": ("color", 4, np.float32),
+    "QUATERNION": ("value", 4, np.float32),
+}
+# Written from the split itself; names starting with "." are internal topology/selection
+SKIPPED_ATTRIBUTES = {"position", "material_index"}
+# Element flags that are not generic attributes in every Blender version
+LEGACY_PROPERTIES = (
+    ("edges", "MeshEdge", "use_seam", bool),
+    ("edges", "MeshEdge", "use_edge_sharp", bool),
+    ("edges", "MeshEdge", "crease", np.float32),
+    ("edges", "MeshEdge", "bevel_weight", np.float32),
+    ("polygons", "MeshPolygon", "use_smooth", bool),
+)
+
+
+def read_array(collection, prop, dtype, width=1):
+    values = np.empty(len(collection) * width, dtype=dtype)
+    collection.foreach_get(prop, values)
+    return values.reshape(-1, width) if width > 1 else values
+
+
+class SourceMesh:
+    """A mesh's arrays, read once with foreach_get and sliced for every piece."""
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self._arrays = {}
+
+    def array(self, key, collection, prop, dtype, width=1):
+        if key not in self._arrays:
+            self._arrays[key] = read_array(collection, prop, dtype, width)
+        return self._arrays[key]
+
+    def topology(self):
+        mesh = self.mesh
+        return {
+            "material_index": read_array(mesh.polygons, "material_index", np.int32),
+            "loop_start": read_array(mesh.polygons, "loop_start", np.int32),
+            "loop_total": read_array(mesh.polygons, "loop_total", np.int32),
+            "loop_vert": read_array(mesh.loops, "vertex_index", np.int32),
+            "loop_edge": read_array(mesh.loops, "edge_index", np.int32),
+            "edge_verts": read_array(mesh.edges, "vertices", np.int32, 2),
+            "vert_count": len(mesh.vertices),
+        }
+
+    def corner_normals(self):
+        if "corner_normals" not in self._arrays:
+            mesh = self.mesh
+            if hasattr(mesh, "corner_normals"):
+                self._arrays["corner_normals"] = read_array(mesh.corner_normals, "vector", np.float32, 3)
+            else:
+                # Before Blender 4.1
+                mesh.calc_normals_split()
+                self._arrays["corner_normals"] = read_array(mesh.loops, "normal", np.float32, 3)
+        return self._arrays["corner_normals"]
+
+
+# -----------------------------
+# Building meshes from arrays
+# -----------------------------
+def build_geometry(name, co, loop_start, loop_total, loop_vert, loop_edge, edge_verts):
+    """A new mesh with exactly this topology (element order kept)."""
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(co))
+    mesh.edges.add(len(edge_verts))
+    mesh.loops.add(len(loop_vert))
+    mesh.polygons.add(len(loop_start))
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(co, dtype=np.float32).ravel())
+    mesh.edges.foreach_set("vertices", np.ascontiguousarray(edge_verts, dtype=np.int32).ravel())
+    mesh.loops.foreach_set("vertex_index", np.ascontiguousarray(loop_vert, dtype=np.int32))
+    mesh.loops.foreach_set("edge_index", np.ascontiguousarray(loop_edge, dtype=np.int32))
+    mesh.polygons.foreach_set("loop_start", np.ascontiguousarray(loop_start, dtype=np.int32))
+    if bpy.app.version < (4, 0, 0):
+        # Derived from loop_start from 4.0 on
+        mesh.polygons.foreach_set("loop_total", np.ascontiguousarray(loop_total, dtype=np.int32))
+    return mesh
+
+
+def copy_layers(source, new_mesh, piece):
+    """UV maps, generic attributes and legacy element flags of one piece."""
+    mesh = source.mesh
+    uv_names = set()
+    for uv in mesh.uv_layers:
+        uv_names.add(uv.name)
+        values = source.array(("uv", uv.name), uv.data, "uv", np.float32, 2)[piece.loops]
+        new_uv = new_mesh.uv_layers.new(name=uv.name, do_init=False)
+        new_uv.data.foreach_set("uv", values.ravel())
+        new_uv.active_render = uv.active_render
+    if len(mesh.uv_layers):
+        new_mesh.uv_layers.active_index = mesh.uv_layers.active_index
+
+    for attr in mesh.attributes:
+        if attr.name.startswith(".") or attr.name in SKIPPED_ATTRIBUTES or attr.name in uv_names:
+            continue
+        field = ATTRIBUTE_FIELDS.get(attr.data_type)
+        if field is None:
+            print(f"[{mesh.name}] Attribute {attr.name} ({attr.data_type}) is not copied")
+            continue
+        prop, width, dtype = field
+        values = source.array(("attribute", attr.name), attr.data, prop, dtype, width)
+        values = values[piece.domain_indices(attr.domain)]
+        new_attr = new_mesh.attributes.get(attr.name) or new_mesh.attributes.new(attr.name, attr.data_type, attr.domain)
+        new_attr.data.foreach_set(prop, np.ascontiguousarray(values).ravel())
+    for prop in ("active_color_name", "default_color_name"):
+        if getattr(mesh.attributes, prop, None):
+            setattr(new_mesh.attributes, prop, getattr(mesh.attributes, prop))
+
+    for collection_name, type_name, prop, dtype in LEGACY_PROPERTIES:
+        if prop not in getattr(bpy.types, type_name).bl_rna.properties:
+            continue
+        values = source.array(("legacy", prop), getattr(mesh, collection_name), prop, dtype)
+        if values.any():
+            indices = piece.faces if collection_name == "polygons" else piece.edges
+            getattr(new_mesh, collection_name).foreach_set(prop, np.ascontiguousarray(values[indices]))
+
+
+def build_piece(source, piece):
+    mesh = source.mesh
+    co = source.array("co", mesh.vertices, "co", np.float32, 3)[piece.verts]
+    new_mesh = build_geometry(mesh.name, co, piece.loop_start, piece.loop_total,
+                              piece.loop_vert, piece.loop_edge, piece.edge_verts)
+    copy_layers(source, new_mesh, piece)
+    for key in mesh.keys():
+        new_mesh[key] = mesh[key]
+    new_mesh.update()
+
+    auto_smooth = getattr(mesh, "use_auto_smooth", True)
+    if hasattr(mesh, "use_auto_smooth"):
+        new_mesh.use_auto_smooth = mesh.use_auto_smooth
+        new_mesh.auto_smooth_angle = mesh.auto_smooth_angle
+    if mesh.has_custom_normals and auto_smooth:
+        new_mesh.normals_split_custom_set(source.corner_normals()[piece.loops])
+    return new_mesh
+
+
+# -----------------------------
+# Per-object data: materials, shape keys, vertex groups
+# -----------------------------
+def assign_material(target, new_mesh, slot):
+    """Give a piece the one slot (link type and material) of its material index."""
+    link, data_material, object_material = slot
+    new_mesh.materials.append(data_material)
+    target.data = new_mesh
+    target.material_slots[0].link = link
+    if link == 'OBJECT':
+        target.material_slots[0].material = object_material
+
+
+def copy_shape_keys(source, target, piece):
+    key = source.mesh.shape_keys
+    if key is None:
+        return
+    for block in key.key_blocks:
+        co = source.array(("shape", block.name), block.data, "co", np.float32, 3)[piece.verts]
+        new_block = target.shape_key_add(name=block.name, from_mix=False)
+        new_block.data.foreach_set("co", co.ravel())
+        for attr in ("slider_min", "slider_max", "value", "interpolation", "mute", "vertex_group"):
+            setattr(new_block, attr, getattr(block, attr))
+    new_key = target.data.shape_keys
+    new_key.use_relative = key.use_relative
+    for block in key.key_blocks:
+        new_key.key_blocks[block.name].relative_key = new_key.key_blocks[block.relative_key.name]
+    if key.animation_data and key.animation_data.action:
+        new_key.animation_data_create().action = key.animation_data.action
+
+
+def vertex_weights(mesh):
+    """(vertex, group, weight) arrays. Deform weights have no foreach access, so this is a per-vertex loop."""
+    verts, groups, weights = [], [], []
+    for vert in mesh.vertices:
+        for element in vert.groups:
+            verts.append(vert.index)
+            groups.append(element.group)
+            weights.append(element.weight)
+    return np.array(verts, dtype=np.int64), np.array(groups, dtype=np.int64), np.array(weights, dtype=np.float32)
+
+
+def copy_vertex_weights(weights, target, piece, vert_count):
+    verts, groups, values = weights
+    new_index = np.full(vert_count, -1, dtype=np.int64)
+    new_index[piece.verts] = np.arange(len(piece.verts))
+    new_verts = new_index[verts]
+    keep = new_verts >= 0
+    new_verts, groups, values = new_verts[keep], groups[keep], values[keep]
+    # One add() per (group, weight) pair
+    order = np.lexsort((values, groups))
+    new_verts, groups, values = new_verts[order], groups[order], values[order]
+    breaks = np.flatnonzero((np.diff(groups) != 0) | (np.diff(values) != 0)) + 1
+    for start, end in zip(np.concatenate(([0], breaks)), np.concatenate((breaks, [len(groups)]))):
+        if start < end:
+            target.vertex_groups[int(groups[start])].add(new_verts[start:end].tolist(), float(values[start]), 'REPLACE')
+
+
+# -----------------------------
+# Split
+# -----------------------------
+def split_object(obj):
+    """
+    Separate one mesh object by material from its data, like Separate by
+    Material in Edit Mode: every material but the last gets a copy of the
+    object, the original keeps the last one and the loose geometry, and each
+    piece ends up with one material slot. Returns the new objects.
+    """
+    mesh = obj.data
+    source = SourceMesh(mesh)
+    pieces = plan_split(**source.topology())
+    if not pieces:
+        return []
+
+    slots = [(slot.link, mesh.materials[i] if i < len(mesh.materials) else None, slot.material)
+             for i, slot in enumerate(obj.material_slots)]
+    weights = vertex_weights(mesh) if len(obj.vertex_groups) else None
+
+    targets = []
+    for piece in pieces[:-1]:
+        new_obj = obj.copy()
+        for collection in obj.users_collection:
+            collection.objects.link(new_obj)
+        targets.append(new_obj)
+    targets.append(obj)
+
+    for target, piece in zip(targets, pieces):
+        new_mesh = build_piece(source, piece)
+        slot = slots[piece.material_index] if piece.material_index < len(slots) else ('DATA', None, None)
+        assign_material(target, new_mesh, slot)
+        copy_shape_keys(source, target, piece)
+        if weights is not None:
+            copy_vertex_weights(weights, target, piece, len(mesh.vertices))
+
+    # Other objects sharing the mesh see what the original keeps, as in Edit Mode
+    kept_mesh = obj.data
+    mesh.user_remap(kept_mesh)
+    name = mesh.name
+    bpy.data.meshes.remove(mesh)
+    kept_mesh.name = name
+    return targets[:-1]
+
+
+def split_with_operators(objects):
+    """The Edit Mode operator split, kept as the reference for benchmark()."""
+    for obj in objects:
+        # Pieces stay selected after a separate; don't take them into the next Edit Mode
+        for selected in bpy.context.selected_objects:
+            selected.select_set(False)
+        bpy.context.view_layer.objects.active = obj
+        obj.select_set(True)
+        bpy.ops.object.mode_set(mode='EDIT')
+        bpy.ops.mesh.separate(type='MATERIAL')  # Separate by material
+        bpy.ops.object.mode_set(mode='OBJECT')
+        obj.select_set(False)
+
 
 class MaterialFaceAssignments:
+    @staticmethod
+    def objects_to_split():
+        return [obj for obj in bpy.context.scene.objects
+                if obj.type == 'MESH' and len(obj.material_slots) > 1]
+
     @staticmethod
     def split_objects_by_material():
         # Loop through all mesh objects in the scene
-        for obj in bpy.context.scene.objects:
-            if obj.type == 'MESH' and len(obj.material_slots) > 1:
-                bpy.context.view_layer.objects.active = obj
-                obj.select_set(True)
-                bpy.ops.object.mode_set(mode='EDIT')
-                bpy.ops.mesh.separate(type='MATERIAL')  # Separate by material
-                bpy.ops.object.mode_set(mode='OBJECT')
-                obj.select_set(False)
+        split, created = 0, 0
+        for obj in MaterialFaceAssignments.objects_to_split():
+            # An earlier object may have shared this mesh and already split it
+            if len(obj.material_slots) < 2:
+                continue
+            if obj.mode == 'EDIT':
+                print(f"{obj.name} is in Edit Mode, not split")
+                continue
+            created += len(split_object(obj))
+            split += 1
+        print(f"Split {split} objects by material into {created} new objects")
+        return {"objects": split, "created": created}
+
+
+# -----------------------------
+# Benchmark on synthetic meshes
+# -----------------------------
+def make_benchmark_objects(count, faces, materials, seed=0):
+    """`count` grid objects of about `faces` faces, each with `materials` slots and a UV map."""
+    mats = [bpy.data.materials.new(f"bench_mat_{i}") for i in range(materials)]
+    objects = []
+    for i in range(count):
+        arrays = grid_mesh(faces, materials, loose=2, seed=seed + i)
+        side = int(round((arrays["vert_count"] - 6) ** 0.5))
+        grid = np.stack(np.meshgrid(np.arange(side), np.arange(side)), axis=-1).reshape(-1, 2)
+        co = np.zeros((arrays["vert_count"], 3), dtype=np.float32)
+        co[:len(grid), :2] = grid
+        co[len(grid):, 2] = np.arange(arrays["vert_count"] - len(grid))
+        mesh = build_geometry(f"bench_{i}", co, arrays["loop_start"], arrays["loop_total"],
+                              arrays["loop_vert"], arrays["loop_edge"], arrays["edge_verts"])
+        mesh.polygons.foreach_set("material_index", arrays["material_index"])
+        uv = mesh.uv_layers.new(name="UVMap")
+        uv.data.foreach_set("uv", (co[arrays["loop_vert"], :2] / side).ravel())
+        for mat in mats:
+            mesh.materials.append(mat)
+        mesh.update()
+        obj = bpy.data.objects.new(f"bench_{i}", mesh)
+        bpy.context.scene.collection.objects.link(obj)
+        objects.append(obj)
+    return objects
+
+
+def split_signature(objects):
+    """Order-independent description of the split result, per object name."""
+    signature = {}
+    for obj in objects:
+        mesh = obj.data
+        co = read_array(mesh.vertices, "co", np.float32, 3)
+        loop_vert = read_array(mesh.loops, "vertex_index", np.int32)
+        uv = read_array(mesh.uv_layers[0].data, "uv", np.float32, 2) if len(mesh.uv_layers) else None
+        faces = []
+        for poly in mesh.polygons:
+            corners = range(poly.loop_start, poly.loop_start + poly.loop_total)
+            faces.append(tuple(tuple(co[loop_vert[l]].round(4)) + (tuple(uv[l].round(4)) if uv is not None else ())
+                               for l in corners))
+        signature[obj.name] = (mesh.name, [slot.material.name if slot.material else None for slot in obj.material_slots],
+                               len(mesh.vertices), len(mesh.edges), sorted(faces))
+    return signature
+
+
+def clear_benchmark_objects():
+    for obj in [obj for obj in bpy.data.objects if obj.name.startswith("bench_")]:
+        bpy.data.objects.remove(obj)
+    for mesh in [mesh for mesh in bpy.data.meshes if mesh.name.startswith("bench_") and not mesh.users]:
+        bpy.data.meshes.remove(mesh)
+    for mat in [mat for mat in bpy.data.materials if mat.name.startswith("bench_mat_")]:
+        bpy.data.materials.remove(mat)
+
+
+def benchmark(count=200, faces=2000, materials=4, operators=True):
+    """
+    Time split_object() on synthetic objects against the Edit Mode operators
+    and check both give the same objects. Run in an empty scene:
+    blender -b --factory-startup --python blender_face_asignments.py -- --benchmark
+    """
+    timings = {}
+    results = {}
+    runs = [("data", lambda objs: [split_object(obj) for obj in objs])]
+    if operators:
+        runs.append(("operators", split_with_operators))
+    for name, split in runs:
+        clear_benchmark_objects()
+        objects = make_benchmark_objects(count, faces, materials)
+        start = time.perf_counter()
+        split(objects)
+        timings[name] = time.perf_counter() - start
+        results[name] = split_signature([obj for obj in bpy.data.objects if obj.name.startswith("bench_")])
+    clear_benchmark_objects()
+
+    line = f"{count} objects x {faces} faces, {materials} materials: data {timings['data']:.2f}s"
+    if operators:
+        same = results["data"] == results["operators"]
+        line += f", operators {timings['operators']:.2f}s ({timings['operators'] / timings['data']:.0f}x), " \
+                f"{'same result' if same else 'RESULTS DIFFER'}"
+    print(line)
+    return timings
+
 
 # Usage
-MaterialFaceAssignments.split_objects_by_material()
+#   blender -b scene.blend --python blender_face_asignments.py
+#   blender -b --factory-startup --python blender_face_asignments.py -- --benchmark [--objects N]
+#       [--faces N] [--materials N] [--no-operators]
+if __name__ == "__main__":
+    script_args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    if "--benchmark" in script_args:
+        options = {}
+        for flag, key in (("--objects", "count"), ("--faces", "faces"), ("--materials", "materials")):
+            if flag in script_args:
+                options[key] = int(script_args[script_args.index(flag) + 1])
+        benchmark(operators="--no-operators" not in script_args, **options)
+    else:
+        MaterialFaceAssignments.split_objects_by_material()
@@ -1,15 +1,34 @@
+import os
+import sys
+
 import bpy
 
+# blender_node_graph lives one folder up
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.append(SCRIPTS_DIR)
+from blender_node_graph import NodeGraphIndex
+
+# Principled inputs whose images are colour; every other input reads data
+COLOR_INPUTS = {"Base Color"}
+
+
+def input_colorspace(socket_name):
+    return "sRGB" if socket_name in COLOR_INPUTS else "Non-Color"
+
+
 # -----------------------------
 # Recursive upstream search
 # -----------------------------
-def find_linked_image_nodes(socket, visited=None):
+def find_linked_image_nodes(socket, visited=None, graph=None):
     """Recursively find all Image Texture nodes connected upstream from a socket."""
     if visited is None:
         visited = set()
+    if graph is None:
+        graph = NodeGraphIndex(socket.node.id_data)
 
     image_nodes = []
-    for link in socket.links:
+    for link in graph.links(socket):
         from_node = link.from_node
         if from_node in visited:
             continue
@@ -20,46 +39,172 @@ def find_linked_image_nodes(socket, visited=None):
 
         # Search deeper through node inputs
         for input_socket in from_node.inputs:
-            image_nodes.extend(find_linked_image_nodes(input_socket, visited))
+            image_nodes.extend(find_linked_image_nodes(input_socket, visited, graph))
 
     return image_nodes
 
 
 # -----------------------------
-# Core function
+# Roles: which colorspaces the consumers of each node need
 # -----------------------------
-def enforce_image_colorspaces():
-    for mat in bpy.data.materials:
-        if not mat.use_nodes:
+def node_roles(mat, graph=None, principled_nodes=None):
+    """
+    {node: set of colorspaces} for every node upstream of a Principled BSDF input,
+    in one pass: each (node, colorspace) pair is visited once, however many
+    inputs share the chain.
+    """
+    nt = mat.node_tree
+    if graph is None:
+        graph = NodeGraphIndex(nt)
+    if principled_nodes is None:
+        principled_nodes = [node for node in nt.nodes if node.type == 'BSDF_PRINCIPLED']
+
+    stack = []
+    for node in principled_nodes:
+        for socket in node.inputs:
+            role = input_colorspace(socket.name)
+            stack.extend((link.from_node, role) for link in graph.links(socket))
+
+    roles = {}
+    while stack:
+        node, role = stack.pop()
+        needed = roles.setdefault(node, set())
+        if role in needed:
             continue
+        needed.add(role)
+        for socket in node.inputs:
+            stack.extend((link.from_node, role) for link in graph.links(socket))
+    return roles
+
+
+def link_roles(link, roles):
+    """Colorspaces needed downstream of one link."""
+    if link.to_node.type == 'BSDF_PRINCIPLED':
+        return {input_colorspace(link.to_socket.name)}
+    return roles.get(link.to_node, set())
+
 
-        nt = mat.node_tree
-        for node in nt.nodes:
-            if node.type == 'BSDF_PRINCIPLED':
-                for input_name, socket in node.inputs.items():
-                    if not socket:
-                        continue
+def split_image_node(mat, node, links, graph):
+    """Copy an Image Texture node and move `links` to the copy. Returns the copy."""
+    nt = mat.node_tree
+    copy = nt.nodes.new("ShaderNodeTexImage")
+    copy.name = f"{node.name}_NonColor"
+    copy.label = node.label
+    copy.location = (node.location[0], node.location[1] - 300)
+    for attr in ("image", "interpolation", "projection", "projection_blend", "extension"):
+        if hasattr(node, attr):
+            setattr(copy, attr, getattr(node, attr))
+    vector = node.inputs.get("Vector")
+    if vector is not None and graph.is_linked(vector):
+        graph.add_link(nt.links.new(graph.from_socket(vector), copy.inputs["Vector"]))
+    for link in links:
+        graph.add_link(nt.links.new(copy.outputs[link.from_socket.name], link.to_socket))
+    return copy
 
-                    image_nodes = find_linked_image_nodes(socket)
 
-                    for img_node in image_nodes:
-                        if not img_node.image:
-                            continue
+# -----------------------------
+# Scene-wide resolution
+# -----------------------------
+class ColorspaceResolver:
+    """
+    Collects what every Image Texture node is used for, then gives each image
+    datablock one colorspace. An image needed both as sRGB and Non-Color is
+    duplicated instead of flipped: the copy takes the other colorspace and
+    the nodes that need it.
+
+    An image node that itself feeds both kinds of input is split first: its
+    Non-Color-only links move to a copy of the node. If a single link leads to
+    both (e.g. through one Mix node) it can't be split; that is reported and
+    the node stays sRGB.
+    """
+    def __init__(self):
+        self.uses = {}        # image -> {colorspace: [(material name, node)]}
+        self.conflicts = []
+
+    def add_material(self, mat, graph=None, principled_nodes=None):
+        """Record the image nodes of one material. Returns the image nodes added by splits."""
+        if graph is None:
+            graph = NodeGraphIndex(mat.node_tree)
+        roles = node_roles(mat, graph, principled_nodes)
+        added = []
+        for node, needed in roles.items():
+            if node.type != 'TEX_IMAGE' or not node.image:
+                continue
+            role = "sRGB" if "sRGB" in needed else "Non-Color"
+            if len(needed) > 1:
+                data_links = [l for l in graph.output_links(node) if link_roles(l, roles) == {"Non-Color"}]
+                mixed = [l for l in graph.output_links(node) if len(link_roles(l, roles)) > 1]
+                self.conflicts.append({
+                    "material": mat.name, "node": node.name, "image": node.image.name,
+                    "resolution": "unresolved, kept sRGB" if mixed else "node split",
+                })
+                print(f"[{mat.name}] {node.name} feeds both sRGB and Non-Color inputs"
+                      + (" through a shared link, keeping sRGB" if mixed else ", splitting the node"))
+                if data_links:
+                    copy = split_image_node(mat, node, data_links, graph)
+                    added.append(copy)
+                    self._use(copy.image, "Non-Color", mat, copy)
+            self._use(node.image, role, mat, node)
+        return added
+
+    def _use(self, image, role, mat, node):
+        self.uses.setdefault(image, {}).setdefault(role, []).append((mat.name, node))
+
+    def resolve(self):
+        """Assign every image its colorspace once. Returns the number of images changed or added."""
+        changes = 0
+        for image, by_role in self.uses.items():
+            current = image.colorspace_settings.name
+            # Keep the original for the role that needs no change, else the most used one
+            keep = current if current in by_role else max(by_role, key=lambda r: (len(by_role[r]), r == "sRGB"))
+            if current != keep:
+                print(f"{image.name} → {keep}")
+                image.colorspace_settings.name = keep
+                changes += 1
+            for role, users in by_role.items():
+                if role == keep:
+                    continue
+                copy = image.copy()
+                copy.name = f"{image.name}_{role.replace('-', '')}"
+                copy.colorspace_settings.name = role
+                for _, node in users:
+                    node.image = copy
+                materials = sorted({name for name, _ in users})
+                self.conflicts.append({
+                    "image": image.name, "resolution": f"duplicated as {copy.name}", "materials": materials,
+                })
+                print(f"{image.name} is used as {keep} and {role}: {len(users)} node(s) now use {copy.name} ({role})")
+                changes += 1
+        return changes
+
 
-                        # Rule 1: Base Color chain -> sRGB
-                        if input_name == "Base Color":
-                            if img_node.image.colorspace_settings.name != "sRGB":
-                                print(f"[{mat.name}] {img_node.image.name} → sRGB")
-                                img_node.image.colorspace_settings.name = "sRGB"
+# -----------------------------
+# Core functions
+# -----------------------------
+def enforce_material_colorspaces(mat, graph=None, principled_nodes=None):
+    """
+    Fix the colorspace of every image feeding a Principled BSDF of one material.
+    Returns the number of images changed.
+    """
+    resolver = ColorspaceResolver()
+    resolver.add_material(mat, graph, principled_nodes)
+    return resolver.resolve()
 
-                        # Rule 2: All other inputs -> Non-Color
-                        else:
-                            if img_node.image.colorspace_settings.name != "Non-Color":
-                                print(f"[{mat.name}] {img_node.image.name} → Non-Color")
-                                img_node.image.colorspace_settings.name = "Non-Color"
+
+def enforce_image_colorspaces():
+    resolver = ColorspaceResolver()
+    for mat in bpy.data.materials:
+        if not mat.use_nodes:
+            continue
+        resolver.add_material(mat)
+    changes = resolver.resolve()
+    if resolver.conflicts:
+        print(f"{len(resolver.conflicts)} colorspace conflict(s) resolved or reported")
+    return changes
 
 
 # -----------------------------
 # Run it once
 # -----------------------------
-enforce_image_colorspaces()
+if __name__ == "__main__":
+    enforce_image_colorspaces()
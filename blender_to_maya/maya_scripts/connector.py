@@ -1,17 +1,20 @@
 # connector.py
-import importlib
-import maya.cmds as cmds
-from dispatcher import dispatch_node
+from dispatcher import begin_material, dispatch_node
 
 def connect_material_nodes(materials):
     """
     Go through all materials and connect any node-based inputs.
     This will recursively create node inputs if needed and connect them.
     """
+    import maya.cmds as cmds
+
     for mat_name, mat_data in materials.items():
+        if "alias_of" in mat_data or "template" in mat_data:
+            continue  # shares the canonical/template material's network
         shader_type = mat_data.get("shader")
         shader_node = mat_name  # assume shader exists with same name
         channels = mat_data.get("channels", {})
+        begin_material(mat_data.get("nodes"))
 
         for slot, info in channels.items():
             if info.get("source_type") == "node":
@@ -5,20 +5,57 @@ import importlib
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 NODES_DIR = os.path.join(BASE_DIR, "nodes")
+SHARED_DIR = os.path.join(os.path.dirname(BASE_DIR), "shared")
 
-if NODES_DIR not in sys.path:
-    sys.path.append(NODES_DIR)
+for path in (NODES_DIR, SHARED_DIR):
+    if path not in sys.path:
+        sys.path.append(path)
+
+from dev_mode import fresh
+
+# Node table of the material being built (node_id -> record) and the
+# Maya nodes already created for it (node_id -> Maya node name)
+_node_table = {}
+_built_nodes = {}
+
+
+def begin_material(node_table):
+    """Switch to a new material's node table; shared nodes are built once per material."""
+    _node_table.clear()
+    _node_table.update(node_table or {})
+    _built_nodes.clear()
 
 
 def dispatch_node(node_type, node_name, node_data):
     """
     Dynamically import a node module and call its create() function.
     Supports both module-level create() and class-level create().
+    References ({"node_id": ...}) are resolved through the material's node table
+    and return the already-built Maya node when the id was seen before.
     """
+    node_id = node_data.get("node_id") if isinstance(node_data, dict) else None
+    if node_id is None:
+        return _create_node(node_type, node_name, node_data)
+
+    if node_id in _built_nodes:
+        print(f"[dispatcher] Reusing '{_built_nodes[node_id]}' for node '{node_id}'")
+        return _built_nodes[node_id]
+
+    record = _node_table.get(node_id)
+    if record is None:
+        print(f"[dispatcher] ERROR node '{node_id}' missing from the material's node table")
+        return None
+
+    node = _create_node(node_type, node_name, record)
+    _built_nodes[node_id] = node
+    return node
+
+
+def _create_node(node_type, node_name, node_data):
     try:
         module_name = node_type.lower().replace(" ", "_")  # e.g. "Principled BSDF" → "principled_bsdf"
-        module = importlib.import_module(module_name)
-        importlib.reload(module)
+        # Imported once; reloaded on every node only in development mode
+        module = fresh(importlib.import_module(module_name))
 
         # Prefer module-level create()
         if hasattr(module, "create"):
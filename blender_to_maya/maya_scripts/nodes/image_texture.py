@@ -1,8 +1,41 @@
+import os
+
 import maya.cmds as cmds
 
 INPUT_TYPES = {}  # file node has no inputs
 DEFAULT_OUTPUT = "outColor"  # file node outputs color
 
+# Resolution to import textures at: "budget" (the proxy level the exporter picked
+# for the scene's texture budget), "full", or a reduction factor "2", "4", "8"
+TIER_ENV = "B2M_TEXTURE_TIER"
+# Invalid tiers already reported, so each is only warned about once
+_warned_tiers = set()
+
+
+def choose_file(node_data, tier=None):
+    """Full-resolution path or the proxy for the tier; falls back to full size if the proxy is missing."""
+    full_path = node_data.get("file_path")
+    proxies = node_data.get("proxies")
+    tier = tier or os.environ.get(TIER_ENV, "budget")
+    if not proxies or tier == "full":
+        return full_path
+    if tier == "budget":
+        level = node_data.get("proxy_level", 1)
+    else:
+        try:
+            level = int(tier)
+        except ValueError:
+            if tier not in _warned_tiers:
+                _warned_tiers.add(tier)
+                print(f"[image_texture] Unknown texture tier '{tier}' (expected budget, full, 2, 4 or 8), "
+                      f"importing full resolution")
+            return full_path
+    available = [int(l) for l in proxies if int(l) <= level]
+    if not available:
+        return full_path
+    proxy_path = proxies[str(max(available))]
+    return proxy_path if os.path.exists(proxy_path) else full_path
+
 class ImageTexture:
     NODE_TYPE = "file"
 
@@ -13,7 +46,7 @@ class ImageTexture:
         print(f"[image_texture] Created node: {node}")
 
         # Set file path
-        file_path = node_data.get("file_path")
+        file_path = choose_file(node_data)
         if file_path:
             try:
                 cmds.setAttr(f"{node}.fileTextureName", file_path, type="string")
@@ -1,34 +1,118 @@
 # reader.py
 import sys
 import os
-import json
-import importlib
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))   # maya_scripts
 NODES_DIR = os.path.join(BASE_DIR, "nodes")
+SHARED_DIR = os.path.join(os.path.dirname(BASE_DIR), "shared")  # shared with the exporter
 
-if BASE_DIR not in sys.path:
-    sys.path.append(BASE_DIR)
-if NODES_DIR not in sys.path:
-    sys.path.append(NODES_DIR)
+for path in (BASE_DIR, NODES_DIR, SHARED_DIR):
+    if path not in sys.path:
+        sys.path.append(path)
 
+from dev_mode import fresh
 import dispatcher
-importlib.reload(dispatcher)
+fresh(dispatcher)
 from dispatcher import dispatch_node
+from scene_io import load_materials, load_selected_materials
 
 
 def read_material(material_name, material_data):
     shader_type = material_data.get("shader")
     print(f"\n=== Reading material: {material_name} ({shader_type}) ===")
+    dispatcher.begin_material(material_data.get("nodes"))
     return dispatch_node(shader_type, material_name, material_data)
 
 
-def read_scene(json_path):
+def read_scene(json_path, changed_only=False):
     if not os.path.exists(json_path):
         raise FileNotFoundError(f"JSON not found: {json_path}")
 
-    with open(json_path, "r") as f:
-        materials = json.load(f)
+    # .json or .jsonl, as written by MaterialCollector
+    materials = load_materials(json_path)
+
+    return build_materials(materials, changed_only=changed_only)
+
+
+def read_materials(json_path, names, changed_only=False):
+    """
+    Build only the named materials (and the canonicals/templates they reuse).
+    Uses the exporter's offset index when present, so only those records are parsed.
+    """
+    if not os.path.exists(json_path):
+        raise FileNotFoundError(f"JSON not found: {json_path}")
+
+    materials = load_selected_materials(json_path, names)
+
+    return build_materials(materials, changed_only=changed_only)
+
+
+def read_template(material_name, material_data):
+    """Build a template shader and drive its varying channels from per-object user data."""
+    import user_data
+    shader = read_material(material_name, material_data)
+    parameters = material_data["parameters"]
+    channels = material_data.get("channels", {})
+    user_data.bind_parameters(shader, parameters, channels)
+    user_data.apply_overrides(material_name, shader, {ch: channels[ch]["value"] for ch in parameters})
+    return shader
+
+
+def build_materials(materials, changed_only=False):
+    """
+    Build every material; aliases ({"alias_of": name}) reuse the canonical shader
+    and template instances ({"template": name, "overrides": ...}) reuse the
+    template shader with their values set as object user data. An alias of an
+    instance (or of a template) gets that instance's values on its own objects.
+    Aliases and instances are connected to the shading engines of their own
+    imported material.
+    With changed_only, entries an incremental export flagged "changed": False are
+    assumed to be in the scene already and are not rebuilt.
+    Returns {material name: shader node}.
+    """
+    import user_data
+    shaders = {}
+
+    def unchanged(data):
+        return changed_only and data.get("changed") is False
+
+    def build(name):
+        """Shader of a material that owns a network (plain, canonical or template)."""
+        if name not in shaders:
+            data = materials[name]
+            if unchanged(data):
+                shaders[name] = name
+                print(f"\n=== Skipping unchanged material: {name} ===")
+            elif "parameters" in data:
+                shaders[name] = read_template(name, data)
+            else:
+                shaders[name] = read_material(name, data)
+        return shaders[name]
+
+    def resolve(name):
+        """(material owning the network, user data values) behind an alias or instance."""
+        seen = set()
+        while "alias_of" in materials[name]:
+            if name in seen:
+                raise ValueError(f"Alias cycle at {name}")
+            seen.add(name)
+            name = materials[name]["alias_of"]
+        data = materials[name]
+        if "template" in data:
+            return data["template"], data.get("overrides", {})
+        if "parameters" in data:
+            channels = data.get("channels", {})
+            return name, {ch: channels[ch]["value"] for ch in data["parameters"]}
+        return name, {}
 
     for mat_name, mat_data in materials.items():
-        read_material(mat_name, mat_data)
+        if "alias_of" not in mat_data and "template" not in mat_data:
+            build(mat_name)
+            continue
+        owner, values = resolve(mat_name)
+        shaders[mat_name] = build(owner)
+        kind = "reuses" if "alias_of" in mat_data else "instances"
+        print(f"\n=== {mat_name} {kind} {owner} ({shaders[mat_name]}) ===")
+        if not unchanged(mat_data):
+            user_data.apply_overrides(mat_name, shaders[mat_name], values)
+    return shaders
@@ -1,18 +1,21 @@
-from PySide6 import QtWidgets, QtCore
+# PySide6 and maya.cmds are imported where they are used, so the runner can be
+# imported (and used with a worker pool) outside Maya.
 import subprocess
 import os
-import maya.cmds as cmds
 
 # -------------------------
 # Backend: Blender runner
 # -------------------------
 class BlenderSceneRunner:
-    def __init__(self, blender_base_path=r"C:\Program Files\Blender Foundation"):
+    def __init__(self, blender_base_path=r"C:\Program Files\Blender Foundation", pool=None):
         """
         Initialize the runner. Automatically finds the latest Blender version if available.
+        With a started shared/blender_pool.BlenderWorkerPool as `pool`, exports run on its
+        warm Blender workers instead of a new Blender process per file.
         """
+        self.pool = pool
         self.blender_exe = self.find_latest_blender(blender_base_path)
-        if not self.blender_exe:
+        if not self.blender_exe and pool is None:
             raise FileNotFoundError("No Blender installation found on the system.")
 
     def find_latest_blender(self, base_path):
@@ -43,13 +46,20 @@ class BlenderSceneRunner:
 
         if not os.path.exists(blend_file):
             raise FileNotFoundError(f"Blend file not found: {blend_file}")
-        if not os.path.exists(blender_script):
-            raise FileNotFoundError(f"Blender script not found: {blender_script}")
-        if not os.path.exists(self.blender_exe):
-            raise FileNotFoundError(f"Blender executable not found: {self.blender_exe}")
 
-        # Run Blender in background mode
-        subprocess.run([self.blender_exe, "--background", blend_file, "--python", blender_script], check=True)
+        if self.pool is not None:
+            # The pool's workers run the blender_to_maya pipeline, blender_script is not used
+            result = self.pool.run(blend_file)
+            if not result["ok"]:
+                print(f"Blender worker reported errors: {result['failures']} {result.get('error', '')}")
+        else:
+            if not os.path.exists(blender_script):
+                raise FileNotFoundError(f"Blender script not found: {blender_script}")
+            if not os.path.exists(self.blender_exe):
+                raise FileNotFoundError(f"Blender executable not found: {self.blender_exe}")
+
+            # Run Blender in background mode
+            subprocess.run([self.blender_exe, "--background", blend_file, "--python", blender_script], check=True)
 
         if status_callback:
             status_callback("Blender script finished.")
@@ -68,6 +78,8 @@ class BlenderSceneRunner:
         """
         Import the FBX into the current Maya scene.
         """
+        import maya.cmds as cmds
+
         if status_callback:
             status_callback("Importing FBX into Maya...")
 
@@ -88,79 +100,95 @@ class BlenderSceneRunner:
 # -------------------------
 # UI: Blender Importer
 # -------------------------
-class BlenderImporterUI(QtWidgets.QDialog):
-    def __init__(self, parent=None):
-        super(BlenderImporterUI, self).__init__(parent)
-        self.setWindowTitle("Blender Importer")
-        self.setMinimumWidth(400)
-        self.blend_file = ""
-
-        self.runner = BlenderSceneRunner()  # Backend instance
-
-        self.build_ui()
-        self.show()
-
-    def build_ui(self):
-        layout = QtWidgets.QVBoxLayout(self)
-
-        # File selection
-        file_layout = QtWidgets.QHBoxLayout()
-        self.file_line_edit = QtWidgets.QLineEdit()
-        self.file_line_edit.setReadOnly(True)
-        browse_btn = QtWidgets.QPushButton("Browse")
-        browse_btn.clicked.connect(self.browse_file)
-        file_layout.addWidget(self.file_line_edit)
-        file_layout.addWidget(browse_btn)
-        layout.addLayout(file_layout)
-
-        # Status label
-        self.status_label = QtWidgets.QLabel("")
-        layout.addWidget(self.status_label)
-
-        layout.addStretch()
-
-        # Buttons
-        btn_layout = QtWidgets.QHBoxLayout()
-        self.import_objects_btn = QtWidgets.QPushButton("Import Objects")
-        self.import_materials_btn = QtWidgets.QPushButton("Import Materials")
-        btn_layout.addWidget(self.import_objects_btn)
-        btn_layout.addWidget(self.import_materials_btn)
-        layout.addLayout(btn_layout)
-
-        # Connect button
-        self.import_objects_btn.clicked.connect(self.import_objects)
-
-    def browse_file(self):
-        file_path, _ = QtWidgets.QFileDialog.getOpenFileName(
-            self, "Select Blender File", "", "Blender Files (*.blend)"
-        )
-        if file_path:
-            self.blend_file = file_path
-            self.file_line_edit.setText(file_path)
-
-    def update_status(self, message):
-        self.status_label.setText(message)
-        QtWidgets.QApplication.processEvents()  # Refresh UI
-
-    def import_objects(self):
-        if not self.blend_file:
-            self.update_status("Please select a Blender file!")
-            return
-
-        # Disable buttons
-        self.import_objects_btn.setEnabled(False)
-        self.import_materials_btn.setEnabled(False)
-
-        try:
-            blender_script = r"O:\philips_zenith_tvc_25021901\work\_global\blender\scripts\blender_to_maya\blender_scripts\blender_to_maya.py"
-            fbx_path = self.runner.run_blender_script(self.blend_file, blender_script, status_callback=self.update_status)
-            self.runner.import_fbx_to_maya(fbx_path, status_callback=self.update_status)
-        except Exception as e:
-            self.update_status(str(e))
-
-        # Re-enable buttons
-        self.import_objects_btn.setEnabled(True)
-        self.import_materials_btn.setEnabled(True)
+def _define_ui():
+    """Build the Qt dialog class; PySide6 is only imported when the UI is used."""
+    from PySide6 import QtWidgets
+
+    class BlenderImporterUI(QtWidgets.QDialog):
+        def __init__(self, parent=None):
+            super(BlenderImporterUI, self).__init__(parent)
+            self.setWindowTitle("Blender Importer")
+            self.setMinimumWidth(400)
+            self.blend_file = ""
+
+            self.runner = BlenderSceneRunner()  # Backend instance
+
+            self.build_ui()
+            self.show()
+
+        def build_ui(self):
+            layout = QtWidgets.QVBoxLayout(self)
+
+            # File selection
+            file_layout = QtWidgets.QHBoxLayout()
+            self.file_line_edit = QtWidgets.QLineEdit()
+            self.file_line_edit.setReadOnly(True)
+            browse_btn = QtWidgets.QPushButton("Browse")
+            browse_btn.clicked.connect(self.browse_file)
+            file_layout.addWidget(self.file_line_edit)
+            file_layout.addWidget(browse_btn)
+            layout.addLayout(file_layout)
+
+            # Status label
+            self.status_label = QtWidgets.QLabel("")
+            layout.addWidget(self.status_label)
+
+            layout.addStretch()
+
+            # Buttons
+            btn_layout = QtWidgets.QHBoxLayout()
+            self.import_objects_btn = QtWidgets.QPushButton("Import Objects")
+            self.import_materials_btn = QtWidgets.QPushButton("Import Materials")
+            btn_layout.addWidget(self.import_objects_btn)
+            btn_layout.addWidget(self.import_materials_btn)
+            layout.addLayout(btn_layout)
+
+            # Connect button
+            self.import_objects_btn.clicked.connect(self.import_objects)
+
+        def browse_file(self):
+            file_path, _ = QtWidgets.QFileDialog.getOpenFileName(
+                self, "Select Blender File", "", "Blender Files (*.blend)"
+            )
+            if file_path:
+                self.blend_file = file_path
+                self.file_line_edit.setText(file_path)
+
+        def update_status(self, message):
+            self.status_label.setText(message)
+            QtWidgets.QApplication.processEvents()  # Refresh UI
+
+        def import_objects(self):
+            if not self.blend_file:
+                self.update_status("Please select a Blender file!")
+                return
+
+            # Disable buttons
+            self.import_objects_btn.setEnabled(False)
+            self.import_materials_btn.setEnabled(False)
+
+            try:
+                blender_script = r"O:\philips_zenith_tvc_25021901\work\_global\blender\scripts\blender_to_maya\blender_scripts\blender_to_maya.py"
+                fbx_path = self.runner.run_blender_script(self.blend_file, blender_script, status_callback=self.update_status)
+                self.runner.import_fbx_to_maya(fbx_path, status_callback=self.update_status)
+            except Exception as e:
+                self.update_status(str(e))
+
+            # Re-enable buttons
+            self.import_objects_btn.setEnabled(True)
+            self.import_materials_btn.setEnabled(True)
+
+    return BlenderImporterUI
+
+
+def __getattr__(name):
+    # maya_importer.BlenderImporterUI keeps working, but only costs a PySide6 import when used
+    if name == "BlenderImporterUI":
+        global BlenderImporterUI
+        BlenderImporterUI = _define_ui()
+        return BlenderImporterUI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # -------------------------
 # Show the UI
@@ -171,4 +199,5 @@ if __name__ == "__main__":
     except:
         pass
 
+    BlenderImporterUI = _define_ui()
     ui = BlenderImporterUI()
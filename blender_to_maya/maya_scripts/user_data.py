@@ -0,0 +1,85 @@
+# user_data.py
+import maya.cmds as cmds
+
+from principled_bsdf import SLOT_MAP
+
+# Prefix of the per-object attributes Arnold exposes to aiUserData* nodes
+CONSTANT_PREFIX = "mtoa_constant_"
+
+
+def parameter_name(channel):
+    """User data name for a template channel, e.g. "Base Color" -> "b2m_baseColor"."""
+    return f"b2m_{SLOT_MAP.get(channel, channel.replace(' ', ''))}"
+
+
+def bind_parameters(shader, parameters, channels):
+    """
+    Feed each varying template channel through an aiUserDataColor/aiUserDataFloat
+    node, so every object can carry its own value on one shared shader.
+    """
+    for channel, kind in parameters.items():
+        maya_attr = SLOT_MAP.get(channel)
+        if not maya_attr:
+            continue
+        default = channels.get(channel, {}).get("value")
+        name = parameter_name(channel)
+
+        if kind == "color":
+            node = cmds.shadingNode("aiUserDataColor", asUtility=True, name=f"{shader}_{maya_attr}_userData")
+            out_attrs = [("outColor", maya_attr)]
+            if default is not None:
+                cmds.setAttr(f"{node}.default", *default[:3], type="double3")
+        else:
+            node = cmds.shadingNode("aiUserDataFloat", asUtility=True, name=f"{shader}_{maya_attr}_userData")
+            if maya_attr == "opacity":
+                out_attrs = [("outValue", f"opacity{c}") for c in "RGB"]
+            else:
+                out_attrs = [("outValue", maya_attr)]
+            if default is not None:
+                cmds.setAttr(f"{node}.default", default)
+        cmds.setAttr(f"{node}.attribute", name, type="string")
+
+        for out_attr, dest_attr in out_attrs:
+            try:
+                cmds.connectAttr(f"{node}.{out_attr}", f"{shader}.{dest_attr}", force=True)
+                print(f"[user_data] Connected {node}.{out_attr} → {shader}.{dest_attr}")
+            except Exception as e:
+                print(f"[user_data] Could not connect {node}.{out_attr} → {shader}.{dest_attr}: {e}")
+
+
+def _set_constant(shape, attr, value):
+    if not cmds.attributeQuery(attr, node=shape, exists=True):
+        if isinstance(value, list):
+            cmds.addAttr(shape, longName=attr, attributeType="float3", usedAsColor=True)
+            for suffix in "RGB":
+                cmds.addAttr(shape, longName=f"{attr}{suffix}", attributeType="float", parent=attr)
+        else:
+            cmds.addAttr(shape, longName=attr, attributeType="float")
+    if isinstance(value, list):
+        cmds.setAttr(f"{shape}.{attr}", *value[:3], type="float3")
+    else:
+        cmds.setAttr(f"{shape}.{attr}", value)
+
+
+def apply_overrides(material_name, shader, values):
+    """
+    Write a material's parameter values onto the objects it is assigned to and
+    move those objects onto the template shader. `material_name` is the material
+    imported with the FBX; nothing happens if it is not in the scene.
+    """
+    if not cmds.objExists(material_name):
+        print(f"[user_data] {material_name} not in scene, skipping overrides")
+        return
+    for sg in cmds.listConnections(material_name, type="shadingEngine") or []:
+        members = cmds.sets(sg, query=True) or []
+        # Per-face assignments still carry the value per object
+        shapes = sorted({m.split(".")[0] for m in members})
+        for shape in shapes:
+            for channel, value in values.items():
+                try:
+                    _set_constant(shape, CONSTANT_PREFIX + parameter_name(channel), value)
+                except Exception as e:
+                    print(f"[user_data] Could not set {channel} on {shape}: {e}")
+        if material_name != shader:
+            cmds.connectAttr(f"{shader}.outColor", f"{sg}.surfaceShader", force=True)
+        print(f"[user_data] {sg}: {len(shapes)} object(s) → {shader} {values}")
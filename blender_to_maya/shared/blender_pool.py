@@ -0,0 +1,243 @@
+# blender_pool.py
+# Pool of warm Blender background processes running blender_scripts/blender_worker.py.
+# Jobs go to the workers over an authenticated local connection, so each export
+# pays for opening the .blend only, not for starting Blender.
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener
+
+WORKER_SCRIPT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "blender_scripts", "blender_worker.py"
+)
+AUTHKEY_ENV = "B2M_WORKER_AUTHKEY"
+
+
+class WorkerError(RuntimeError):
+    """A worker died, timed out or never came up (it is replaced in the background), or none are left."""
+
+
+class _Worker:
+    def __init__(self, token, process):
+        self.token = token
+        self.process = process
+        self.conn = None
+        self.jobs = 0
+
+    def kill(self):
+        if self.conn is not None:
+            self.conn.close()
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+
+
+class BlenderWorkerPool:
+    """
+    Keep `size` Blender workers running and hand them jobs.
+
+    max_jobs:        recycle a worker after this many jobs (Blender leaks between files)
+    job_timeout:     seconds a job may take before its worker is killed (None = no limit)
+    startup_timeout: seconds a new worker has to connect back
+    stub:            run the worker script with this Python and --stub instead of Blender
+    log_path:        file collecting the workers' output (default: discarded)
+    respawn_retries: attempts to start a replacement worker before its slot is given up
+    respawn_backoff: seconds before the second attempt, doubling after each failure
+
+    run() is thread-safe; up to `size` jobs run at once. Retired and crashed
+    workers are replaced in the background, so no job waits for a Blender
+    startup unless every worker is being replaced.
+
+        with BlenderWorkerPool(blender_exe, size=4) as pool:
+            result = pool.run("scene.blend")
+    """
+    def __init__(self, blender_exe=None, size=2, max_jobs=20, job_timeout=None, startup_timeout=120,
+                 stub=False, worker_script=WORKER_SCRIPT, log_path=None, respawn_retries=5, respawn_backoff=2.0):
+        if not stub and not blender_exe:
+            raise ValueError("blender_exe is required unless stub=True")
+        self.blender_exe = blender_exe
+        self.size = size
+        self.max_jobs = max_jobs
+        self.job_timeout = job_timeout
+        self.startup_timeout = startup_timeout
+        self.stub = stub
+        self.worker_script = worker_script
+        self.log_path = log_path
+        self.respawn_retries = respawn_retries
+        self.respawn_backoff = respawn_backoff
+
+        self.authkey = os.urandom(32)
+        self.listener = None
+        self.log = None
+        self.idle = queue.Queue()
+        self.workers = []
+        self.closed = False
+        # Workers running or being replaced; a slot is lost when its replacement never starts
+        self._slots = 0
+        self._next_token = 0
+        self._connections = {}
+        self._connected = threading.Condition()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ------------------------------------------------
+    # Worker lifecycle
+    # ------------------------------------------------
+    def start(self):
+        self.listener = Listener(("127.0.0.1", 0), authkey=self.authkey)
+        self.log = open(self.log_path, "a", encoding="utf-8") if self.log_path else subprocess.DEVNULL
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        for _ in range(self.size):
+            self.idle.put(self._spawn())
+            self._slots += 1
+
+    def _accept_loop(self):
+        # Workers connect back in any order and say which one they are
+        while True:
+            try:
+                conn = self.listener.accept()
+                hello = conn.recv()
+            except (OSError, EOFError, AuthenticationError):
+                if self.closed:
+                    return
+                continue
+            with self._connected:
+                self._connections[hello["token"]] = conn
+                self._connected.notify_all()
+
+    def command(self, token):
+        address = "{}:{}".format(*self.listener.address)
+        args = ["--", "--address", address, "--token", str(token)]
+        if self.stub:
+            return [sys.executable, self.worker_script] + args + ["--stub"]
+        return [self.blender_exe, "--background", "--python", self.worker_script] + args
+
+    def _spawn(self):
+        with self._lock:
+            token = self._next_token
+            self._next_token += 1
+        env = dict(os.environ, **{AUTHKEY_ENV: self.authkey.hex()})
+        process = subprocess.Popen(self.command(token), env=env, stdout=self.log, stderr=subprocess.STDOUT)
+        worker = _Worker(token, process)
+
+        deadline = time.monotonic() + self.startup_timeout
+        with self._connected:
+            while token not in self._connections and process.poll() is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                # Only a connection notifies; a worker that exits on startup is caught by polling
+                self._connected.wait(min(remaining, 0.1))
+            worker.conn = self._connections.pop(token, None)
+        if worker.conn is None:
+            worker.kill()
+            raise WorkerError(f"Blender worker did not start (exit code {process.poll()})")
+        with self._lock:
+            self.workers.append(worker)
+        return worker
+
+    def _retire(self, worker, graceful=True):
+        with self._lock:
+            if worker in self.workers:
+                self.workers.remove(worker)
+        if graceful:
+            try:
+                worker.conn.send({"quit": True})
+                worker.process.wait(timeout=30)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        worker.kill()
+
+    def _replace(self, worker, graceful):
+        """Retire a worker and start its successor on another thread. Never raises."""
+        threading.Thread(target=self._respawn, args=(worker, graceful), daemon=True).start()
+
+    def _respawn(self, worker, graceful):
+        try:
+            self._retire(worker, graceful)
+        except Exception as e:
+            print(f"[pool] Could not retire worker {worker.token}: {e}")
+        delay = self.respawn_backoff
+        for attempt in range(1, self.respawn_retries + 1):
+            if self.closed:
+                break
+            try:
+                successor = self._spawn()
+            except Exception as e:
+                print(f"[pool] Replacement worker failed to start ({attempt}/{self.respawn_retries}): {e}")
+                if attempt < self.respawn_retries:
+                    time.sleep(delay)
+                    delay *= 2
+                continue
+            if self.closed:
+                self._retire(successor, graceful=False)
+                break
+            self.idle.put(successor)
+            return
+        with self._lock:
+            self._slots -= 1
+            left = self._slots
+        if not self.closed:
+            print(f"[pool] Gave up replacing a worker; {left} of {self.size} left")
+
+    def _take(self):
+        """An idle worker; raises WorkerError instead of waiting forever once no slot is left."""
+        while True:
+            if self.closed:
+                raise RuntimeError("Pool is closed")
+            try:
+                return self.idle.get(timeout=0.5)
+            except queue.Empty:
+                with self._lock:
+                    if self._slots <= 0:
+                        raise WorkerError("No Blender workers left: their replacements failed to start")
+
+    # ------------------------------------------------
+    # Jobs
+    # ------------------------------------------------
+    def run(self, blend_file, stages=None, **extra):
+        """
+        Run the pipeline (or the named stages, e.g. ["fbx_export"]) on a .blend.
+        Returns the worker's reply: {"ok", "failures", "seconds", ...}.
+        Raises WorkerError if the worker crashed or timed out (the pool replaces
+        it) or if no worker is left.
+        """
+        worker = self._take()
+        job = dict(extra, blend=os.path.abspath(blend_file), stages=stages)
+        try:
+            worker.conn.send(job)
+            if not worker.conn.poll(self.job_timeout):
+                self._replace(worker, graceful=False)
+                raise WorkerError(f"Timed out after {self.job_timeout}s: {blend_file}")
+            reply = worker.conn.recv()
+        except (OSError, EOFError):
+            self._replace(worker, graceful=False)
+            raise WorkerError(f"Worker crashed (exit code {worker.process.poll()}) on: {blend_file}")
+
+        worker.jobs += 1
+        if self.max_jobs and worker.jobs >= self.max_jobs:
+            self._replace(worker, graceful=True)
+        else:
+            self.idle.put(worker)
+        return reply
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for worker in list(self.workers):
+            self._retire(worker)
+        if self.listener is not None:
+            self.listener.close()
+        if self.log not in (None, subprocess.DEVNULL):
+            self.log.close()
@@ -0,0 +1,22 @@
+# dev_mode.py
+# Production vs development behaviour, shared by the Blender and Maya sides.
+#
+# Production (default): every pipeline module is imported once per process.
+# Development (B2M_DEV=1): modules are reloaded each time they are used, so
+# edits are picked up without restarting Blender or Maya.
+import importlib
+import os
+
+DEV_ENV = "B2M_DEV"
+
+
+def is_dev():
+    """Read on every call, so it can be switched inside a running Maya session."""
+    return os.environ.get(DEV_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def fresh(module):
+    """Return the module, reloaded first in development mode."""
+    if is_dev():
+        return importlib.reload(module)
+    return module
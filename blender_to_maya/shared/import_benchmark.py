@@ -0,0 +1,88 @@
+# import_benchmark.py
+# Import-time benchmark for the modules that must load fast and outside Blender/Maya.
+#
+#   python import_benchmark.py                   # all modules, with this Python
+#   python import_benchmark.py --budget-ms 50    # exit 1 if one is slower
+#   python import_benchmark.py --python mayapy --top 5 reader
+#
+# Each module is imported in a fresh interpreter with `-X importtime`, so the
+# numbers are cold-import costs. A module that pulls in bpy, maya or PySide6 at
+# import time fails here, which is what keeps it importable headless.
+import argparse
+import os
+import subprocess
+import sys
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEARCH_PATH = [
+    os.path.join(PACKAGE_DIR, "shared"),
+    os.path.join(PACKAGE_DIR, "maya_scripts"),
+    os.path.join(PACKAGE_DIR, "maya_scripts", "nodes"),
+    os.path.join(PACKAGE_DIR, "maya_scripts", "ui"),
+    os.path.join(PACKAGE_DIR, "blender_scripts"),
+]
+
+# Modules that may not import host-only packages at module level
+HEADLESS_MODULES = [
+    "dev_mode", "scene_io", "scene_binary", "blender_pool", "texture_proxies", "texture_store", "mesh_split",
+    "dispatcher", "reader", "connector", "maya_importer",
+    "blender_batch_export", "blender_watch", "blender_worker",
+]
+HOST_PACKAGES = ("bpy", "maya", "PySide6", "PySide2")
+
+
+def parse_importtime(stderr):
+    """[(name, self_us, cumulative_us, depth)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def measure(module, python=sys.executable):
+    """Cold import of one module. Returns (cumulative_us, rows) or raises RuntimeError."""
+    code = f"import sys; sys.path[:0] = {SEARCH_PATH!r}; import {module}"
+    result = subprocess.run([python, "-X", "importtime", "-c", code], capture_output=True, text=True)
+    rows = parse_importtime(result.stderr)
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"
+        raise RuntimeError(error)
+    host = sorted({name.split(".")[0] for name, _, _, _ in rows if name.split(".")[0] in HOST_PACKAGES})
+    if host:
+        raise RuntimeError(f"imports host-only package(s) at import time: {', '.join(host)}")
+    total = next((cum for name, _, cum, _ in reversed(rows) if name == module), 0)
+    return total, rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold import time of the pipeline modules.")
+    parser.add_argument("modules", nargs="*", default=HEADLESS_MODULES, help="modules to measure")
+    parser.add_argument("--python", default=sys.executable, help="interpreter to measure with (e.g. mayapy)")
+    parser.add_argument("--repeat", type=int, default=3, help="imports per module, the fastest one counts")
+    parser.add_argument("--top", type=int, default=0, help="also list the N slowest imports of each module")
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail if a module takes longer")
+    args = parser.parse_args(argv)
+
+    failed = []
+    for module in args.modules:
+        try:
+            best, rows = min((measure(module, args.python) for _ in range(args.repeat)), key=lambda r: r[0])
+        except RuntimeError as e:
+            print(f"{module:22s}   FAILED  {e}")
+            failed.append(module)
+            continue
+        over = args.budget_ms is not None and best / 1000 > args.budget_ms
+        print(f"{module:22s} {best / 1000:8.2f} ms  {len(rows):4d} modules" + ("  OVER BUDGET" if over else ""))
+        if over:
+            failed.append(module)
+        for name, self_us, _, _ in sorted(rows, key=lambda r: -r[1])[:args.top]:
+            print(f"    {self_us / 1000:8.2f} ms  {name}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+# mesh_split.py
+# Split-by-material planning on flat mesh arrays, as read with foreach_get.
+#
+# plan_split() works out, with NumPy and no per-face Python loop, which faces,
+# corners, edges and vertices end up in each piece of Blender's "Separate by
+# Material", and the piece-local topology to build each new mesh from.
+# blender_scripts/misc/blender_face_asignments.py reads the arrays and builds
+# the meshes; everything here runs without Blender.
+#
+#   python mesh_split.py                                  # synthetic grid benchmark
+#   python mesh_split.py --faces 1000000 --materials 16 --repeat 3
+#
+# The benchmark checks plan_split() against plan_split_reference(), a plain
+# per-face loop with the same rules, before timing both.
+import argparse
+import sys
+import time
+
+
+class Piece:
+    """
+    One object's worth of a split. `faces`, `loops`, `edges` and `verts` index
+    the source mesh (ascending, as Blender keeps element order); the other
+    arrays are the piece's own topology.
+    """
+    def __init__(self, material_index, faces, loops, edges, verts, loop_start, loop_total, loop_vert,
+                 loop_edge, edge_verts):
+        self.material_index = material_index
+        self.faces = faces
+        self.loops = loops
+        self.edges = edges
+        self.verts = verts
+        self.loop_start = loop_start
+        self.loop_total = loop_total
+        self.loop_vert = loop_vert
+        self.loop_edge = loop_edge
+        self.edge_verts = edge_verts
+
+    def domain_indices(self, domain):
+        """Source indices for an attribute domain (POINT, EDGE, FACE or CORNER)."""
+        return {"POINT": self.verts, "EDGE": self.edges, "FACE": self.faces, "CORNER": self.loops}[domain]
+
+
+def _face_loops(faces, loop_start, loop_total):
+    """(source corner indices of `faces` in order, piece loop_start, piece loop_total)."""
+    import numpy as np
+    totals = loop_total[faces]
+    starts = np.zeros(len(faces), dtype=np.int64)
+    np.cumsum(totals[:-1], out=starts[1:])
+    loops = np.repeat(loop_start[faces] - starts, totals) + np.arange(int(totals.sum()), dtype=np.int64)
+    return loops, starts, totals
+
+
+def _keep(used, size, lookup):
+    """
+    Ascending unique indices of a boolean-mask pass over `used` (no sort), with
+    `lookup` (reused between pieces) set to their new positions.
+    """
+    import numpy as np
+    mask = np.zeros(size, dtype=bool)
+    for indices in used:
+        mask[indices] = True
+    kept = np.flatnonzero(mask)
+    lookup[kept] = np.arange(len(kept), dtype=np.int32)
+    return kept
+
+
+def plan_split(material_index, loop_start, loop_total, loop_vert, loop_edge, edge_verts, vert_count):
+    """
+    Pieces in Blender's order: the material of the first face goes to a new
+    object, then the first face of what is left, and so on; the last piece
+    stays with the original object and also keeps the loose edges and
+    vertices. Returns [] for a mesh without faces.
+    """
+    import numpy as np
+    material_index = np.asarray(material_index)
+    loop_start = np.asarray(loop_start, dtype=np.int64)
+    loop_total = np.asarray(loop_total, dtype=np.int64)
+    loop_vert = np.asarray(loop_vert)
+    loop_edge = np.asarray(loop_edge)
+    edge_verts = np.asarray(edge_verts).reshape(-1, 2)
+    if not len(material_index):
+        return []
+
+    materials, first_face = np.unique(material_index, return_index=True)
+    materials = materials[np.argsort(first_face)]
+    # Faces of every material at once: one stable sort keeps face order within a material
+    rank = np.empty(int(materials.max()) - int(materials.min()) + 1, dtype=np.int64)
+    rank[materials - materials.min()] = np.arange(len(materials))
+    face_rank = rank[material_index - materials.min()]
+    face_order = np.argsort(face_rank, kind="stable")
+    bounds = np.searchsorted(face_rank[face_order], np.arange(len(materials) + 1))
+
+    new_vert = np.empty(vert_count, dtype=np.int32)
+    new_edge = np.empty(len(edge_verts), dtype=np.int32)
+    pieces = []
+    for i, mat in enumerate(materials):
+        faces = face_order[bounds[i]:bounds[i + 1]]
+        loops, starts, totals = _face_loops(faces, loop_start, loop_total)
+        piece_verts, piece_edges = [loop_vert[loops]], [loop_edge[loops]]
+        if i == len(materials) - 1:
+            # Loose geometry is never part of a separated face, so it stays
+            edge_used = np.zeros(len(edge_verts), dtype=bool)
+            edge_used[loop_edge] = True
+            loose_edges = np.flatnonzero(~edge_used)
+            vert_used = np.zeros(vert_count, dtype=bool)
+            vert_used[loop_vert] = True
+            vert_used[edge_verts.ravel()] = True
+            piece_edges.append(loose_edges)
+            piece_verts += [edge_verts[loose_edges].ravel(), np.flatnonzero(~vert_used)]
+        edges = _keep(piece_edges, len(edge_verts), new_edge)
+        verts = _keep(piece_verts, vert_count, new_vert)
+        pieces.append(Piece(
+            int(mat), faces, loops, edges, verts,
+            starts.astype(np.int32), totals.astype(np.int32),
+            new_vert[piece_verts[0]], new_edge[piece_edges[0]], new_vert[edge_verts[edges]],
+        ))
+    return pieces
+
+
+def plan_split_reference(material_index, loop_start, loop_total, loop_vert, loop_edge, edge_verts, vert_count):
+    """plan_split() as a per-face loop, to check it against and to benchmark."""
+    import numpy as np
+    order = list(dict.fromkeys(int(m) for m in material_index))
+    edge_has_face, vert_has_geometry = set(loop_edge), set(loop_vert)
+    for v1, v2 in edge_verts:
+        vert_has_geometry.update((int(v1), int(v2)))
+
+    pieces = []
+    for i, mat in enumerate(order):
+        faces, loops, starts, totals = [], [], [], []
+        for f, face_mat in enumerate(material_index):
+            if face_mat == mat:
+                faces.append(f)
+                starts.append(len(loops))
+                totals.append(int(loop_total[f]))
+                loops.extend(range(loop_start[f], loop_start[f] + loop_total[f]))
+        edges = {loop_edge[l] for l in loops}
+        verts = {loop_vert[l] for l in loops}
+        if i == len(order) - 1:
+            for e, (v1, v2) in enumerate(edge_verts):
+                if e not in edge_has_face:
+                    edges.add(e)
+                    verts.update((v1, v2))
+            verts.update(v for v in range(vert_count) if v not in vert_has_geometry)
+        edges, verts = sorted(int(e) for e in edges), sorted(int(v) for v in verts)
+        new_edge = {e: n for n, e in enumerate(edges)}
+        new_vert = {v: n for n, v in enumerate(verts)}
+        pieces.append(Piece(
+            mat, np.array(faces), np.array(loops), np.array(edges), np.array(verts),
+            np.array(starts), np.array(totals),
+            np.array([new_vert[loop_vert[l]] for l in loops]), np.array([new_edge[loop_edge[l]] for l in loops]),
+            np.array([[new_vert[v1], new_vert[v2]] for v1, v2 in (edge_verts[e] for e in edges)]).reshape(-1, 2),
+        ))
+    return pieces
+
+
+# ------------------------------------------------
+# Synthetic meshes and benchmark
+# ------------------------------------------------
+def grid_mesh(faces, materials, loose=0, seed=0):
+    """
+    A quad grid of about `faces` faces with random material indices, plus
+    `loose` loose edges and vertices, as the arrays plan_split() takes.
+    """
+    import numpy as np
+    side = max(1, int(round(faces ** 0.5)))
+    rows = cols = side
+    vert = np.arange((rows + 1) * (cols + 1)).reshape(rows + 1, cols + 1)
+    quads = np.stack([vert[:-1, :-1], vert[:-1, 1:], vert[1:, 1:], vert[1:, :-1]], axis=-1).reshape(-1, 4)
+
+    # Edges from the corner pairs, numbered like Blender does: in order of first use
+    pairs = np.stack([quads, np.roll(quads, -1, axis=1)], axis=-1).reshape(-1, 2)
+    keys = np.sort(pairs, axis=1)
+    unique_keys, first, inverse = np.unique(keys[:, 0] * len(vert.ravel()) + keys[:, 1],
+                                            return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    edge_number = np.empty(len(order), dtype=np.int64)
+    edge_number[order] = np.arange(len(order))
+    edge_verts = keys[first[order]]
+    loop_edge = edge_number[inverse.ravel()]
+
+    vert_count = len(vert.ravel())
+    if loose:
+        new_verts = vert_count + np.arange(2 * loose)
+        edge_verts = np.concatenate([edge_verts, new_verts.reshape(-1, 2)])
+        vert_count += 3 * loose  # every third new vertex has no edge at all
+
+    rng = np.random.default_rng(seed)
+    # Patches of one material, as in real models, with some speckle
+    material_index = (np.arange(len(quads)) * materials // len(quads)).astype(np.int32)
+    speckle = rng.random(len(quads)) < 0.05
+    material_index[speckle] = rng.integers(0, materials, int(speckle.sum()))
+    return {
+        "material_index": material_index,
+        "loop_start": np.arange(0, 4 * len(quads), 4, dtype=np.int32),
+        "loop_total": np.full(len(quads), 4, dtype=np.int32),
+        "loop_vert": quads.ravel().astype(np.int32),
+        "loop_edge": loop_edge.astype(np.int32),
+        "edge_verts": edge_verts.astype(np.int32),
+        "vert_count": vert_count,
+    }
+
+
+def same_plan(a, b):
+    import numpy as np
+    fields = ("faces", "loops", "edges", "verts", "loop_start", "loop_total", "loop_vert", "loop_edge", "edge_verts")
+    return len(a) == len(b) and all(
+        p.material_index == q.material_index
+        and all(np.array_equal(getattr(p, f), getattr(q, f)) for f in fields)
+        for p, q in zip(a, b)
+    )
+
+
+def benchmark(faces, materials, repeat=1, reference=True):
+    mesh = grid_mesh(faces, materials, loose=max(1, faces // 1000))
+    timings = {}
+    runs = [("numpy", plan_split)] + ([("reference", plan_split_reference)] if reference else [])
+    plans = {}
+    for name, func in runs:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            plans[name] = func(**mesh)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = best
+    if reference and not same_plan(plans["numpy"], plans["reference"]):
+        raise AssertionError("plan_split() differs from plan_split_reference()")
+    return len(mesh["material_index"]), len(plans["numpy"]), timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark split-by-material planning on a synthetic grid.")
+    parser.add_argument("--faces", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--materials", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--no-reference", action="store_true",
+                        help="skip the per-face reference loop (slow on big meshes)")
+    args = parser.parse_args(argv)
+
+    for faces in args.faces:
+        count, pieces, timings = benchmark(faces, args.materials, args.repeat, not args.no_reference)
+        line = f"{count:>9} faces, {pieces} pieces: numpy {timings['numpy'] * 1000:8.1f} ms"
+        if "reference" in timings:
+            line += (f", per-face loop {timings['reference'] * 1000:9.1f} ms"
+                     f" ({timings['reference'] / timings['numpy']:.0f}x), plans equal")
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,385 @@
+# scene_binary.py
+# Compact binary material format, read and written with the stdlib only.
+#
+# File:    MAGIC | u16 version | u8 compression | u8 reserved | payload
+# Payload: (optionally compressed as one stream)
+#          RECORD varint(name) value ... END
+#          string table: varint count, (varint byte length, utf-8 bytes) * count
+#          u64 offset of the string table inside the payload
+# Every string (keys, values, names) is stored once in the table and referenced
+# by index; paths are split into an interned folder and file name; lists of
+# floats are packed as typed arrays.
+#
+# This is a size format, not a load-speed one: files are ~4x smaller than
+# compact JSON (~8x with zlib), but the decoder runs in Python and parses
+# ~1.3-2x slower than json.loads, which builds the same objects in C. Use it
+# where disk or network size matters (archives, remote farms). JSON stays the
+# default layout and is the one to load in Maya when import time matters.
+#
+#   python scene_binary.py                          # synthetic scene benchmark
+#   python scene_binary.py --materials 5000 --repeat 3
+import bz2
+import lzma
+import struct
+import sys
+import time
+import zlib
+
+MAGIC = b"B2MS"
+VERSION = 1
+EXTENSION = ".b2m"
+
+COMPRESSION = {None: 0, "zlib": 1, "lzma": 2, "bz2": 3}
+_COMPRESSORS = {1: zlib.compressobj, 2: lzma.LZMACompressor, 3: bz2.BZ2Compressor}
+_DECOMPRESS = {1: zlib.decompress, 2: lzma.decompress, 3: bz2.decompress}
+
+# Value tags
+T_NONE, T_FALSE, T_TRUE, T_INT, T_FLOAT64, T_FLOAT32 = 0x00, 0x01, 0x02, 0x03, 0x04, 0x05
+T_STR, T_LIST, T_DICT, T_VEC64, T_VEC32, T_PATH = 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B
+T_RECORD, T_END = 0xF0, 0xFF
+
+_F64 = struct.Struct("<d")
+_F32 = struct.Struct("<f")
+
+
+def _varint(out, n):
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _split_path(path):
+    cut = max(path.rfind("/"), path.rfind("\\")) + 1
+    return path[:cut], path[cut:]
+
+
+class BinaryMaterialWriter:
+    """
+    Stream materials into the binary format. Same interface as scene_io.MaterialWriter,
+    but `f` must be opened in binary mode.
+
+    compression: None, "zlib", "lzma" or "bz2"
+    float32:     store floats as 32-bit (lossy, halves float storage)
+    precision:   round floats to this many decimals before storing (lossy)
+    """
+    def __init__(self, f, compression=None, float32=False, precision=None):
+        if compression not in COMPRESSION:
+            raise ValueError(f"Unknown compression: {compression}")
+        self.f = f
+        self.float32 = float32
+        self.precision = precision
+        self.strings = {}
+        self.count = 0
+        self.offset = 0
+        code = COMPRESSION[compression]
+        self.compressor = _COMPRESSORS[code]() if code else None
+        f.write(MAGIC + struct.pack("<HBB", VERSION, code, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+    def _emit(self, data):
+        self.offset += len(data)
+        self.f.write(self.compressor.compress(bytes(data)) if self.compressor else data)
+
+    def _string(self, out, text):
+        index = self.strings.get(text)
+        if index is None:
+            index = self.strings[text] = len(self.strings)
+        _varint(out, index)
+
+    def _float(self, value):
+        return round(value, self.precision) if self.precision is not None else value
+
+    def _encode(self, out, value, key=None):
+        if value is None:
+            out.append(T_NONE)
+        elif value is True:
+            out.append(T_TRUE)
+        elif value is False:
+            out.append(T_FALSE)
+        elif isinstance(value, int):
+            out.append(T_INT)
+            _varint(out, value * 2 if value >= 0 else -value * 2 - 1)  # zigzag
+        elif isinstance(value, float):
+            if self.float32:
+                out.append(T_FLOAT32)
+                out += _F32.pack(self._float(value))
+            else:
+                out.append(T_FLOAT64)
+                out += _F64.pack(self._float(value))
+        elif isinstance(value, str):
+            if key is not None and key.endswith("path"):
+                folder, name = _split_path(value)
+                out.append(T_PATH)
+                self._string(out, folder)
+                self._string(out, name)
+            else:
+                out.append(T_STR)
+                self._string(out, value)
+        elif isinstance(value, (list, tuple)):
+            if len(value) > 1 and all(type(v) is float for v in value):
+                floats = [self._float(v) for v in value]
+                out.append(T_VEC32 if self.float32 else T_VEC64)
+                _varint(out, len(floats))
+                out += struct.pack(f"<{len(floats)}{'f' if self.float32 else 'd'}", *floats)
+            else:
+                out.append(T_LIST)
+                _varint(out, len(value))
+                for item in value:
+                    self._encode(out, item)
+        elif isinstance(value, dict):
+            out.append(T_DICT)
+            _varint(out, len(value))
+            for k, item in value.items():
+                self._string(out, k)
+                self._encode(out, item, k)
+        else:
+            raise TypeError(f"Cannot encode {type(value).__name__}")
+
+    def write(self, name, record):
+        out = bytearray([T_RECORD])
+        self._string(out, name)
+        self._encode(out, record)
+        self._emit(out)
+        self.count += 1
+
+    def close(self):
+        out = bytearray([T_END])
+        table_offset = self.offset + 1
+        _varint(out, len(self.strings))
+        for text in self.strings:
+            encoded = text.encode("utf-8")
+            _varint(out, len(encoded))
+            out += encoded
+        out += struct.pack("<Q", table_offset)
+        self._emit(out)
+        if self.compressor:
+            self.f.write(self.compressor.flush())
+
+
+class _Decoder:
+    """
+    Decodes values with one closure over the payload: locals instead of
+    attribute lookups, one-byte varints (nearly every string index and
+    count) read inline, and leaf values of dicts decoded without a call.
+    """
+    def __init__(self, payload):
+        self.data = payload
+        table_offset = struct.unpack_from("<Q", payload, len(payload) - 8)[0]
+        count, pos = _read_varint(payload, table_offset)
+        self.strings = []
+        for _ in range(count):
+            length, pos = _read_varint(payload, pos)
+            self.strings.append(payload[pos:pos + length].decode("utf-8"))
+            pos += length
+        self.value = self._value_reader()
+
+    def _value_reader(self):
+        data = self.data
+        strings = self.strings
+        read_varint = _read_varint
+        unpack_f64 = _F64.unpack_from
+        unpack_f32 = _F32.unpack_from
+        unpack_from = struct.unpack_from
+        constants = {T_NONE: None, T_TRUE: True, T_FALSE: False}
+
+        def value(pos):
+            tag = data[pos]
+            pos += 1
+            if tag == T_DICT:
+                count = data[pos]
+                if count < 0x80:
+                    pos += 1
+                else:
+                    count, pos = read_varint(data, pos)
+                result = {}
+                for _ in range(count):
+                    index = data[pos]
+                    if index < 0x80:
+                        pos += 1
+                    else:
+                        index, pos = read_varint(data, pos)
+                    tag = data[pos]
+                    if tag == T_STR:
+                        item = data[pos + 1]
+                        if item < 0x80:
+                            result[strings[index]] = strings[item]
+                            pos += 2
+                        else:
+                            item, pos = read_varint(data, pos + 1)
+                            result[strings[index]] = strings[item]
+                    elif tag == T_FLOAT64:
+                        result[strings[index]] = unpack_f64(data, pos + 1)[0]
+                        pos += 9
+                    elif tag in constants:
+                        result[strings[index]] = constants[tag]
+                        pos += 1
+                    else:
+                        result[strings[index]], pos = value(pos)
+                return result, pos
+            if tag == T_STR:
+                index, pos = read_varint(data, pos)
+                return strings[index], pos
+            if tag == T_LIST:
+                count, pos = read_varint(data, pos)
+                result = []
+                for _ in range(count):
+                    item, pos = value(pos)
+                    result.append(item)
+                return result, pos
+            if tag == T_FLOAT64:
+                return unpack_f64(data, pos)[0], pos + 8
+            if tag == T_FLOAT32:
+                return unpack_f32(data, pos)[0], pos + 4
+            if tag == T_VEC64 or tag == T_VEC32:
+                count, pos = read_varint(data, pos)
+                code, size = ("d", 8) if tag == T_VEC64 else ("f", 4)
+                return list(unpack_from(f"<{count}{code}", data, pos)), pos + count * size
+            if tag == T_INT:
+                raw, pos = read_varint(data, pos)
+                return (raw >> 1) ^ -(raw & 1), pos
+            if tag == T_PATH:
+                folder, pos = read_varint(data, pos)
+                name, pos = read_varint(data, pos)
+                return strings[folder] + strings[name], pos
+            if tag in constants:
+                return constants[tag], pos
+            raise ValueError(f"Corrupt material file: unknown tag {tag:#x} at {pos - 1}")
+
+        return value
+
+    def records(self):
+        pos = 0
+        while self.data[pos] == T_RECORD:
+            index, pos = _read_varint(self.data, pos + 1)
+            record, pos = self.value(pos)
+            yield self.strings[index], record
+        if self.data[pos] != T_END:
+            raise ValueError(f"Corrupt material file: expected end marker at {pos}")
+
+
+def is_binary(path):
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def iter_binary_materials(path):
+    """Yield (name, record) from a binary material file."""
+    with open(path, "rb") as f:
+        header = f.read(len(MAGIC) + 4)
+        payload = f.read()
+    if header[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"Not a binary material file: {path}")
+    version, compression, _ = struct.unpack_from("<HBB", header, len(MAGIC))
+    if version > VERSION:
+        raise ValueError(f"{path} uses format version {version}, this reader supports up to {VERSION}")
+    if compression not in (0,) + tuple(_DECOMPRESS):
+        raise ValueError(f"{path} uses unknown compression {compression}")
+    try:
+        if compression:
+            payload = _DECOMPRESS[compression](payload)
+        decoder = _Decoder(payload)
+        yield from decoder.records()
+    except (IndexError, struct.error, UnicodeDecodeError, zlib.error, lzma.LZMAError, OSError, EOFError) as e:
+        # Truncated or damaged payload (bz2 reports bad data as OSError)
+        raise ValueError(f"Corrupt material file {path}: {e}") from e
+
+
+# ------------------------------------------------
+# Synthetic scene and benchmark
+# ------------------------------------------------
+def synthetic_materials(count, seed=0):
+    """{name: record} shaped like the exporter's output: channels, image nodes, colours."""
+    import random
+    rng = random.Random(seed)
+    materials = {}
+    for i in range(count):
+        nodes = {}
+        for j in range(6):
+            nodes[f"node_{j}"] = {
+                "node_type": rng.choice(["Image Texture", "Mix", "Hue/Saturation/Value", "Normal Map"]),
+                "category": "Color Node",
+                "file_path": f"//textures/set_{i % 7}/tex_{j}.png",
+                "inputs": {
+                    "Fac": {"source_type": "default", "value": rng.random()},
+                    "Color1": {"source_type": "default", "value": [rng.random() for _ in range(4)]},
+                    "Color2": {"source_type": "node", "node_id": f"node_{j + 1}"},
+                },
+            }
+        channels = {
+            channel: ({"source_type": "default", "value": rng.random()} if k % 2
+                      else {"source_type": "node", "node_id": f"node_{k % 6}"})
+            for k, channel in enumerate(["Base Color", "Roughness", "Metallic", "Alpha", "Normal",
+                                         "Emission Color", "Emission Strength", "Subsurface Weight"])
+        }
+        materials[f"Material_{i:05d}"] = {"shader": "Principled BSDF", "channels": channels, "nodes": nodes}
+    return materials
+
+
+def benchmark(count, repeat=1, compression=None):
+    """(JSON bytes, binary bytes, json.loads seconds, binary decode seconds) for a synthetic scene."""
+    import io
+    import json
+    materials = synthetic_materials(count)
+    text = json.dumps(materials, separators=(",", ":"))
+    buffer = io.BytesIO()
+    writer = BinaryMaterialWriter(buffer, compression=compression)
+    with writer:
+        for name, record in materials.items():
+            writer.write(name, record)
+    raw = buffer.getvalue()
+    payload = raw[len(MAGIC) + 4:]
+    code = COMPRESSION[compression]
+
+    def decode():
+        return dict(_Decoder(_DECOMPRESS[code](payload) if code else payload).records())
+
+    if decode() != json.loads(text):
+        raise AssertionError("binary round trip differs from JSON")
+    timings = []
+    for func in (lambda: json.loads(text), decode):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings.append(best)
+    return len(text.encode("utf-8")), len(raw), timings[0], timings[1]
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Compare the binary material format with compact JSON.")
+    parser.add_argument("--materials", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    for count in args.materials:
+        for compression in (None, "zlib"):
+            json_size, size, json_time, time_taken = benchmark(count, args.repeat, compression)
+            print(f"{count:>6} materials, {compression or 'raw':>4}: {size / 1024:8.0f} KiB "
+                  f"({json_size / size:4.1f}x smaller than JSON), decode {time_taken * 1000:7.1f} ms "
+                  f"vs json.loads {json_time * 1000:7.1f} ms ({time_taken / json_time:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
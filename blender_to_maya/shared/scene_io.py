@@ -0,0 +1,242 @@
+# scene_io.py
+# Material file I/O shared by the Blender exporter and the Maya reader.
+import json
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+
+COMPACT_SEPARATORS = (",", ":")
+INDEX_VERSION = 2
+
+
+@contextmanager
+def atomic_open(path, mode="w", **kwargs):
+    """
+    open() for writing that leaves `path` as it was until the with block has
+    succeeded: the data goes to a temporary file in the same folder, which then
+    replaces `path`, or is deleted if anything went wrong.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                    prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        # mkstemp makes the file private; keep the permissions a plain open() would give
+        try:
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except OSError:
+            os.chmod(tmp_path, 0o644)
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class MaterialWriter:
+    """
+    Write materials one at a time, so a scene never has to be held in memory.
+
+    layout="json":  one {name: record, ...} object. With indent=4 the file is
+                    identical to json.dump(materials, f, indent=4); indent=None
+                    writes it without whitespace.
+    layout="jsonl": one {"name": ..., "material": ...} object per line.
+    echo:           also print every record as it is written (debugging).
+
+    `index` maps each material name to the [byte offset, byte length] of its
+    record, for write_index(). Offsets are only exact if `f` writes "\n"
+    untranslated, i.e. was opened with newline="\n".
+    """
+    def __init__(self, f, layout="json", indent=4, echo=False):
+        if layout not in ("json", "jsonl"):
+            raise ValueError(f"Unknown material layout: {layout}")
+        self.f = f
+        self.layout = layout
+        self.indent = indent
+        self.echo = echo
+        self.count = 0
+        self.offset = 0
+        self.index = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+    def _dumps(self, value):
+        if self.indent is None:
+            return json.dumps(value, separators=COMPACT_SEPARATORS)
+        return json.dumps(value, indent=self.indent)
+
+    def _emit(self, text):
+        self.f.write(text)
+        self.offset += len(text.encode("utf-8"))
+
+    def write(self, name, record):
+        if self.echo:
+            print(json.dumps({name: record}, indent=4))
+
+        if self.layout == "jsonl":
+            # Same bytes as json.dumps({"name": ..., "material": ...}) with compact separators
+            head = '{"name":' + json.dumps(name) + ',"material":'
+            body = json.dumps(record, separators=COMPACT_SEPARATORS)
+            tail = "}\n"
+        elif self.indent is None:
+            head = ("{" if self.count == 0 else ",") + json.dumps(name) + ":"
+            body = self._dumps(record)
+            tail = ""
+        else:
+            pad = " " * self.indent
+            head = ("{\n" if self.count == 0 else ",\n") + pad + json.dumps(name) + ": "
+            body = self._dumps(record).replace("\n", "\n" + pad)
+            tail = ""
+        self._emit(head)
+        start = self.offset
+        self._emit(body)
+        self.index[name] = [start, self.offset - start]
+        self._emit(tail)
+        self.count += 1
+
+    def close(self):
+        if self.layout == "jsonl":
+            return
+        if self.count == 0:
+            self._emit("{}")
+        else:
+            self._emit("}" if self.indent is None else "\n}")
+
+
+def iter_materials(path):
+    """Yield (name, record) from a material file in any layout (json, jsonl, binary)."""
+    from scene_binary import is_binary, iter_binary_materials
+    if is_binary(path):
+        yield from iter_binary_materials(path)
+    elif path.endswith(".jsonl"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    yield entry["name"], entry["material"]
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from json.load(f).items()
+
+
+def load_materials(path):
+    """Return {name: record} from a material file in any layout."""
+    return dict(iter_materials(path))
+
+
+# ------------------------------------------------
+# Offset index: read a few materials without parsing the whole file
+# ------------------------------------------------
+def index_path(path):
+    return os.path.splitext(path)[0] + ".index.json"
+
+
+def write_index(path, writer):
+    """Save the record offsets of a closed MaterialWriter next to the file it wrote."""
+    info = os.stat(path)
+    data = {
+        "version": INDEX_VERSION,
+        "file": os.path.basename(path),
+        "size": info.st_size,
+        "mtime_ns": info.st_mtime_ns,
+        "materials": writer.index,
+    }
+    with atomic_open(index_path(path), "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=COMPACT_SEPARATORS)
+
+
+def read_index(path):
+    """
+    Return {name: [offset, length]} for a material file, or None if it has no
+    index or the index does not belong to the file as it is now on disk.
+    """
+    try:
+        with open(index_path(path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != INDEX_VERSION or data.get("file") != os.path.basename(path):
+        return None
+    # A re-export of the same size has different offsets, so the time has to match too
+    info = os.stat(path)
+    if data.get("size") != info.st_size or data.get("mtime_ns") != info.st_mtime_ns:
+        print(f"Index of {path} is stale, ignoring it")
+        return None
+    return data["materials"]
+
+
+def _material_dependencies(record):
+    """Materials an entry needs to be built: the canonical of an alias, the template of an instance."""
+    return [record[key] for key in ("alias_of", "template") if key in record]
+
+
+def _read_indexed(path, index, names):
+    records = {}
+    with open(path, "rb") as f:
+        # In file order, so the reads move forward through the file
+        for name in sorted(names, key=lambda n: index[n][0]):
+            offset, length = index[name]
+            f.seek(offset)
+            records[name] = json.loads(f.read(length))
+    return records
+
+
+def _read_streamed(path, names):
+    return {name: record for name, record in iter_materials(path) if name in names}
+
+
+def load_selected_materials(path, names):
+    """
+    Return {name: record} for `names` plus the canonicals and templates they
+    refer to. With an index only those records are read from disk; otherwise
+    the file is streamed and everything else is dropped as it goes by.
+    Unknown names are reported and skipped.
+    """
+    index = read_index(path)
+    selected = {}
+    wanted = set(names)
+    while wanted:
+        if index is not None:
+            missing = {n for n in wanted if n not in index}
+            records = _read_indexed(path, index, wanted - missing)
+        else:
+            records = _read_streamed(path, wanted)
+            missing = wanted - set(records)
+        for name in sorted(missing):
+            print(f"Material not found in {path}: {name}")
+        selected.update(records)
+        wanted = {dep for record in records.values() for dep in _material_dependencies(record)} - set(selected)
+    return selected
+
+
+# ------------------------------------------------
+# Rename map: names as they were before blender_naming_convention
+# ------------------------------------------------
+def rename_map_path(path):
+    """<base>.rename_map.json next to an exported file (material file or FBX)."""
+    return os.path.splitext(path)[0] + ".rename_map.json"
+
+
+def load_rename_map(path, reverse=False):
+    """
+    {collection: {old name: exported name}} for an exported file, e.g.
+    map["materials"]["Wood.001"] == "Wood_001". With reverse=True the inner
+    dicts map exported names back to the original ones. {} without a map.
+    """
+    try:
+        with open(rename_map_path(path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    names = data.get("names", {})
+    if reverse:
+        return {attr: {new: old for old, new in pairs.items()} for attr, pairs in names.items()}
+    return names
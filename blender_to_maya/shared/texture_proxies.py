@@ -0,0 +1,190 @@
+# texture_proxies.py
+# Downsampled proxy levels of the scene's textures (1/2, 1/4, 1/8) and the
+# manifest that tells the exporter, and through the material JSON Maya, where
+# they are.
+#
+# Runs without Blender: blender_texture_proxies.py hands each image to
+# make_proxies() in a thread pool. Images are read and written with
+# OpenImageIO (bundled with Blender 3.5+) or Pillow, and halved with NumPy.
+import hashlib
+import json
+import os
+import threading
+
+MANIFEST_VERSION = 1
+LEVELS = (2, 4, 8)
+# No proxy level whose shorter side would drop below this many pixels
+MIN_PROXY_SIZE = 64
+
+_NUMPY_TO_OIIO = {"uint8": "UINT8", "uint16": "UINT16", "float16": "HALF", "float32": "FLOAT"}
+
+
+def proxy_levels(width, height, levels=LEVELS, min_size=MIN_PROXY_SIZE):
+    return [level for level in levels if min(width, height) // level >= min_size]
+
+
+def proxy_path(folder, source, level):
+    """<stem>_<hash of the source path>_<level><ext>, so same-named textures don't collide."""
+    stem, ext = os.path.splitext(os.path.basename(source))
+    key = hashlib.sha1(os.path.normcase(source).encode("utf-8")).hexdigest()[:8]
+    return os.path.join(folder, f"{stem}_{key}_{level}{ext}")
+
+
+def is_current(path, source):
+    try:
+        return os.path.getmtime(path) >= os.path.getmtime(source)
+    except OSError:
+        return False
+
+
+# ------------------------------------------------
+# Image I/O
+# ------------------------------------------------
+def image_info(path):
+    """(width, height, channels, bytes per channel), from the file header only."""
+    try:
+        import OpenImageIO as oiio
+    except ImportError:
+        from PIL import Image
+        with Image.open(path) as im:
+            depth = {"I;16": 2, "I": 4, "F": 4}.get(im.mode, 1)
+            return im.width, im.height, len(im.getbands()), depth
+    inp = oiio.ImageInput.open(path)
+    if inp is None:
+        raise OSError(f"Cannot open {path}: {oiio.geterror()}")
+    spec = inp.spec()
+    inp.close()
+    return spec.width, spec.height, spec.nchannels, spec.format.size()
+
+
+def read_pixels(path):
+    """Pixels as a (height, width, channels) array in the file's own data type."""
+    import numpy as np
+    try:
+        import OpenImageIO as oiio
+    except ImportError:
+        from PIL import Image
+        with Image.open(path) as im:
+            pixels = np.asarray(im)
+        return pixels[:, :, np.newaxis] if pixels.ndim == 2 else pixels
+    inp = oiio.ImageInput.open(path)
+    if inp is None:
+        raise OSError(f"Cannot open {path}: {oiio.geterror()}")
+    try:
+        return inp.read_image(inp.spec().format)
+    finally:
+        inp.close()
+
+
+def write_pixels(path, pixels):
+    try:
+        import OpenImageIO as oiio
+    except ImportError:
+        from PIL import Image
+        Image.fromarray(pixels[:, :, 0] if pixels.shape[2] == 1 else pixels).save(path)
+        return
+    height, width, channels = pixels.shape
+    fmt = getattr(oiio, _NUMPY_TO_OIIO.get(pixels.dtype.name, "FLOAT"))
+    out = oiio.ImageOutput.create(path)
+    if out is None:
+        raise OSError(f"Cannot write {path}: {oiio.geterror()}")
+    out.open(path, oiio.ImageSpec(width, height, channels, fmt))
+    out.write_image(pixels)
+    out.close()
+
+
+def halve(pixels):
+    """2x2 box filter; an odd last row/column is dropped."""
+    import numpy as np
+    height, width = pixels.shape[0] // 2, pixels.shape[1] // 2
+    blocks = pixels[:height * 2, :width * 2].reshape(height, 2, width, 2, -1)
+    out = blocks.mean(axis=(1, 3), dtype=np.float32)
+    if np.issubdtype(pixels.dtype, np.integer):
+        out = np.rint(out)
+    return out.astype(pixels.dtype)
+
+
+# ------------------------------------------------
+# Worker
+# ------------------------------------------------
+def make_proxies(source, folder, levels=LEVELS, min_size=MIN_PROXY_SIZE):
+    """
+    Write the proxy levels of one image that are missing or older than the source.
+    Returns {"size", "bytes" (uncompressed, full resolution), "proxies" {level: path}, "generated"}.
+    """
+    width, height, channels, depth = image_info(source)
+    targets = {level: proxy_path(folder, source, level) for level in proxy_levels(width, height, levels, min_size)}
+    stale = [level for level, path in targets.items() if not is_current(path, source)]
+    if stale:
+        os.makedirs(folder, exist_ok=True)
+        pixels, current = read_pixels(source), 1
+        for level in sorted(targets):
+            if level > max(stale):
+                break
+            while current < level:
+                pixels, current = halve(pixels), current * 2
+            if level in stale:
+                # Extension last so the writer picks the format; pid and thread so
+                # two exports sharing a proxy folder never write the same temp file
+                stem, ext = os.path.splitext(targets[level])
+                tmp_path = f"{stem}.{os.getpid()}.{threading.get_ident()}.tmp{ext}"
+                try:
+                    write_pixels(tmp_path, pixels)
+                    os.replace(tmp_path, targets[level])
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+    return {
+        "size": [width, height],
+        "bytes": width * height * channels * depth,
+        "proxies": {str(level): path for level, path in targets.items()},
+        "generated": len(stale),
+    }
+
+
+# ------------------------------------------------
+# Budget and manifest
+# ------------------------------------------------
+def effective_level(level, entry):
+    """The requested level, or the closest one the image has (full size = 1)."""
+    return max([1] + [int(l) for l in entry["proxies"] if int(l) <= level])
+
+
+def scene_bytes(entries, level):
+    return sum(e["bytes"] // effective_level(level, e) ** 2 for e in entries.values())
+
+
+def choose_level(entries, budget_bytes, levels=(1,) + LEVELS):
+    """The sharpest scene-wide level whose texture memory fits the budget (else the smallest one)."""
+    for level in levels:
+        if scene_bytes(entries, level) <= budget_bytes:
+            return level
+    return levels[-1]
+
+
+def write_manifest(path, entries, level, budget_bytes):
+    for entry in entries.values():
+        entry["level"] = effective_level(level, entry)
+    data = {
+        "version": MANIFEST_VERSION,
+        "budget_bytes": budget_bytes,
+        "level": level,
+        "scene_bytes": {str(l): scene_bytes(entries, l) for l in (1,) + LEVELS},
+        "images": entries,
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4, sort_keys=True)
+
+
+def read_manifest(path):
+    """{source path: entry} from a manifest, or {} if there is none."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data["images"]
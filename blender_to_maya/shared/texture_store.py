@@ -0,0 +1,226 @@
+# texture_store.py
+# Content-addressed texture store shared by every export.
+#
+#   <store>/objects/ab/ab12...ef.png   one file per distinct content (sha256 + extension)
+#   <store>/refs/<key>.json            the objects one exported .blend uses
+#   <store>/hash_cache.json            sha256 of source files, keyed by size and mtime
+#
+# Exports point their images at the objects, so a studio library texture used
+# by a hundred scenes exists once on disk and is one texture to Maya's cache.
+# Objects are read-only copies. They are never hardlinks to a source: an in-place
+# save of the source would rewrite the object under every export using it.
+#
+#   python texture_store.py //server/texture_store stats
+#   python texture_store.py //server/texture_store prune [--dry-run]
+#
+# Run prune while no export is writing to the store.
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import stat
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+STORE_ENV = "B2M_TEXTURE_STORE"
+CACHE_VERSION = 1
+READ_ONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4)
+    os.replace(tmp_path, path)
+
+
+class TextureStore:
+    def __init__(self, root, workers=None):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.refs_dir = os.path.join(root, "refs")
+        self.cache_path = os.path.join(root, "hash_cache.json")
+        self.workers = workers or min(8, (os.cpu_count() or 1) * 2)
+        self._lock = threading.Lock()
+        self._cache = self._load_cache()
+        self._cache_dirty = False
+
+    # ------------------------------------------------
+    # Hash cache
+    # ------------------------------------------------
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data["files"] if data.get("version") == CACHE_VERSION else {}
+
+    def save_cache(self):
+        """Merge with what other exports saved meanwhile, then write."""
+        if not self._cache_dirty:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        merged = self._load_cache()
+        merged.update(self._cache)
+        _write_json(self.cache_path, {"version": CACHE_VERSION, "files": merged})
+        self._cache_dirty = False
+
+    def digest(self, path):
+        """sha256 of a file, from the cache while its size and mtime are unchanged."""
+        stat = os.stat(path)
+        key = os.path.normcase(os.path.abspath(path))
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        value = digest.hexdigest()
+        with self._lock:
+            self._cache[key] = [stat.st_size, stat.st_mtime_ns, value]
+            self._cache_dirty = True
+        return value
+
+    # ------------------------------------------------
+    # Objects
+    # ------------------------------------------------
+    def object_path(self, digest, ext):
+        return os.path.join(self.objects_dir, digest[:2], digest + ext.lower())
+
+    def _materialize(self, source, target):
+        """Copy a source to its object path, read-only, unless the object exists."""
+        how = "copied"
+        try:
+            if os.stat(target).st_nlink == 1:
+                return "existing"
+            # Hardlinked to a source by an older store, so not safe from edits to it
+            os.chmod(target, stat.S_IWUSR | READ_ONLY)
+            how = "unlinked"
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_path = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            shutil.copy2(source, tmp_path)
+            os.chmod(tmp_path, READ_ONLY)
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.chmod(tmp_path, stat.S_IWUSR | READ_ONLY)
+                os.remove(tmp_path)
+            raise
+        return how
+
+    def plan(self, paths):
+        """Hash files in the thread pool. Returns {source path: object path}."""
+        paths = list(dict.fromkeys(paths))
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            digests = dict(zip(paths, pool.map(self.digest, paths)))
+        self.save_cache()
+        return {p: self.object_path(d, os.path.splitext(p)[1]) for p, d in digests.items()}
+
+    def materialize(self, targets):
+        """
+        Create the objects of a plan(). Returns counts per outcome.
+        Write the ref first, so a prune never sees new objects unreferenced.
+        """
+        counts = {"existing": 0, "copied": 0, "unlinked": 0}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for how in pool.map(self._materialize, targets.keys(), targets.values()):
+                counts[how] += 1
+        return counts
+
+    # ------------------------------------------------
+    # Refs and pruning
+    # ------------------------------------------------
+    @staticmethod
+    def ref_key(owner):
+        return hashlib.sha1(os.path.normcase(os.path.abspath(owner)).encode("utf-8")).hexdigest()[:16]
+
+    def write_ref(self, key, owner, object_paths):
+        os.makedirs(self.refs_dir, exist_ok=True)
+        _write_json(os.path.join(self.refs_dir, key + ".json"), {
+            "owner": owner,
+            "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "objects": sorted({os.path.relpath(p, self.objects_dir) for p in object_paths}),
+        })
+
+    def iter_objects(self):
+        if not os.path.isdir(self.objects_dir):
+            return
+        for folder in os.scandir(self.objects_dir):
+            if folder.is_dir():
+                for entry in os.scandir(folder.path):
+                    if entry.is_file() and not entry.name.endswith(".tmp"):
+                        yield entry
+
+    def prune(self, dry_run=False):
+        """
+        Delete objects no ref uses, and refs whose .blend no longer exists.
+        Returns (number of objects removed, bytes freed).
+        """
+        # Objects are listed before the refs are read, so one added meanwhile is never removed
+        objects = list(self.iter_objects())
+        used = set()
+        if os.path.isdir(self.refs_dir):
+            for entry in os.scandir(self.refs_dir):
+                try:
+                    with open(entry.path, "r", encoding="utf-8") as f:
+                        ref = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                if ref.get("owner") and not os.path.exists(ref["owner"]):
+                    print(f"Stale ref ({ref['owner']} is gone): {entry.name}")
+                    if not dry_run:
+                        os.remove(entry.path)
+                    continue
+                used.update(os.path.normcase(p) for p in ref["objects"])
+
+        removed, freed = 0, 0
+        for entry in objects:
+            rel = os.path.normcase(os.path.relpath(entry.path, self.objects_dir))
+            if rel in used:
+                continue
+            size = entry.stat().st_size
+            print(f"{'Would remove' if dry_run else 'Removing'}: {rel} ({size / 1048576:.1f} MiB)")
+            if not dry_run:
+                # Objects are read-only, which blocks deleting them on Windows
+                os.chmod(entry.path, stat.S_IWUSR | READ_ONLY)
+                os.remove(entry.path)
+            removed += 1
+            freed += size
+        return removed, freed
+
+    def stats(self):
+        count, size = 0, 0
+        for entry in self.iter_objects():
+            count += 1
+            size += entry.stat().st_size
+        refs = len(os.listdir(self.refs_dir)) if os.path.isdir(self.refs_dir) else 0
+        return {"objects": count, "bytes": size, "refs": refs}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the shared texture store.")
+    parser.add_argument("store", help="store directory")
+    parser.add_argument("command", choices=["stats", "prune"])
+    parser.add_argument("--dry-run", action="store_true", help="prune: only list what would be removed")
+    args = parser.parse_args(argv)
+
+    store = TextureStore(args.store)
+    if args.command == "stats":
+        stats = store.stats()
+        print(f"{stats['objects']} objects, {stats['bytes'] / 1048576:.1f} MiB, {stats['refs']} refs")
+    else:
+        removed, freed = store.prune(args.dry_run)
+        print(f"{'Would remove' if args.dry_run else 'Removed'} {removed} objects, {freed / 1048576:.1f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
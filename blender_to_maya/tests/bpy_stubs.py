@@ -0,0 +1,145 @@
+# bpy_stubs.py
+# Stand-ins for bpy node trees, for tests that run without Blender.
+#
+# Like bpy, every attribute access returns a new wrapper object, and wrappers
+# compare and hash by the data they point at. Code that compares sockets or
+# nodes with `is` therefore fails here as it would in Blender. socket.links and
+# socket.is_linked scan every link of the tree, as Blender does; tree.links
+# counts how often it is iterated.
+import types
+
+
+class Data:
+    """Plain data behind one struct; a node, socket, link, tree or material."""
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+
+
+class CountingList(list):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.iterations = 0
+
+    def __iter__(self):
+        self.iterations += 1
+        return super().__iter__()
+
+
+def wrap(value):
+    if isinstance(value, Data):
+        return Struct(value)
+    if isinstance(value, list):
+        return Collection(value)
+    return value
+
+
+class Struct:
+    __slots__ = ("_data",)
+
+    def __init__(self, data):
+        object.__setattr__(self, "_data", data)
+
+    def __getattr__(self, name):
+        if name == "links" and hasattr(self._data, "is_output"):
+            return [wrap(l) for l in self._data.node.tree.links
+                    if (l.from_socket if self._data.is_output else l.to_socket) is self._data]
+        if name == "is_linked" and hasattr(self._data, "is_output"):
+            return bool(self.links)
+        try:
+            return wrap(getattr(self._data, name))
+        except AttributeError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        setattr(self._data, name, value._data if isinstance(value, Struct) else value)
+
+    def __eq__(self, other):
+        return isinstance(other, Struct) and other._data is self._data
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return id(self._data)
+
+    def __repr__(self):
+        return f"<{getattr(self._data, 'name', '?')}>"
+
+
+class Collection:
+    """bpy_prop_collection: index by position or name, new wrappers on every access."""
+    def __init__(self, items):
+        self._items = items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return (wrap(item) for item in self._items)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return wrap(next(item for item in self._items if item.name == key))
+        return wrap(self._items[key])
+
+    def remove(self, struct):
+        self._items.remove(struct._data)
+        if hasattr(struct._data, "inputs"):
+            tree = struct._data.tree
+            tree.links[:] = [l for l in tree.links
+                             if l.from_node is not struct._data and l.to_node is not struct._data]
+
+    def new(self, from_socket, to_socket):
+        link = Data(from_node=from_socket._data.node, from_socket=from_socket._data,
+                    to_node=to_socket._data.node, to_socket=to_socket._data)
+        tree = from_socket._data.node.tree
+        tree.links[:] = [l for l in tree.links if l.to_socket is not to_socket._data] + [link]
+        return wrap(link)
+
+
+class Tree:
+    """Builds the data of one node tree; tree.material is the bpy-like material."""
+    def __init__(self, name="Material"):
+        self.data = Data(nodes=[], links=CountingList())
+        self.data.links.iterations = 0
+        self.material = Struct(Data(name=name, use_nodes=True, users=1, node_tree=self.data))
+
+    def node(self, node_type, name, inputs=(), outputs=(), **attrs):
+        """inputs/outputs: (name, default value) pairs. Returns the node data."""
+        node = Data(name=name, type=node_type, tree=self.data, **attrs)
+        node.inputs = [Data(name=n, default_value=v, enabled=True, is_output=False, node=node) for n, v in inputs]
+        node.outputs = [Data(name=n, default_value=v, enabled=True, is_output=True, node=node) for n, v in outputs]
+        self.data.nodes.append(node)
+        return node
+
+    def link(self, from_node, output, to_node, input):
+        """Link by socket name or index."""
+        def find(sockets, key):
+            return sockets[key] if isinstance(key, int) else next(s for s in sockets if s.name == key)
+        self.data.links.append(Data(from_node=from_node, from_socket=find(from_node.outputs, output),
+                                    to_node=to_node, to_socket=find(to_node.inputs, input)))
+
+    def output(self, name="Material Output"):
+        return self.node("OUTPUT_MATERIAL", name, [("Surface", None)], is_active_output=True)
+
+    def principled(self, name="Principled BSDF"):
+        return self.node("BSDF_PRINCIPLED", name,
+                         [("Base Color", [0.8, 0.8, 0.8, 1.0]), ("Roughness", 0.5), ("Normal", None)],
+                         [("BSDF", None)])
+
+    def color(self, name):
+        return self.node("RGB", name, outputs=[("Color", [1.0, 1.0, 1.0, 1.0])])
+
+    def hue_saturation(self, name):
+        return self.node("HUE_SAT", name, [("Fac", 1.0), ("Color", [0.8, 0.8, 0.8, 1.0])], [("Color", None)])
+
+    def mix(self, name, factor, clamp_factor=True):
+        return self.node("MIX", name, [("Factor", factor), ("A", [0.0] * 4), ("B", [1.0] * 4)],
+                         [("Result", None)], blend_type="MIX", data_type="RGBA", clamp_factor=clamp_factor)
+
+
+def fake_bpy(materials=()):
+    """A bpy module with just bpy.data.materials."""
+    module = types.ModuleType("bpy")
+    module.data = types.SimpleNamespace(materials=list(materials), filepath="")
+    return module
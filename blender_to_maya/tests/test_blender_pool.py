@@ -0,0 +1,82 @@
+# test_blender_pool.py
+# BlenderWorkerPool with stub workers (blender_worker.py --stub, run with this
+# Python): a .blend named *crash* kills its worker, *slow* sleeps, *fail*
+# reports a failed stage. No Blender needed.
+#
+#   python -m pytest tests
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if os.path.join(PACKAGE_DIR, "shared") not in sys.path:
+    sys.path.insert(0, os.path.join(PACKAGE_DIR, "shared"))
+
+from blender_pool import BlenderWorkerPool, WorkerError
+
+
+class BlenderPoolTest(unittest.TestCase):
+    def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+        self.blends = {}
+        for name in ("scene", "crash", "slow", "fail"):
+            self.blends[name] = os.path.join(self._folder.name, f"{name}.blend")
+            open(self.blends[name], "wb").close()
+
+    def tearDown(self):
+        self._folder.cleanup()
+
+    def pool(self, **options):
+        options = dict(dict(size=1, stub=True, startup_timeout=30, respawn_backoff=0.1), **options)
+        return BlenderWorkerPool(**options)
+
+    def test_job(self):
+        with self.pool() as pool:
+            reply = pool.run(self.blends["scene"], stages=["fbx_export"])
+            self.assertTrue(reply["ok"])
+            self.assertEqual(reply["blend"], self.blends["scene"])
+            failed = pool.run(self.blends["fail"])
+            self.assertFalse(failed["ok"])
+            self.assertEqual(failed["failures"], ["stub_stage"])
+            self.assertEqual(failed["pid"], reply["pid"])
+
+    def test_crash_is_replaced_in_the_background(self):
+        with self.pool() as pool:
+            first = pool.run(self.blends["scene"])["pid"]
+            with self.assertRaisesRegex(WorkerError, "crashed"):
+                pool.run(self.blends["crash"])
+            reply = pool.run(self.blends["scene"])
+            self.assertTrue(reply["ok"])
+            self.assertNotEqual(reply["pid"], first)
+
+    def test_timeout(self):
+        with self.pool(job_timeout=0.5) as pool:
+            first = pool.run(self.blends["scene"])["pid"]
+            start = time.perf_counter()
+            with self.assertRaisesRegex(WorkerError, "Timed out"):
+                pool.run(self.blends["slow"], seconds=30)
+            self.assertLess(time.perf_counter() - start, 10)
+            reply = pool.run(self.blends["scene"])
+            self.assertTrue(reply["ok"])
+            self.assertNotEqual(reply["pid"], first)
+
+    def test_recycled_after_max_jobs(self):
+        with self.pool(max_jobs=2) as pool:
+            pids = [pool.run(self.blends["scene"])["pid"] for _ in range(4)]
+        self.assertEqual(pids[0], pids[1])
+        self.assertEqual(pids[2], pids[3])
+        self.assertNotEqual(pids[1], pids[2])
+
+    def test_no_workers_left_raises(self):
+        with self.pool(respawn_retries=2) as pool:
+            pool.worker_script = os.path.join(self._folder.name, "missing_worker.py")
+            with self.assertRaises(WorkerError):
+                pool.run(self.blends["crash"])
+            with self.assertRaisesRegex(WorkerError, "No Blender workers left"):
+                pool.run(self.blends["scene"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+# test_delete_unused_data.py
+# DeleteFloatingNodes on stand-in node trees (tests/bpy_stubs.py), whose nodes
+# and sockets are new wrapper objects on every access, as in Blender.
+#
+#   python -m pytest tests
+import os
+import sys
+import unittest
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in ("blender_scripts", "tests"):
+    if os.path.join(PACKAGE_DIR, path) not in sys.path:
+        sys.path.insert(0, os.path.join(PACKAGE_DIR, path))
+
+from bpy_stubs import Tree, fake_bpy
+
+
+def mix_material(factor, clamp_factor=True, name="Material"):
+    """Output <- Principled <- Mix(factor); A <- HSV_A <- RGB_A, B <- HSV_B <- RGB_B."""
+    tree = Tree(name)
+    out, principled = tree.output(), tree.principled()
+    mix = tree.mix("Mix", factor, clamp_factor)
+    tree.link(principled, 0, out, "Surface")
+    tree.link(mix, 0, principled, "Base Color")
+    for side in ("A", "B"):
+        rgb, hsv = tree.color(f"RGB_{side}"), tree.hue_saturation(f"HSV_{side}")
+        tree.link(rgb, 0, hsv, "Color")
+        tree.link(hsv, 0, mix, side)
+    return tree
+
+
+class CleanerTestCase(unittest.TestCase):
+    def setUp(self):
+        self._saved = sys.modules.get("bpy")
+        sys.modules["bpy"] = fake_bpy()
+        sys.modules.pop("blender_delete_unused_data", None)
+        import blender_delete_unused_data
+        self.cleaner = blender_delete_unused_data.DeleteFloatingNodes
+
+    def tearDown(self):
+        if self._saved is None:
+            sys.modules.pop("bpy", None)
+        else:
+            sys.modules["bpy"] = self._saved
+        sys.modules.pop("blender_delete_unused_data", None)
+
+    def dead(self, tree):
+        nodes, inputs = self.cleaner.find_dead(tree.material)
+        return sorted(n.name for n in nodes), [(s.node.name, s.name) for s in inputs]
+
+
+class ConstantMixTest(CleanerTestCase):
+    def test_wrappers_are_distinct_but_equal(self):
+        mix = mix_material(0.0).material.node_tree.nodes["Mix"]
+        self.assertIsNot(mix.inputs[1], mix.inputs[1])
+        self.assertEqual(mix.inputs[1], mix.inputs[1])
+
+    def test_factor_zero_drops_b(self):
+        self.assertEqual(self.dead(mix_material(0.0)), (["HSV_B", "RGB_B"], [("Mix", "B")]))
+
+    def test_factor_one_drops_a(self):
+        self.assertEqual(self.dead(mix_material(1.0)), (["HSV_A", "RGB_A"], [("Mix", "A")]))
+
+    def test_factor_between_keeps_both(self):
+        self.assertEqual(self.dead(mix_material(0.5)), ([], []))
+
+    def test_unclamped_factor_past_one_keeps_both(self):
+        self.assertEqual(self.dead(mix_material(1.5, clamp_factor=False)), ([], []))
+        self.assertEqual(self.dead(mix_material(1.5, clamp_factor=True)), (["HSV_A", "RGB_A"], [("Mix", "A")]))
+
+    def test_remove_dead_unlinks_and_removes(self):
+        tree = mix_material(0.0)
+        names, links = self.cleaner.remove_dead(tree.material)
+        self.assertEqual(sorted(names), ["HSV_B", "RGB_B"])
+        self.assertEqual(links, 2)
+        node_tree = tree.material.node_tree
+        self.assertEqual(sorted(n.name for n in node_tree.nodes),
+                         ["HSV_A", "Material Output", "Mix", "Principled BSDF", "RGB_A"])
+        self.assertFalse(node_tree.nodes["Mix"].inputs["B"].is_linked)
+        self.assertEqual(self.dead(tree), ([], []))
+
+
+class ProbeTest(CleanerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.trees = [mix_material(0.0, name="Const"), mix_material(0.5, name="Half")]
+        sys.modules["bpy"].data.materials[:] = [tree.material for tree in self.trees]
+        self.walked = []
+        find_dead = self.cleaner.find_dead
+
+        def counting(mat, graph=None):
+            self.walked.append(mat.name)
+            return find_dead(mat, graph)
+        self.cleaner.find_dead = staticmethod(counting)
+
+    def test_clean_all_reuses_the_probe(self):
+        probe = self.cleaner()
+        self.assertTrue(probe.has_work())
+        self.assertEqual(len(self.walked), 1)
+        report = self.cleaner.clean_all(probe)
+        self.assertEqual(len(self.walked), 2)
+        self.assertEqual(sorted(report["Const"]["nodes"]), ["HSV_B", "RGB_B"])
+
+    def test_probe_state_is_per_instance(self):
+        self.cleaner().has_work()
+        self.assertFalse(hasattr(self.cleaner, "probed"))
+        self.cleaner.clean_all()
+        self.assertEqual(len(self.walked), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
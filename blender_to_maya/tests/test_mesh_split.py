@@ -0,0 +1,107 @@
+# test_mesh_split.py
+# plan_split() against plan_split_reference(), the per-face loop with the same
+# rules, on small synthetic grids and hand-built meshes. Needs NumPy (bundled
+# with Blender); skipped without it.
+#
+#   python -m pytest tests
+import os
+import sys
+import unittest
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if os.path.join(PACKAGE_DIR, "shared") not in sys.path:
+    sys.path.insert(0, os.path.join(PACKAGE_DIR, "shared"))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from mesh_split import grid_mesh, plan_split, plan_split_reference, same_plan
+
+
+def both(mesh):
+    return plan_split(**mesh), plan_split_reference(**mesh)
+
+
+@unittest.skipIf(np is None, "needs NumPy")
+class PlanSplitTest(unittest.TestCase):
+    def assertSamePlan(self, mesh, msg=None):
+        fast, reference = both(mesh)
+        self.assertTrue(same_plan(fast, reference), msg)
+        return fast
+
+    def test_grids(self):
+        for faces in (1, 4, 9, 36, 100):
+            for materials in (1, 2, 3, 5):
+                for loose in (0, 1, 3):
+                    for seed in (0, 1):
+                        with self.subTest(faces=faces, materials=materials, loose=loose, seed=seed):
+                            self.assertSamePlan(grid_mesh(faces, materials, loose=loose, seed=seed))
+
+    def test_single_material_keeps_everything(self):
+        mesh = grid_mesh(16, 1, loose=2)
+        pieces = self.assertSamePlan(mesh)
+        self.assertEqual(len(pieces), 1)
+        piece = pieces[0]
+        self.assertTrue(np.array_equal(piece.faces, np.arange(16)))
+        self.assertTrue(np.array_equal(piece.loops, np.arange(64)))
+        self.assertTrue(np.array_equal(piece.edges, np.arange(len(mesh["edge_verts"]))))
+        self.assertTrue(np.array_equal(piece.verts, np.arange(mesh["vert_count"])))
+
+    def test_non_contiguous_material_ids(self):
+        for ids in ((0, 5, 9), (9, 0, 5), (3, 300, 7)):
+            mesh = grid_mesh(36, 3, loose=2, seed=4)
+            mesh["material_index"] = np.array(ids, dtype=np.int32)[mesh["material_index"]]
+            with self.subTest(ids=ids):
+                pieces = self.assertSamePlan(mesh)
+                order = list(dict.fromkeys(int(m) for m in mesh["material_index"]))
+                self.assertEqual([piece.material_index for piece in pieces], order)
+
+    def test_loose_geometry_stays_with_last_piece(self):
+        mesh = grid_mesh(9, 3, loose=2, seed=2)
+        pieces = self.assertSamePlan(mesh)
+        face_verts = 16
+        loose_verts = np.arange(face_verts, mesh["vert_count"])
+        for piece in pieces[:-1]:
+            self.assertFalse(np.isin(loose_verts, piece.verts).any())
+        self.assertTrue(np.isin(loose_verts, pieces[-1].verts).all())
+        loose_edges = np.arange(len(mesh["edge_verts"]) - 2, len(mesh["edge_verts"]))
+        self.assertTrue(np.isin(loose_edges, pieces[-1].edges).all())
+
+    def test_mixed_polygons(self):
+        # Triangle 0-1-2 and quad 1-3-4-2 share edge 1-2; a pentagon 3-5-6-7-4 shares edge 3-4
+        corners = [[0, 1, 2], [1, 3, 4, 2], [3, 5, 6, 7, 4]]
+        edges = []
+        for face in corners:
+            for pair in zip(face, face[1:] + face[:1]):
+                key = tuple(sorted(pair))
+                if key not in edges:
+                    edges.append(key)
+        loop_vert = [v for face in corners for v in face]
+        loop_edge = [edges.index(tuple(sorted(pair))) for face in corners for pair in zip(face, face[1:] + face[:1])]
+        mesh = {
+            "material_index": np.array([2, 0, 2], dtype=np.int32),
+            "loop_start": np.array([0, 3, 7], dtype=np.int32),
+            "loop_total": np.array([3, 4, 5], dtype=np.int32),
+            "loop_vert": np.array(loop_vert, dtype=np.int32),
+            "loop_edge": np.array(loop_edge, dtype=np.int32),
+            "edge_verts": np.array(edges, dtype=np.int32),
+            "vert_count": 8,
+        }
+        first, last = self.assertSamePlan(mesh)
+        self.assertEqual((first.material_index, last.material_index), (2, 0))
+        self.assertEqual(first.faces.tolist(), [0, 2])
+        self.assertEqual(first.loop_start.tolist(), [0, 3])
+        self.assertEqual(first.verts.tolist(), [0, 1, 2, 3, 4, 5, 6, 7])
+        self.assertEqual(last.verts.tolist(), [1, 2, 3, 4])
+        self.assertEqual(last.loop_vert.tolist(), [0, 2, 3, 1])
+
+    def test_no_faces(self):
+        mesh = grid_mesh(4, 2)
+        mesh["material_index"] = mesh["material_index"][:0]
+        self.assertEqual(both(mesh), ([], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+# test_naming_convention.py
+# MayaNamingConvention without Blender: the remembered suffix counters give the
+# same names as probing _01, _02, ... from the start, and the two-phase rename
+# ends on the planned names even where Blender would add a .001 suffix.
+#
+#   python -m pytest tests
+import json
+import os
+import random
+import sys
+import tempfile
+import types
+import unittest
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in ("blender_scripts", "shared"):
+    if os.path.join(PACKAGE_DIR, path) not in sys.path:
+        sys.path.insert(0, os.path.join(PACKAGE_DIR, path))
+
+from scene_io import load_rename_map
+
+
+def linear_unique(name, existing_names):
+    """ensure_unique before the counters: probe from _01 on every collision."""
+    if name not in existing_names:
+        existing_names.add(name)
+        return name
+    counter = 1
+    new_name = f"{name}_{counter:02d}"
+    while new_name in existing_names:
+        counter += 1
+        new_name = f"{name}_{counter:02d}"
+    existing_names.add(new_name)
+    return new_name
+
+
+class Block:
+    """An ID datablock whose name setter resolves a taken name like Blender (Name.001)."""
+    def __init__(self, collection, name):
+        self._collection = collection
+        self._name = name
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        taken = {block._name for block in self._collection if block is not self}
+        name, i = value, 0
+        while name in taken:
+            i += 1
+            name = f"{value}.{i:03d}"
+        self._name = name
+
+
+def blocks(names):
+    collection = []
+    collection.extend(Block(collection, name) for name in names)
+    return collection
+
+
+# Names that sanitize to the same base, some already carrying a _NN suffix
+NAMES = ["Part", "Part 1", "Part_01", "part-01", "1Part", "Part.001", "Part_02", "Part_01_01",
+         "Bolt M6", "Bolt_M6", "Bolt_M6_02", "Bolt-M6", "__x", "x", "Écrou", "", "_"]
+
+
+def colliding_names(rnd, count):
+    names = [rnd.choice(NAMES) + (f".{rnd.randrange(5):03d}" if rnd.random() < 0.3 else "") for _ in range(count)]
+    return list(dict.fromkeys(names + [f"Part#{i}" for i in range(count)]))
+
+
+class NamingTestCase(unittest.TestCase):
+    def setUp(self):
+        self._saved = sys.modules.get("bpy")
+        sys.modules["bpy"] = types.ModuleType("bpy")
+        sys.modules.pop("blender_naming_convention", None)
+        import blender_naming_convention
+        self.module = blender_naming_convention
+        self.naming = blender_naming_convention.MayaNamingConvention
+        self.scene([])
+
+    def tearDown(self):
+        if self._saved is None:
+            sys.modules.pop("bpy", None)
+        else:
+            sys.modules["bpy"] = self._saved
+        sys.modules.pop("blender_naming_convention", None)
+
+    def scene(self, object_names, filepath=""):
+        bpy = sys.modules["bpy"]
+        bpy.data = types.SimpleNamespace(filepath=filepath)
+        for attr in self.module.DATA_BLOCKS.values():
+            setattr(bpy.data, attr, blocks([]))
+        bpy.data.objects = blocks(object_names)
+        return bpy.data.objects
+
+
+class EnsureUniqueTest(NamingTestCase):
+    def test_counters_match_linear_probing(self):
+        rnd = random.Random(7)
+        for _ in range(50):
+            bases = [rnd.choice(["A", "A_01", "A_02", "A_01_01", "B", "B_03"]) for _ in range(rnd.randrange(1, 60))]
+            existing, reference = set(), set()
+            counters = {}
+            got = [self.naming.ensure_unique(base, existing, counters) for base in bases]
+            self.assertEqual(got, [linear_unique(base, reference) for base in bases], bases)
+            self.assertEqual(existing, reference)
+
+    def test_existing_suffixed_names_are_skipped(self):
+        existing, counters = {"X", "X_01", "X_03"}, {}
+        got = [self.naming.ensure_unique("X", existing, counters) for _ in range(3)]
+        self.assertEqual(got, ["X_02", "X_04", "X_05"])
+        self.assertEqual(counters, {"X": 5})
+
+    def test_clean_name(self):
+        clean = self.naming.clean_name
+        self.assertEqual(clean("Part_01"), "Part_01")
+        self.assertEqual(clean("Bolt M6.001"), "Bolt_M6_001")
+        self.assertEqual(clean("__Part--1__"), "Part_1")
+        self.assertEqual(clean("1Part", prefix="obj"), "obj_1Part")
+        self.assertEqual(clean("", prefix="mat"), "mat_")
+        self.assertEqual(clean("Écrou"), "crou")
+        self.assertEqual(clean("Part_"), "Part")
+
+
+class PlannedRenamesTest(NamingTestCase):
+    def reference_plan(self, names):
+        existing, plan = set(), []
+        for old_name in names:
+            new_name = linear_unique(self.naming.clean_name(old_name, prefix="obj"), existing)
+            if old_name != new_name:
+                plan.append((old_name, new_name))
+        return plan
+
+    def test_plan_matches_linear_probing(self):
+        rnd = random.Random(3)
+        for count in (10, 200):
+            names = colliding_names(rnd, count)
+            self.scene(names)
+            plan = [(old, new) for _, _, old, new in self.naming().planned_renames()]
+            self.assertEqual(plan, self.reference_plan(names))
+
+
+class RenameAllTest(NamingTestCase):
+    def setUp(self):
+        super().setUp()
+        self._folder = tempfile.TemporaryDirectory()
+        self.blend = os.path.join(self._folder.name, "scene.blend")
+
+    def tearDown(self):
+        self._folder.cleanup()
+        super().tearDown()
+
+    def test_one_pass_gets_blender_suffixes(self):
+        # "Part_1" is still held by the second object when the first one asks for it
+        names = ["Part 1", "Part_1"]
+        objects = self.scene(names)
+        for _, item, _, new_name in list(self.naming().planned_renames()):
+            item.name = new_name
+        self.assertEqual([block.name for block in objects], ["Part_1.001", "Part_1_01"])
+
+        objects = self.scene(names)
+        self.naming().rename_all()
+        self.assertEqual([block.name for block in objects], ["Part_1", "Part_1_01"])
+
+    def test_final_names_follow_the_plan(self):
+        rnd = random.Random(5)
+        for count in (10, 100):
+            names = colliding_names(rnd, count)
+            objects = self.scene(names, self.blend)
+            planned = {old: new for _, _, old, new in self.naming().planned_renames()}
+            counts = self.naming().rename_all()
+            self.assertEqual([block.name for block in objects], [planned.get(name, name) for name in names])
+            self.assertEqual(counts, {"objects": len(planned)} if planned else {})
+
+    def test_rename_map(self):
+        self.scene(["Part 1", "Part_1", "Wood.001"], self.blend)
+        self.naming().rename_all()
+        path = self.module.rename_map_path()
+        self.assertEqual(path, os.path.join(self._folder.name, "to_maya", "scene.rename_map.json"))
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.assertEqual(data["version"], self.module.RENAME_MAP_VERSION)
+        self.assertEqual(data["names"], {"objects": {"Part 1": "Part_1", "Part_1": "Part_1_01", "Wood.001": "Wood_001"}})
+        exported = os.path.join(self._folder.name, "to_maya", "scene.json")
+        self.assertEqual(load_rename_map(exported, reverse=True)["objects"]["Part_1_01"], "Part_1")
+
+    def test_rename_map_replaced_on_every_run(self):
+        objects = self.scene(["Part 1"], self.blend)
+        self.naming().rename_all()
+        objects[0].name = "Clean"
+        self.assertEqual(self.naming().rename_all(), {})
+        with open(self.module.rename_map_path(), "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["names"], {})
+
+    def test_unsaved_file_writes_no_map(self):
+        self.scene(["Part 1"])
+        self.assertEqual(self.naming().rename_all(), {"objects": 1})
+        self.assertIsNone(self.module.rename_map_path())
+
+
+if __name__ == "__main__":
+    unittest.main()
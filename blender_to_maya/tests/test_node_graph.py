@@ -0,0 +1,98 @@
+# test_node_graph.py
+# NodeGraphIndex on stand-in node trees (tests/bpy_stubs.py): the adjacency it
+# answers matches socket.links, and a walk over a tree reads the link list
+# once however big the tree is, where socket.links reads it per socket.
+#
+#   python -m pytest tests
+import os
+import sys
+import unittest
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in ("blender_scripts", "tests"):
+    if os.path.join(PACKAGE_DIR, path) not in sys.path:
+        sys.path.insert(0, os.path.join(PACKAGE_DIR, path))
+
+from blender_node_graph import NodeGraphIndex
+from bpy_stubs import Tree, wrap
+
+
+def chain(size):
+    """RGB -> `size` Hue/Saturation nodes -> Principled -> Output."""
+    tree = Tree()
+    out, principled = tree.output(), tree.principled()
+    upstream = tree.color("RGB")
+    for i in range(size):
+        hsv = tree.hue_saturation(f"HSV{i}")
+        tree.link(upstream, 0, hsv, "Color")
+        upstream = hsv
+    tree.link(upstream, 0, principled, "Base Color")
+    tree.link(principled, 0, out, "Surface")
+    return tree, wrap(out)
+
+
+def walk(output, upstream_nodes):
+    """Every node feeding `output`, through upstream_nodes(input socket)."""
+    seen, stack = {output}, [output]
+    while stack:
+        for sock in stack.pop().inputs:
+            for node in upstream_nodes(sock):
+                if node not in seen:
+                    seen.add(node)
+                    stack.append(node)
+    return seen
+
+
+class NodeGraphIndexTest(unittest.TestCase):
+    def test_walk_reads_links_once(self):
+        for size in (50, 100, 200, 400):
+            tree, out = chain(size)
+            graph = NodeGraphIndex(tree.material.node_tree)
+            live = walk(out, lambda sock: [link.from_node for link in graph.links(sock)])
+            self.assertEqual(len(live), size + 3)
+            self.assertEqual(tree.data.links.iterations, 1, size)
+
+    def test_socket_links_scan_per_socket(self):
+        # What the index replaces: one scan of the link list per input socket
+        tree, out = chain(50)
+        live = walk(out, lambda sock: [link.from_node for link in sock.links])
+        self.assertEqual(len(live), 53)
+        self.assertGreater(tree.data.links.iterations, 100)
+
+    def test_queries_match_socket_links(self):
+        tree, out = chain(3)
+        graph = NodeGraphIndex(tree.material.node_tree)
+        for node in tree.material.node_tree.nodes:
+            for sock in list(node.inputs) + list(node.outputs):
+                self.assertEqual(graph.is_linked(sock), sock.is_linked, sock)
+                self.assertEqual([l.from_socket for l in graph.links(sock)], [l.from_socket for l in sock.links])
+            self.assertTrue(graph.node_is_linked(node))
+        hsv = tree.material.node_tree.nodes["HSV0"]
+        self.assertEqual(graph.from_node(hsv.inputs["Color"]), tree.material.node_tree.nodes["RGB"])
+        self.assertEqual(graph.from_socket(hsv.inputs["Color"]), tree.material.node_tree.nodes["RGB"].outputs[0])
+        self.assertIsNone(graph.from_node(hsv.inputs["Fac"]))
+        self.assertEqual([l.to_node for l in graph.output_links(hsv)], [tree.material.node_tree.nodes["HSV1"]])
+
+    def test_edits_stay_in_sync(self):
+        tree, out = chain(2)
+        node_tree = tree.material.node_tree
+        graph = NodeGraphIndex(node_tree)
+        rgb, hsv0, hsv1 = node_tree.nodes["RGB"], node_tree.nodes["HSV0"], node_tree.nodes["HSV1"]
+
+        # A new link into a taken input replaces the old one
+        graph.add_link(node_tree.links.new(rgb.outputs[0], hsv1.inputs["Color"]))
+        self.assertEqual(graph.from_node(hsv1.inputs["Color"]), rgb)
+        self.assertEqual(graph.output_links(hsv0), [])
+
+        graph.remove_node(hsv0)
+        node_tree.nodes.remove(hsv0)
+        self.assertFalse(graph.is_linked(hsv0.inputs["Color"]))
+        self.assertEqual([l.to_node for l in graph.output_links(rgb)], [hsv1])
+
+        graph.remove_links_to(hsv1.inputs["Color"])
+        self.assertFalse(graph.is_linked(hsv1.inputs["Color"]))
+        self.assertEqual(graph.output_links(rgb), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+# test_reader.py
+# build_materials() against a recording stand-in for maya.cmds: which shader
+# each imported material's shading engine ends up on, and which user data its
+# objects get.
+#
+#   python -m pytest tests
+import os
+import sys
+import tempfile
+import types
+import unittest
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in ("maya_scripts", os.path.join("maya_scripts", "nodes"), "shared"):
+    if os.path.join(PACKAGE_DIR, path) not in sys.path:
+        sys.path.insert(0, os.path.join(PACKAGE_DIR, path))
+
+
+class RecordingCmds(types.ModuleType):
+    """Every imported material M has one shading engine MSG holding the object M_geo."""
+    def __init__(self):
+        super().__init__("maya.cmds")
+        self.connections = {}   # destination plug -> source plug
+        self.constants = {}     # (object, attribute) -> value
+
+    def objExists(self, name):
+        return True
+
+    def listConnections(self, node, type=None):
+        return [f"{node}SG"] if type == "shadingEngine" else []
+
+    def sets(self, sg, query=False):
+        return [f"{sg[:-2]}_geo"]
+
+    def attributeQuery(self, attr, node=None, exists=False):
+        return False
+
+    def connectAttr(self, source, destination, force=False):
+        self.connections[destination] = source
+
+    def shadingNode(self, node_type, name=None, **kwargs):
+        return name or node_type
+
+    def addAttr(self, *args, **kwargs):
+        pass
+
+    def setAttr(self, plug, *values, **kwargs):
+        node, attr = plug.split(".", 1)
+        self.constants[(node, attr)] = list(values) if len(values) > 1 else values[0]
+
+
+class BuildMaterialsTest(unittest.TestCase):
+    def setUp(self):
+        self.cmds = RecordingCmds()
+        maya = types.ModuleType("maya")
+        maya.cmds = self.cmds
+        self._saved = {name: sys.modules.get(name) for name in ("maya", "maya.cmds")}
+        sys.modules.update({"maya": maya, "maya.cmds": self.cmds})
+        for name in ("user_data", "principled_bsdf", "reader"):
+            sys.modules.pop(name, None)
+        import reader
+        self.reader = reader
+        self.built = []
+
+        def read_material(name, data):
+            assert "alias_of" not in data and "template" not in data, f"{name} built from a reference"
+            self.built.append(name)
+            return f"shader_{name}"
+        reader.read_material = read_material
+
+    def tearDown(self):
+        for name, module in self._saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+        for name in ("user_data", "principled_bsdf", "reader"):
+            sys.modules.pop(name, None)
+
+    def surface(self, material):
+        return self.cmds.connections.get(f"{material}SG.surfaceShader")
+
+    def constant(self, material, attr="mtoa_constant_b2m_specularRoughness"):
+        return self.cmds.constants.get((f"{material}_geo", attr))
+
+    @staticmethod
+    def principled(roughness, parameters=None):
+        rec = {"shader": "Principled BSDF",
+               "channels": {"Roughness": {"source_type": "default", "value": roughness}}}
+        if parameters:
+            rec["parameters"] = parameters
+        return rec
+
+    def test_alias_is_assigned_the_canonical_shader(self):
+        shaders = self.reader.build_materials({
+            "A": self.principled(0.5),
+            "B": {"alias_of": "A"},
+        })
+        self.assertEqual(shaders, {"A": "shader_A", "B": "shader_A"})
+        self.assertEqual(self.surface("B"), "shader_A.outColor")
+        self.assertEqual(self.built, ["A"])
+
+    def test_alias_of_instance_gets_instance_values(self):
+        shaders = self.reader.build_materials({
+            "A": self.principled(0.5, {"Roughness": "float"}),
+            "C": {"template": "A", "overrides": {"Roughness": 0.25}},
+            "D": {"alias_of": "C"},
+        })
+        self.assertEqual(shaders, {"A": "shader_A", "C": "shader_A", "D": "shader_A"})
+        self.assertEqual(self.surface("C"), "shader_A.outColor")
+        self.assertEqual(self.surface("D"), "shader_A.outColor")
+        self.assertEqual(self.constant("D"), 0.25)
+        self.assertEqual(self.constant("A"), 0.5)
+        self.assertEqual(self.built, ["A"])
+
+    def test_alias_of_template_gets_template_values(self):
+        self.reader.build_materials({
+            "A": self.principled(0.5, {"Roughness": "float"}),
+            "C": {"template": "A", "overrides": {"Roughness": 0.25}},
+            "E": {"alias_of": "A"},
+        })
+        self.assertEqual(self.surface("E"), "shader_A.outColor")
+        self.assertEqual(self.constant("E"), 0.5)
+
+    def test_unchanged_alias_is_left_alone(self):
+        self.reader.build_materials({
+            "A": dict(self.principled(0.5), changed=True),
+            "B": {"alias_of": "A", "changed": False},
+        }, changed_only=True)
+        self.assertIsNone(self.surface("B"))
+
+    def test_read_materials_follows_alias_instance_template_chain(self):
+        from scene_io import MaterialWriter, write_index
+        materials = {
+            "A": self.principled(0.5, {"Roughness": "float"}),
+            "B": self.principled(0.9),
+            "C": {"template": "A", "overrides": {"Roughness": 0.25}},
+            "D": {"alias_of": "C"},
+        }
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "scene.json")
+            with open(path, "w", encoding="utf-8", newline="\n") as f:
+                with MaterialWriter(f, layout="json", indent=4) as writer:
+                    for name, rec in materials.items():
+                        writer.write(name, rec)
+            write_index(path, writer)
+            shaders = self.reader.read_materials(path, ["D"])
+        self.assertEqual(shaders["D"], "shader_A")
+        self.assertNotIn("B", shaders)
+        self.assertEqual(self.surface("D"), "shader_A.outColor")
+        self.assertEqual(self.constant("D"), 0.25)
+
+
+if __name__ == "__main__":
+    unittest.main()
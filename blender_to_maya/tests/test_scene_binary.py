@@ -0,0 +1,155 @@
+# test_scene_binary.py
+# Round trips through every material file layout and compression, and the
+# binary reader's handling of damaged input.
+#
+#   python -m pytest tests
+import io
+import os
+import struct
+import sys
+import tempfile
+import unittest
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if os.path.join(PACKAGE_DIR, "shared") not in sys.path:
+    sys.path.insert(0, os.path.join(PACKAGE_DIR, "shared"))
+
+import scene_binary
+from scene_binary import BinaryMaterialWriter, COMPRESSION, MAGIC, VERSION
+from scene_io import MaterialWriter, load_materials
+
+# Floats are exact in float32 and at 3 decimals, so every option round-trips
+MATERIALS = {
+    "Wood": {
+        "shader": "Principled BSDF",
+        "channels": {
+            "Base Color": {"source_type": "node", "node_id": "Image Texture"},
+            "Roughness": {"source_type": "default", "value": 0.5},
+            "Emission Color": {"source_type": "default", "value": [0.25, 0.125, 1.0, 1.0]},
+        },
+        "nodes": {
+            "Image Texture": {
+                "source_type": "node", "node_type": "Image Texture", "category": "Color Node",
+                "file_path": "C:\\textures\\wood\\albedo.png",
+                "proxies": {"2": "//to_maya/proxies/albedo_2.png"}, "proxy_level": 2, "resolution": [4096, 2048],
+            },
+        },
+        "changed": True,
+    },
+    "Wood.001": {"alias_of": "Wood", "changed": False},
+    "Ünïcode": {"template": "Wood", "overrides": {"Roughness": 0.75}},
+    "Edge": {
+        "none": None, "flags": [True, False], "ints": [0, -1, 127, 128, -129, 2 ** 40, -(2 ** 70)],
+        "mixed": [1, 2.5, "x", None], "one_float": [0.5], "empty_list": [], "empty_dict": {},
+        "float": -0.0, "big_float": 2.0 ** 100, "path": "no_folder.png", "unix_path": "/tmp/a/b.png",
+        "long": "x" * 300, "nested": [[{"a": [[0.5, 0.25]]}]],
+        "keys": {f"k{i}": i for i in range(200)},
+    },
+}
+
+
+def dump_binary(materials, **options):
+    f = io.BytesIO()
+    with BinaryMaterialWriter(f, **options) as writer:
+        for name, rec in materials.items():
+            writer.write(name, rec)
+    return f.getvalue()
+
+
+class RoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+
+    def load_bytes(self, data, extension=scene_binary.EXTENSION):
+        path = os.path.join(self.folder.name, "scene" + extension)
+        with open(path, "wb") as f:
+            f.write(data)
+        return load_materials(path)
+
+    def test_binary_every_compression_and_float_option(self):
+        for compression in COMPRESSION:
+            for options in ({}, {"float32": True}, {"precision": 3}, {"float32": True, "precision": 3}):
+                with self.subTest(compression=compression, **options):
+                    data = dump_binary(MATERIALS, compression=compression, **options)
+                    self.assertTrue(data.startswith(MAGIC))
+                    self.assertEqual(self.load_bytes(data), MATERIALS)
+
+    def test_text_layouts(self):
+        for layout in ("json", "jsonl"):
+            for indent in (None, 4):
+                with self.subTest(layout=layout, indent=indent):
+                    path = os.path.join(self.folder.name, f"scene.{layout}")
+                    with open(path, "w", encoding="utf-8", newline="\n") as f:
+                        with MaterialWriter(f, layout=layout, indent=indent) as writer:
+                            for name, rec in MATERIALS.items():
+                                writer.write(name, rec)
+                    self.assertEqual(load_materials(path), MATERIALS)
+
+    def test_empty_file(self):
+        self.assertEqual(self.load_bytes(dump_binary({}, compression="zlib")), {})
+
+    def test_benchmark_scene_round_trips(self):
+        for compression in (None, "zlib"):
+            json_size, size, _, _ = scene_binary.benchmark(20, compression=compression)
+            self.assertLess(size, json_size)
+
+    def test_lossy_options_round_floats(self):
+        data = dump_binary({"m": {"value": 0.1234567, "color": [0.1234567, 1.0]}}, precision=2)
+        self.assertEqual(self.load_bytes(data), {"m": {"value": 0.12, "color": [0.12, 1.0]}})
+        data = dump_binary({"m": {"value": 0.1}}, float32=True)
+        self.assertAlmostEqual(self.load_bytes(data)["m"]["value"], 0.1, places=6)
+
+
+class RejectTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        self.path = os.path.join(self.folder.name, "scene" + scene_binary.EXTENSION)
+
+    def read(self, data):
+        with open(self.path, "wb") as f:
+            f.write(data)
+        return dict(scene_binary.iter_binary_materials(self.path))
+
+    def assertRejected(self, data):
+        with self.assertRaises(ValueError):
+            self.read(data)
+
+    def test_wrong_magic(self):
+        self.assertRejected(b"JSON" + dump_binary(MATERIALS)[len(MAGIC):])
+
+    def test_newer_version(self):
+        data = dump_binary(MATERIALS)
+        self.assertRejected(MAGIC + struct.pack("<H", VERSION + 1) + data[len(MAGIC) + 2:])
+
+    def test_unknown_compression(self):
+        data = dump_binary(MATERIALS)
+        self.assertRejected(data[:len(MAGIC) + 2] + bytes([9]) + data[len(MAGIC) + 3:])
+
+    def test_truncated(self):
+        for compression in COMPRESSION:
+            data = dump_binary(MATERIALS, compression=compression)
+            for cut in (len(MAGIC) + 4, len(data) // 2, len(data) - 3):
+                with self.subTest(compression=compression, cut=cut):
+                    self.assertRejected(data[:cut])
+
+    def test_unknown_tag(self):
+        data = bytearray(dump_binary({"m": None}))
+        data[len(MAGIC) + 4 + 2] = 0x7E  # the value tag after T_RECORD and the name index
+        self.assertRejected(bytes(data))
+
+    def test_missing_end_marker(self):
+        data = bytearray(dump_binary({"m": None}))
+        data[len(MAGIC) + 4 + 3] = 0x42  # where T_END should follow the record
+        self.assertRejected(bytes(data))
+
+    def test_writer_rejects_bad_options_and_values(self):
+        with self.assertRaises(ValueError):
+            BinaryMaterialWriter(io.BytesIO(), compression="zstd")
+        with self.assertRaises(TypeError):
+            dump_binary({"m": {"value": object()}})
+
+
+if __name__ == "__main__":
+    unittest.main()
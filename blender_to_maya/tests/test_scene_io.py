@@ -0,0 +1,107 @@
+# test_scene_io.py
+# Material file helpers of shared/scene_io.py: atomic writes and the offset
+# index, which must not be used once the file it describes was re-exported.
+#
+#   python -m pytest tests
+import os
+import sys
+import tempfile
+import unittest
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if os.path.join(PACKAGE_DIR, "shared") not in sys.path:
+    sys.path.insert(0, os.path.join(PACKAGE_DIR, "shared"))
+
+from scene_io import MaterialWriter, atomic_open, load_selected_materials, read_index, write_index
+
+
+class AtomicOpenTest(unittest.TestCase):
+    def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+        self.folder = self._folder.name
+        self.path = os.path.join(self.folder, "scene.json")
+
+    def tearDown(self):
+        self._folder.cleanup()
+
+    def read(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_replaces_on_success(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("old")
+        with atomic_open(self.path, "w", encoding="utf-8") as f:
+            f.write("new")
+            self.assertEqual(self.read(), "old")
+        self.assertEqual(self.read(), "new")
+        self.assertEqual(os.listdir(self.folder), ["scene.json"])
+
+    def test_failure_keeps_old_file(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("old")
+        with self.assertRaises(RuntimeError):
+            with atomic_open(self.path, "w", encoding="utf-8") as f:
+                f.write("half")
+                raise RuntimeError("export failed")
+        self.assertEqual(self.read(), "old")
+        self.assertEqual(os.listdir(self.folder), ["scene.json"])
+
+    def test_failure_without_old_file_leaves_nothing(self):
+        with self.assertRaises(RuntimeError):
+            with atomic_open(self.path, "wb") as f:
+                f.write(b"half")
+                raise RuntimeError("export failed")
+        self.assertEqual(os.listdir(self.folder), [])
+
+    @unittest.skipIf(os.name == "nt", "POSIX permissions")
+    def test_new_file_is_readable(self):
+        with atomic_open(self.path, "w", encoding="utf-8") as f:
+            f.write("{}")
+        self.assertEqual(os.stat(self.path).st_mode & 0o644, 0o644)
+
+
+
+class OffsetIndexTest(unittest.TestCase):
+    def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._folder.name, "scene.json")
+
+    def tearDown(self):
+        self._folder.cleanup()
+
+    def export(self, materials):
+        with open(self.path, "w", encoding="utf-8", newline="\n") as f:
+            with MaterialWriter(f, layout="json", indent=4) as writer:
+                for name, rec in materials:
+                    writer.write(name, rec)
+        write_index(self.path, writer)
+
+    def test_index_is_used(self):
+        self.export([("A", {"value": 0.25}), ("B", {"value": 0.75})])
+        self.assertEqual(set(read_index(self.path)), {"A", "B"})
+        self.assertEqual(load_selected_materials(self.path, ["B"]), {"B": {"value": 0.75}})
+
+    def test_same_size_reexport_makes_index_stale(self):
+        self.export([("A", {"value": 0.25}), ("B", {"value": 0.75})])
+        with open(self.path, "rb") as f:
+            size = len(f.read())
+        old_mtime = os.stat(self.path).st_mtime_ns
+        index_file = os.path.splitext(self.path)[0] + ".index.json"
+        with open(index_file, "rb") as f:
+            old_index = f.read()
+
+        # Re-export without its index: records swapped, one constant changed at the same width
+        self.export([("B", {"value": 0.65}), ("A", {"value": 0.25})])
+        with open(index_file, "wb") as f:
+            f.write(old_index)
+        os.utime(self.path, ns=(old_mtime + 10 ** 9, old_mtime + 10 ** 9))
+        self.assertEqual(os.path.getsize(self.path), size)
+
+        self.assertIsNone(read_index(self.path))
+        self.assertEqual(load_selected_materials(self.path, ["A", "B"]),
+                         {"A": {"value": 0.25}, "B": {"value": 0.65}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+# test_texture_store.py
+# shared/texture_store.py: objects are read-only copies that an in-place save
+# of the source cannot change, and prune can still delete them.
+#
+#   python -m pytest tests
+import hashlib
+import os
+import stat
+import sys
+import tempfile
+import unittest
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if os.path.join(PACKAGE_DIR, "shared") not in sys.path:
+    sys.path.insert(0, os.path.join(PACKAGE_DIR, "shared"))
+
+from texture_store import TextureStore
+
+
+class TextureStoreTest(unittest.TestCase):
+    def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+        self.folder = self._folder.name
+        self.store = TextureStore(os.path.join(self.folder, "store"), workers=2)
+        self.source = os.path.join(self.folder, "wood.png")
+        with open(self.source, "wb") as f:
+            f.write(b"original pixels")
+
+    def tearDown(self):
+        for root, _, files in os.walk(self.folder):
+            for name in files:
+                os.chmod(os.path.join(root, name), stat.S_IRUSR | stat.S_IWUSR)
+        self._folder.cleanup()
+
+    def store_source(self):
+        targets = self.store.plan([self.source])
+        return targets[self.source], self.store.materialize(targets)
+
+    def test_object_is_a_read_only_copy(self):
+        target, counts = self.store_source()
+        self.assertEqual(counts["copied"], 1)
+        self.assertEqual(os.stat(target).st_nlink, 1)
+        self.assertFalse(os.stat(target).st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+        self.assertEqual(self.store_source()[1]["existing"], 1)
+
+    def test_in_place_save_of_source_leaves_object_alone(self):
+        target, _ = self.store_source()
+        with open(self.source, "r+b") as f:
+            f.write(b"repainted")
+        with open(target, "rb") as f:
+            content = f.read()
+        self.assertEqual(content, b"original pixels")
+        self.assertEqual(os.path.basename(target), hashlib.sha256(content).hexdigest() + ".png")
+
+    @unittest.skipUnless(hasattr(os, "link"), "hardlinks")
+    def test_hardlinked_object_is_replaced_by_a_copy(self):
+        target = self.store.plan([self.source])[self.source]
+        os.makedirs(os.path.dirname(target))
+        os.link(self.source, target)
+        counts = self.store.materialize({self.source: target})
+        self.assertEqual(counts["unlinked"], 1)
+        self.assertEqual(os.stat(target).st_nlink, 1)
+        self.assertEqual(os.stat(self.source).st_nlink, 1)
+
+    def test_prune_removes_unreferenced_read_only_objects(self):
+        target, _ = self.store_source()
+        removed, freed = self.store.prune()
+        self.assertEqual((removed, freed), (1, len(b"original pixels")))
+        self.assertFalse(os.path.exists(target))
+
+
+if __name__ == "__main__":
+    unittest.main()